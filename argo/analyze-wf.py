@@ -0,0 +1,264 @@
+import argparse
+import json
+from datetime import datetime
+
+from argo_nodes import get_canonical_id, get_template_name
+
+# Same namespace as create-wf.py, so that the annotations attach to the nodes and templates of its knowledge graph
+EX = "http://example.org/execution/"
+# Properties of the annotations
+ANALYSIS = "http://example.org/analysis#"
+
+
+def parse_time(argo_time):
+    """Convert an Argo RFC 3339 UTC time (2024-05-01T10:00:00Z) to a datetime."""
+    if not argo_time:
+        return None
+    return datetime.fromisoformat(argo_time.replace("Z", "+00:00"))
+
+
+def build_pod_graph(nodes):
+    """Build the dependency graph between the Pod nodes that ran.
+
+    In Argo, the "children" of a node are the nodes started after it. The
+    children of a DAG, TaskGroup or Retry node are its entry nodes, and the
+    nodes depending on a sub-DAG are children of its outbound nodes, so the
+    Pod successors of a Pod are found by expanding its children through the
+    other node types.
+
+    Returns the pods (node_id -> dict of template, parent template, start,
+    finish, cpu and memory) and the predecessors of each pod.
+    """
+    pods = {}
+    for node_id, node_info in nodes.items():
+        start = parse_time(node_info.get("startedAt"))
+        finish = parse_time(node_info.get("finishedAt"))
+        if node_info.get("type") != "Pod" or not start or not finish:
+            continue
+        boundary_id = node_info.get("boundaryID")
+        resources = node_info.get("resourcesDuration", {})
+        pods[node_id] = {
+            "template": get_template_name(node_info),
+            "parent": get_template_name(nodes[boundary_id]) if boundary_id in nodes else None,
+            "name": node_info.get("displayName", node_id),
+            "start": start,
+            "finish": finish,
+            "cpu": resources.get("cpu", 0),
+            "memory": resources.get("memory", 0),
+        }
+
+    expanded = {}
+
+    def get_pod_successors(node_id):
+        # the Pod nodes reached from the children of node_id through the other node types
+        if node_id not in expanded:
+            # placeholder guarding against a cycle of non-Pod nodes
+            expanded[node_id] = successors = set()
+            for child_id in nodes[node_id].get("children", []):
+                if child_id not in nodes:
+                    continue
+                if nodes[child_id].get("type") == "Pod":
+                    successors.add(child_id)
+                else:
+                    successors |= get_pod_successors(child_id)
+        return expanded[node_id]
+
+    predecessors = {pod_id: [] for pod_id in pods}
+    for node_id in pods:
+        for successor_id in get_pod_successors(node_id):
+            if successor_id in pods:
+                predecessors[successor_id].append(node_id)
+
+    return pods, predecessors
+
+
+def find_critical_path(pods, predecessors):
+    """Walk back from the last pod to finish, each time to the predecessor that
+    finished last, i.e. the dependency that actually released the pod.
+
+    Returns the path in execution order as (node_id, idle seconds between the
+    finish of the previous pod of the path and the start of this one).
+    """
+    if not pods:
+        return []
+    current = max(pods, key=lambda pod_id: pods[pod_id]["finish"])
+    path = []
+    visited = set()
+    while True:
+        visited.add(current)
+        # a dependency finishes before the pod starts; this also keeps the walk out of inconsistent cycles
+        pod_predecessors = [pod_id for pod_id in predecessors[current]
+                            if pod_id not in visited and pods[pod_id]["finish"] <= pods[current]["start"]]
+        if not pod_predecessors:
+            path.append((current, None))
+            break
+        previous = max(pod_predecessors, key=lambda pod_id: pods[pod_id]["finish"])
+        path.append((current, (pods[current]["start"] - pods[previous]["finish"]).total_seconds()))
+        current = previous
+    path.reverse()
+    return path
+
+
+def compute_idle_gaps(pods, predecessors):
+    """Idle time of each pod between the finish of its last dependency and its own start."""
+    gaps = []
+    for pod_id, pod_predecessors in predecessors.items():
+        # same filter as find_critical_path: a dependency finishes before the pod starts
+        pod_predecessors = [pred_id for pred_id in pod_predecessors
+                            if pods[pred_id]["finish"] <= pods[pod_id]["start"]]
+        if pod_predecessors:
+            previous = max(pod_predecessors, key=lambda pred_id: pods[pred_id]["finish"])
+            gaps.append({
+                "pod": pod_id,
+                "after": previous,
+                "template": pods[pod_id]["template"],
+                "after_template": pods[previous]["template"],
+                "idle_seconds": (pods[pod_id]["start"] - pods[previous]["finish"]).total_seconds(),
+            })
+    return sorted(gaps, key=lambda gap: gap["idle_seconds"], reverse=True)
+
+
+def compute_template_totals(pods, critical_path, key="template"):
+    """Totals per template (or per parent sub-workflow with key="parent"):
+    pods, wall-clock, CPU and memory resource durations, and time on the critical path."""
+    on_critical_path = {pod_id for pod_id, _ in critical_path}
+    totals = {}
+    for pod_id, pod in pods.items():
+        duration = (pod["finish"] - pod["start"]).total_seconds()
+        total = totals.setdefault(pod[key] or "-", {"pods": 0, "wall_clock_seconds": 0.0, "cpu_seconds": 0,
+                                                    "memory_seconds": 0, "critical_path_seconds": 0.0})
+        total["pods"] += 1
+        total["wall_clock_seconds"] += duration
+        total["cpu_seconds"] += pod["cpu"]
+        total["memory_seconds"] += pod["memory"]
+        if pod_id in on_critical_path:
+            total["critical_path_seconds"] += duration
+    return dict(sorted(totals.items(), key=lambda item: (item[1]["critical_path_seconds"], item[1]["wall_clock_seconds"]),
+                       reverse=True))
+
+
+def analyze_workflow(data):
+    """Compute the critical path, per-template and per-sub-workflow totals and idle gaps of an Argo workflow."""
+    nodes = data.get("status", {}).get("nodes", {})
+    pods, predecessors = build_pod_graph(nodes)
+    critical_path = find_critical_path(pods, predecessors)
+    workflow_start = parse_time(data.get("status", {}).get("startedAt"))
+    if workflow_start is None and pods:
+        workflow_start = min(pod["start"] for pod in pods.values())
+
+    path = []
+    for pod_id, idle_before in critical_path:
+        pod = pods[pod_id]
+        path.append({
+            "pod": pod_id,
+            "name": pod["name"],
+            "template": pod["template"],
+            "parent": pod["parent"],
+            "start_offset_seconds": (pod["start"] - workflow_start).total_seconds(),
+            "duration_seconds": (pod["finish"] - pod["start"]).total_seconds(),
+            "idle_before_seconds": idle_before,
+        })
+
+    last_finish = max((pod["finish"] for pod in pods.values()), default=workflow_start)
+    return {
+        "workflow": data.get("metadata", {}).get("name", data.get("metadata", {}).get("uid", "unknown")),
+        "uid": data.get("metadata", {}).get("uid", "unknown-uid"),
+        "pods": len(pods),
+        "span_seconds": (last_finish - workflow_start).total_seconds() if workflow_start else 0.0,
+        "critical_path": path,
+        "critical_path_busy_seconds": sum(step["duration_seconds"] for step in path),
+        "critical_path_idle_seconds": sum(step["idle_before_seconds"] or 0 for step in path),
+        "templates": compute_template_totals(pods, critical_path),
+        "sub_workflows": compute_template_totals(pods, critical_path, key="parent"),
+        "idle_gaps": compute_idle_gaps(pods, predecessors),
+    }
+
+
+def format_totals_table(title, totals, top):
+    lines = [title, f"{'':<40}{'pods':>7}{'wall-clock (s)':>16}{'critical (s)':>14}{'cpu (s)':>10}{'memory (s)':>12}"]
+    for name, total in list(totals.items())[:top]:
+        lines.append(f"{name[:39]:<40}{total['pods']:>7}{total['wall_clock_seconds']:>16.0f}"
+                     f"{total['critical_path_seconds']:>14.0f}{total['cpu_seconds']:>10}{total['memory_seconds']:>12}")
+    return lines
+
+
+def format_report(analysis, top=20):
+    """Format the analysis as a plain text report."""
+    lines = [
+        f"Workflow {analysis['workflow']} ({analysis['uid']}): {analysis['pods']} pods, span {analysis['span_seconds']:.0f}s",
+        f"Critical path: {len(analysis['critical_path'])} pods, {analysis['critical_path_busy_seconds']:.0f}s running, "
+        f"{analysis['critical_path_idle_seconds']:.0f}s idle between them",
+        "",
+        f"{'start (s)':>10}{'duration (s)':>14}{'idle before (s)':>17}  template (sub-workflow)",
+    ]
+    for step in analysis["critical_path"]:
+        idle = "" if step["idle_before_seconds"] is None else f"{step['idle_before_seconds']:.0f}"
+        lines.append(f"{step['start_offset_seconds']:>10.0f}{step['duration_seconds']:>14.0f}{idle:>17}  "
+                     f"{step['template']} ({step['parent'] or '-'})")
+    lines.append("")
+    lines += format_totals_table("Per sub-workflow", analysis["sub_workflows"], top)
+    lines.append("")
+    lines += format_totals_table("Per template", analysis["templates"], top)
+    lines += ["", f"Largest idle gaps between dependent pods (of {len(analysis['idle_gaps'])})"]
+    for gap in analysis["idle_gaps"][:top]:
+        lines.append(f"{gap['idle_seconds']:>10.0f}s  {gap['after_template']} -> {gap['template']}  ({gap['pod']})")
+    return "\n".join(lines)
+
+
+def write_annotations(analysis, output_filepath):
+    """Write RDF annotations of the analysis for the knowledge graph of create-wf.py, in
+    N-Triples (or Turtle for a .ttl file): the critical path rank and idle time of the
+    pods on it, and the totals of each template."""
+    from rdflib import Graph, Literal, Namespace, URIRef
+    from rdflib.namespace import XSD
+
+    ex = Namespace(EX)
+    analysis_ns = Namespace(ANALYSIS)
+    g = Graph()
+    g.bind("ex", ex)
+    g.bind("analysis", analysis_ns)
+
+    for rank, step in enumerate(analysis["critical_path"], start=1):
+        node_uri = ex[step["pod"]]
+        g.add((node_uri, analysis_ns.onCriticalPath, Literal(True)))
+        g.add((node_uri, analysis_ns.criticalPathRank, Literal(rank)))
+        if step["idle_before_seconds"] is not None:
+            g.add((node_uri, analysis_ns.idleBeforeSeconds, Literal(step["idle_before_seconds"], datatype=XSD.decimal)))
+
+    # template totals are specific to this execution, so they hang on a node per (execution, template)
+    wf_instance_uri = ex[analysis["uid"]]
+    for template, total in analysis["templates"].items():
+        totals_uri = URIRef(f"{wf_instance_uri}_totals_{get_canonical_id(template)}")
+        g.add((wf_instance_uri, analysis_ns.templateTotals, totals_uri))
+        g.add((totals_uri, analysis_ns.template, ex[get_canonical_id(template)]))
+        g.add((totals_uri, analysis_ns.pods, Literal(total["pods"])))
+        g.add((totals_uri, analysis_ns.wallClockSeconds, Literal(total["wall_clock_seconds"], datatype=XSD.decimal)))
+        g.add((totals_uri, analysis_ns.criticalPathSeconds, Literal(total["critical_path_seconds"], datatype=XSD.decimal)))
+        g.add((totals_uri, analysis_ns.cpuSeconds, Literal(total["cpu_seconds"])))
+        g.add((totals_uri, analysis_ns.memorySeconds, Literal(total["memory_seconds"])))
+
+    g.add((wf_instance_uri, analysis_ns.spanSeconds, Literal(analysis["span_seconds"], datatype=XSD.decimal)))
+    g.serialize(destination=output_filepath, format="turtle" if output_filepath.endswith(".ttl") else "nt")
+    print(f"Annotations written to {output_filepath}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Critical path, per-template totals and idle gaps of an Argo workflow execution JSON.")
+    parser.add_argument("input_file", help="Argo workflow JSON file")
+    parser.add_argument("--top", type=int, default=20, help="Rows of the per-template tables and idle gaps (default: 20)")
+    parser.add_argument("--json", dest="json_output", help="Also write the full analysis to this JSON file")
+    parser.add_argument("--annotations", help="Write RDF annotations for the create-wf.py knowledge graph (.nt or .ttl)")
+    args = parser.parse_args()
+
+    with open(args.input_file, 'r') as f:
+        data = json.load(f)
+
+    analysis = analyze_workflow(data)
+    print(format_report(analysis, args.top))
+
+    if args.json_output:
+        with open(args.json_output, 'w') as f:
+            json.dump(analysis, f, indent=2)
+    if args.annotations:
+        write_annotations(analysis, args.annotations)
@@ -0,0 +1,37 @@
+"""Helpers shared by create-wf.py, analyze-wf.py and load-runs.py to name the nodes and templates of an Argo workflow."""
+import hashlib
+import re
+
+
+def get_canonical_id(text):
+    """Generate a URI-safe identifier from a text string.
+
+    If the text contains special characters (common in Argo node names which
+    include JSON-encoded parameters), it creates a deterministic ID by
+    combining a sanitized prefix with an MD5 hash suffix.
+    """
+    if not text:
+        return "unknown"
+    if re.search(r'[^a-zA-Z0-9_\-]', text):
+        prefix = text.split('(')[0]
+        prefix = re.sub(r'[^a-zA-Z0-9_\-]', '_', prefix)
+        hashed = hashlib.md5(text.encode('utf-8')).hexdigest()[:8]
+        return f"{prefix}_{hashed}"
+    return text
+
+
+def get_template_name(node_info):
+    """Extract the template name from an Argo node.
+
+    Argo nodes reference their template definition in two ways:
+    - templateName: a direct string (for local templates)
+    - templateRef: an object with 'name' and 'template' fields (for
+      WorkflowTemplate references, used by nested sub-workflows)
+    Falls back to displayName if neither is present.
+    """
+    if "templateName" in node_info:
+        return node_info["templateName"]
+    template_ref = node_info.get("templateRef")
+    if template_ref:
+        return template_ref.get("template", template_ref.get("name", "unknown-step"))
+    return node_info.get("displayName", "unknown-step")
@@ -0,0 +1,39 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+CREATE_WF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "create-wf.py")
+
+
+def run_extraction(json_filepath, output_filepath, reader):
+    """Run create-wf.py in a child process and return its wall-clock time (s)
+    and peak resident set size (MiB)."""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, CREATE_WF, json_filepath, output_filepath, "--reader", reader],
+                               stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise RuntimeError(f"create-wf.py failed with the {reader} reader")
+    # ru_maxrss is in KiB on Linux
+    return elapsed, usage.ru_maxrss / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the time and peak RSS of the json and ijson readers of create-wf.py.")
+    parser.add_argument("input_file", help="Argo workflow JSON file")
+    parser.add_argument("--format", choices=["nt", "nq", "trig", "ttl"], default="nt",
+                        help="Extension of the output written by each run (default: nt)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per reader, the best time being kept")
+    args = parser.parse_args()
+
+    print(f"{args.input_file}: {os.path.getsize(args.input_file) / 2**20:.1f} MiB, output .{args.format}")
+    print(f"{'reader':<8}{'best time (s)':>15}{'peak RSS (MiB)':>16}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_filepath = os.path.join(tmp_dir, f"kg.{args.format}")
+        for reader in ["json", "ijson"]:
+            runs = [run_extraction(args.input_file, output_filepath, reader) for _ in range(args.repeat)]
+            print(f"{reader:<8}{min(elapsed for elapsed, _ in runs):>15.2f}{max(rss for _, rss in runs):>16.1f}")
@@ -1,10 +1,19 @@
+import argparse
+import glob
+import gzip
 import json
+import os
+import shutil
 import sys
-import hashlib
-import re
-from rdflib import Graph, Literal, Namespace
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote
+from rdflib import BNode, Graph, Literal, Namespace
 from rdflib.namespace import RDF, XSD
 
+from argo_nodes import get_canonical_id, get_template_name
+
 # =============================================================================
 # Namespace definitions — strictly matching BioFlow-Ontology.ttl
 # =============================================================================
@@ -19,54 +28,41 @@ WFRUN = Namespace("https://w3id.org/ro/terms/workflow-run#")
 EX = Namespace("http://example.org/execution/")
 
 
-def get_canonical_id(text):
-    """Generate a URI-safe identifier from a text string.
+def build_node_lookups(nodes):
+    """Build the lookups needed to resolve the relations between nodes.
 
-    If the text contains special characters (common in Argo node names which
-    include JSON-encoded parameters), it creates a deterministic ID by
-    combining a sanitized prefix with an MD5 hash suffix.
-    """
-    if not text:
-        return "unknown"
-    if re.search(r'[^a-zA-Z0-9_\-]', text):
-        prefix = text.split('(')[0]
-        prefix = re.sub(r'[^a-zA-Z0-9_\-]', '_', prefix)
-        hashed = hashlib.md5(text.encode('utf-8')).hexdigest()[:8]
-        return f"{prefix}_{hashed}"
-    return text
-
-
-def get_template_name(node_info):
-    """Extract the template name from an Argo node.
-
-    Argo nodes reference their template definition in two ways:
-    - templateName: a direct string (for local templates)
-    - templateRef: an object with 'name' and 'template' fields (for
-      WorkflowTemplate references, used by nested sub-workflows)
-    Falls back to displayName if neither is present.
+    We need two lookups to correctly resolve:
+      - node_id -> template URI (for isFollowedBy at the template level,
+        and boundaryID -> parent template URI for hasPart / isSubPlanOf)
+      - node_id -> node type (to filter isFollowedBy to Pod-only edges)
+    Only the type and template fields of the nodes are read, and the URI of
+    a template is shared by all its nodes.
     """
-    if "templateName" in node_info:
-        return node_info["templateName"]
-    template_ref = node_info.get("templateRef")
-    if template_ref:
-        return template_ref.get("template", template_ref.get("name", "unknown-step"))
-    return node_info.get("displayName", "unknown-step")
-
-
-def extract_argo_to_kg(json_filepath, output_filepath="execution_kg.ttl"):
-    g = Graph()
-    g.bind("bioschemas", BIOSCHEMAS)
-    g.bind("edam", EDAM)
-    g.bind("p-plan", PPLAN)
-    g.bind("prov", PROV)
-    g.bind("schema", SCHEMA)
-    g.bind("sf", SF)
-    g.bind("wfrun", WFRUN)
-    g.bind("ex", EX)
+    node_to_template = {}  # node_id -> template URI
+    node_to_type = {}      # node_id -> Argo node type ("DAG", "Pod", etc.)
+    template_uris = {}
 
-    with open(json_filepath, 'r') as f:
-        data = json.load(f)
+    for node_id, node_info in nodes:
+        template_id = get_canonical_id(get_template_name(node_info))
+        if template_id not in template_uris:
+            template_uris[template_id] = EX[template_id]
+        node_to_template[node_id] = template_uris[template_id]
+        node_to_type[node_id] = node_info.get("type")
+
+    return node_to_template, node_to_type
+
+
+def extract_argo_triples(data, emit, emit_template, nodes=None, node_lookups=None):
+    """Walk an Argo workflow document and pass each of its triples to a callback.
+
+    Template-level triples (workflow, steps, variables, agent), which repeat
+    for every node of a template, go to emit_template so that the streaming
+    writers can drop the duplicates; execution-level triples go to emit.
 
+    By default the nodes are read from data["status"]["nodes"]; the streaming
+    reader passes them instead as an iterable of (node_id, node_info) pairs,
+    along with the (node_to_template, node_to_type) lookups.
+    """
     # =========================================================================
     # 1. WORKFLOW TEMPLATE & AGENT
     #
@@ -94,37 +90,37 @@ def extract_argo_to_kg(json_filepath, output_filepath="execution_kg.ttl"):
 
     # sf:Workflow — the abstract workflow template (plan)
     # Subclass of: p-plan:Plan, schema:SoftwareSourceCode, bioschemas:ComputationalWorkflow
-    g.add((wf_template_uri, RDF.type, SF.Workflow))
-    g.add((wf_template_uri, SCHEMA.name, Literal(template_name)))
+    emit_template((wf_template_uri, RDF.type, SF.Workflow))
+    emit_template((wf_template_uri, SCHEMA.name, Literal(template_name)))
     # schema:creator — links the workflow to its author
     # Domain: sf:Workflow, Range: schema:Person | schema:Organization
-    g.add((wf_template_uri, SCHEMA.creator, agent_uri))
+    emit_template((wf_template_uri, SCHEMA.creator, agent_uri))
 
     # sf:WorkflowExecution — the concrete execution of the workflow
     # Subclass of: prov:Activity, schema:CreateAction
-    g.add((wf_instance_uri, RDF.type, SF.WorkflowExecution))
+    emit((wf_instance_uri, RDF.type, SF.WorkflowExecution))
     # sf:correspondsToWorkflow — links execution to its workflow template
     # Domain: sf:WorkflowExecution, Range: sf:Workflow
-    g.add((wf_instance_uri, SF.correspondsToWorkflow, wf_template_uri))
+    emit((wf_instance_uri, SF.correspondsToWorkflow, wf_template_uri))
 
     # prov:Person — the agent who triggered the execution
-    g.add((agent_uri, RDF.type, PROV.Person))
-    g.add((agent_uri, SCHEMA.name, Literal(creator_email)))
+    emit_template((agent_uri, RDF.type, PROV.Person))
+    emit_template((agent_uri, SCHEMA.name, Literal(creator_email)))
 
     # schema:startTime / schema:endTime — temporal bounds of the workflow execution
     # Domain: sf:WorkflowExecution, Range: xsd:dateTime
     started_at_wf = data.get("status", {}).get("startedAt")
     finished_at_wf = data.get("status", {}).get("finishedAt")
     if started_at_wf:
-        g.add((wf_instance_uri, SCHEMA.startTime, Literal(started_at_wf, datatype=XSD.dateTime)))
+        emit((wf_instance_uri, SCHEMA.startTime, Literal(started_at_wf, datatype=XSD.dateTime)))
     if finished_at_wf:
-        g.add((wf_instance_uri, SCHEMA.endTime, Literal(finished_at_wf, datatype=XSD.dateTime)))
+        emit((wf_instance_uri, SCHEMA.endTime, Literal(finished_at_wf, datatype=XSD.dateTime)))
 
     # schema:actionStatus — execution outcome
     # Domain: sf:WorkflowExecution, Range: schema:ActionStatusType
     phase_wf = data.get("status", {}).get("phase")
     if phase_wf:
-        g.add((wf_instance_uri, SCHEMA.actionStatus, Literal(phase_wf)))
+        emit((wf_instance_uri, SCHEMA.actionStatus, Literal(phase_wf)))
 
     # =========================================================================
     # 2. WORKFLOW-LEVEL INPUT PARAMETERS
@@ -148,49 +144,42 @@ def extract_argo_to_kg(json_filepath, output_filepath="execution_kg.ttl"):
             # sf:Variable — abstract input parameter of the workflow template
             # Subclass of: p-plan:Variable, bioschemas:FormalParameter
             var_uri = EX[f"var_in_{template_name}_{param_name}"]
-            g.add((var_uri, RDF.type, SF.Variable))
-            g.add((var_uri, SCHEMA.name, Literal(param_name)))
+            emit_template((var_uri, RDF.type, SF.Variable))
+            emit_template((var_uri, SCHEMA.name, Literal(param_name)))
             # sf:inputVariable — links workflow template to its input variable
             # Domain: sf:Workflow | sf:Step, Range: sf:Variable
-            g.add((wf_template_uri, SF.inputVariable, var_uri))
+            emit_template((wf_template_uri, SF.inputVariable, var_uri))
 
             if param_val:
                 # sf:WorkflowEntity — concrete data value used during workflow execution
                 # Subclass of: sf:Entity (which is subclass of edam:Data, prov:Entity)
                 ent_uri = EX[f"{uid}_entity_in_{param_name}"]
-                g.add((ent_uri, RDF.type, SF.WorkflowEntity))
-                g.add((ent_uri, SCHEMA.value, Literal(param_val)))
+                emit((ent_uri, RDF.type, SF.WorkflowEntity))
+                emit((ent_uri, SCHEMA.value, Literal(param_val)))
                 # sf:corrspondsToVariable — links entity to its variable definition
                 # Note: typo "corrspondsToVariable" matches the ontology TTL
                 # Domain: sf:Entity, Range: sf:Variable
-                g.add((ent_uri, SF.corrspondsToVariable, var_uri))
+                emit((ent_uri, SF.corrspondsToVariable, var_uri))
                 # sf:used — links execution to consumed data
                 # Domain: sf:WorkflowExecution, Range: sf:Entity
-                g.add((wf_instance_uri, SF.used, ent_uri))
+                emit((wf_instance_uri, SF.used, ent_uri))
 
     # =========================================================================
     # 3. NODE EXTRACTION — First pass: build lookup mappings
     #
-    # We need two lookups to correctly resolve:
-    #   - node_id -> template URI (for isFollowedBy at the template level)
-    #   - node_id -> node type (to filter isFollowedBy to Pod-only edges)
-    #   - boundaryID -> parent template URI (for hasPart / isSubPlanOf)
+    # See build_node_lookups. The streaming reader builds them in its own
+    # first pass over the file and passes them with the nodes of its second.
     # =========================================================================
-    nodes = data.get("status", {}).get("nodes", {})
-
-    node_to_template = {}  # node_id -> template URI
-    node_to_type = {}      # node_id -> Argo node type ("DAG", "Pod", etc.)
-
-    for node_id, node_info in nodes.items():
-        raw_template_id = get_template_name(node_info)
-        template_id = get_canonical_id(raw_template_id)
-        node_to_template[node_id] = EX[template_id]
-        node_to_type[node_id] = node_info.get("type")
+    if nodes is None:
+        nodes = data.get("status", {}).get("nodes", {}).items()
+    if node_lookups is None:
+        node_lookups = build_node_lookups(nodes)
+    node_to_template, node_to_type = node_lookups
 
     # =========================================================================
     # 4. NODE EXTRACTION — Second pass: generate triples
     # =========================================================================
-    for node_id, node_info in nodes.items():
+    for node_id, node_info in nodes:
         node_uri = EX[node_id]
         node_type = node_info.get("type")
         raw_template_id = get_template_name(node_info)
@@ -198,7 +187,7 @@ def extract_argo_to_kg(json_filepath, output_filepath="execution_kg.ttl"):
         step_uri = EX[template_id]
 
         # schema:name — human-readable name for the template
-        g.add((step_uri, SCHEMA.name, Literal(raw_template_id)))
+        emit_template((step_uri, SCHEMA.name, Literal(raw_template_id)))
 
         # ---------------------------------------------------------------------
         # Determine the parent workflow/subworkflow for this node.
@@ -220,35 +209,35 @@ def extract_argo_to_kg(json_filepath, output_filepath="execution_kg.ttl"):
             # sf:Subworfklow — a sub-workflow called within a parent workflow
             # Note: "Subworfklow" typo is intentional, matching the ontology TTL
             # Subclass of: p-plan:MultiStep, sf:Workflow
-            g.add((step_uri, RDF.type, SF.Subworfklow))
+            emit_template((step_uri, RDF.type, SF.Subworfklow))
 
             # p-plan:isSubPlanOf — links sub-workflow to its parent workflow
             # Domain: sf:SubWorkflow, Range: sf:Workflow
-            g.add((step_uri, PPLAN.isSubPlanOf, parent_template_uri))
+            emit_template((step_uri, PPLAN.isSubPlanOf, parent_template_uri))
 
             # sf:WorkflowExecution — execution instance for this DAG/TaskGroup
             # Since sf:Subworfklow IS a sf:Workflow, its execution is a WorkflowExecution
             # Subclass of: prov:Activity, schema:CreateAction
-            g.add((node_uri, RDF.type, SF.WorkflowExecution))
+            emit((node_uri, RDF.type, SF.WorkflowExecution))
             # sf:correspondsToWorkflow — links execution to its sub-workflow template
             # Domain: sf:WorkflowExecution, Range: sf:Workflow
-            g.add((node_uri, SF.correspondsToWorkflow, step_uri))
+            emit((node_uri, SF.correspondsToWorkflow, step_uri))
 
         elif node_type == "Pod":
             # sf:Step — an atomic executable step within the workflow
             # Subclass of: p-plan:Step, sf:Startable, schema:HowToStep, edam:Operation
-            g.add((step_uri, RDF.type, SF.Step))
+            emit_template((step_uri, RDF.type, SF.Step))
 
             # sf:hasPart — links the parent workflow/subworkflow to this step
             # Domain: sf:Workflow, Range: sf:Step
-            g.add((parent_template_uri, SF.hasPart, step_uri))
+            emit_template((parent_template_uri, SF.hasPart, step_uri))
 
             # sf:StepExecution — execution instance for this step
             # Subclass of: p-plan:Activity, schema:CreateAction
-            g.add((node_uri, RDF.type, SF.StepExecution))
+            emit((node_uri, RDF.type, SF.StepExecution))
             # p-plan:correspondsToStep — links execution to its planned step
             # Domain: sf:StepExecution, Range: sf:Step
-            g.add((node_uri, PPLAN.correspondsToStep, step_uri))
+            emit((node_uri, PPLAN.correspondsToStep, step_uri))
 
         # ---------------------------------------------------------------------
         # Temporal tracking
@@ -258,15 +247,15 @@ def extract_argo_to_kg(json_filepath, output_filepath="execution_kg.ttl"):
         started_at = node_info.get("startedAt")
         finished_at = node_info.get("finishedAt")
         if started_at:
-            g.add((node_uri, SCHEMA.startTime, Literal(started_at, datatype=XSD.dateTime)))
+            emit((node_uri, SCHEMA.startTime, Literal(started_at, datatype=XSD.dateTime)))
         if finished_at:
-            g.add((node_uri, SCHEMA.endTime, Literal(finished_at, datatype=XSD.dateTime)))
+            emit((node_uri, SCHEMA.endTime, Literal(finished_at, datatype=XSD.dateTime)))
 
         # schema:actionStatus — execution phase/outcome
         # Domain: sf:StepExecution | sf:WorkflowExecution, Range: schema:ActionStatusType
         phase = node_info.get("phase")
         if phase:
-            g.add((node_uri, SCHEMA.actionStatus, Literal(phase)))
+            emit((node_uri, SCHEMA.actionStatus, Literal(phase)))
 
         # ---------------------------------------------------------------------
         # Resource consumption
@@ -277,10 +266,10 @@ def extract_argo_to_kg(json_filepath, output_filepath="execution_kg.ttl"):
         if resources:
             for res_type, duration in resources.items():
                 res_uri = EX[f"{node_id}_resource_{res_type}"]
-                g.add((res_uri, RDF.type, SCHEMA.PropertyValue))
-                g.add((res_uri, SCHEMA.name, Literal(res_type)))
-                g.add((res_uri, SCHEMA.value, Literal(duration)))
-                g.add((node_uri, WFRUN.resourceUsage, res_uri))
+                emit((res_uri, RDF.type, SCHEMA.PropertyValue))
+                emit((res_uri, SCHEMA.name, Literal(res_type)))
+                emit((res_uri, SCHEMA.value, Literal(duration)))
+                emit((node_uri, WFRUN.resourceUsage, res_uri))
 
         # ---------------------------------------------------------------------
         # Input parameters
@@ -298,24 +287,24 @@ def extract_argo_to_kg(json_filepath, output_filepath="execution_kg.ttl"):
                 # sf:Variable — abstract input parameter of the step template
                 # Subclass of: p-plan:Variable, bioschemas:FormalParameter
                 var_uri = EX[f"var_in_{template_id}_{param_name}"]
-                g.add((var_uri, RDF.type, SF.Variable))
-                g.add((var_uri, SCHEMA.name, Literal(param_name)))
+                emit_template((var_uri, RDF.type, SF.Variable))
+                emit_template((var_uri, SCHEMA.name, Literal(param_name)))
                 # sf:inputVariable — links step template to its input variable
                 # Domain: sf:Workflow | sf:Step, Range: sf:Variable
-                g.add((step_uri, SF.inputVariable, var_uri))
+                emit_template((step_uri, SF.inputVariable, var_uri))
 
                 # sf:StepEntity — concrete data value consumed during step execution
                 # Subclass of: sf:Entity (which is subclass of edam:Data, prov:Entity)
                 ent_uri = EX[f"{node_id}_entity_in_{param_name}"]
-                g.add((ent_uri, RDF.type, SF.StepEntity))
-                g.add((ent_uri, SCHEMA.value, Literal(param_val)))
+                emit((ent_uri, RDF.type, SF.StepEntity))
+                emit((ent_uri, SCHEMA.value, Literal(param_val)))
                 # sf:corrspondsToVariable — links entity to its variable definition
                 # Note: typo "corrspondsToVariable" matches the ontology TTL
                 # Domain: sf:Entity, Range: sf:Variable
-                g.add((ent_uri, SF.corrspondsToVariable, var_uri))
+                emit((ent_uri, SF.corrspondsToVariable, var_uri))
                 # sf:used — links step execution to its consumed data
                 # Domain: sf:StepExecution | sf:WorkflowExecution, Range: sf:Entity
-                g.add((node_uri, SF.used, ent_uri))
+                emit((node_uri, SF.used, ent_uri))
 
         # ---------------------------------------------------------------------
         # Output parameters & artifacts
@@ -332,19 +321,19 @@ def extract_argo_to_kg(json_filepath, output_filepath="execution_kg.ttl"):
             if out_name:
                 # sf:Variable — abstract output defined in the step template
                 var_uri = EX[f"var_out_{template_id}_{out_name}"]
-                g.add((var_uri, RDF.type, SF.Variable))
-                g.add((var_uri, SCHEMA.name, Literal(out_name)))
+                emit_template((var_uri, RDF.type, SF.Variable))
+                emit_template((var_uri, SCHEMA.name, Literal(out_name)))
                 # sf:outputVariable — links step template to its output variable
                 # Domain: sf:Workflow | sf:Step, Range: sf:Variable
-                g.add((step_uri, SF.outputVariable, var_uri))
+                emit_template((step_uri, SF.outputVariable, var_uri))
 
                 # sf:StepEntity — concrete data produced during step execution
                 ent_uri = EX[f"{node_id}_entity_out_{out_name}"]
-                g.add((ent_uri, RDF.type, SF.StepEntity))
-                g.add((ent_uri, SF.corrspondsToVariable, var_uri))
+                emit((ent_uri, RDF.type, SF.StepEntity))
+                emit((ent_uri, SF.corrspondsToVariable, var_uri))
                 # sf:generated — links step execution to its produced data
                 # Domain: sf:StepExecution | sf:WorkflowExecution, Range: sf:Entity
-                g.add((node_uri, SF.generated, ent_uri))
+                emit((node_uri, SF.generated, ent_uri))
 
         # ---------------------------------------------------------------------
         # Control flow: sf:isFollowedBy
@@ -370,18 +359,445 @@ def extract_argo_to_kg(json_filepath, output_filepath="execution_kg.ttl"):
                     child_step_uri = node_to_template[child_id]
                     # sf:isFollowedBy — specifies the next step in the workflow
                     # Domain: sf:Startable, Range: sf:Startable
-                    g.add((step_uri, SF.isFollowedBy, child_step_uri))
+                    emit_template((step_uri, SF.isFollowedBy, child_step_uri))
 
-    g.serialize(destination=output_filepath, format="turtle")
-    print(f"Knowledge graph generated successfully in {output_filepath}")
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python create-wf.py <workflow.json> [output.ttl]")
-        sys.exit(1)
+# =============================================================================
+# Input
+# =============================================================================
+# parts of the document read by extract_argo_triples besides status.nodes
+HEADER_PREFIXES = ("metadata", "spec.arguments.parameters", "status.startedAt", "status.finishedAt", "status.phase")
+
+# node fields read by get_template_name and build_node_lookups
+NODE_LOOKUP_FIELDS = ("type", "templateName", "displayName")
+
+
+def scan_workflow_header(json_filepath):
+    """First streaming pass: read the parts of HEADER_PREFIXES and the lookups
+    of build_node_lookups without materializing the document.
+
+    Each node is reduced to its type and template fields before being added
+    to the lookups, so memory is proportional to the number of nodes times
+    the size of their ids, not to the size of status.nodes.
+    """
+    import ijson
+    from ijson.common import ObjectBuilder
+
+    builders = {}
+    compact_nodes = []
+    node_prefix = None
+
+    with open(json_filepath, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == "status.nodes":
+                # the keys of status.nodes are the node ids
+                if event == "map_key":
+                    node_prefix = f"status.nodes.{value}"
+                    compact_nodes.append((value, {}))
+                continue
+            if node_prefix and prefix.startswith(node_prefix):
+                field = prefix[len(node_prefix) + 1:]
+                if event in ("string", "number", "boolean", "null"):
+                    if field in NODE_LOOKUP_FIELDS:
+                        compact_nodes[-1][1][field] = value
+                    elif field.startswith("templateRef."):
+                        compact_nodes[-1][1].setdefault("templateRef", {})[field[len("templateRef."):]] = value
+                continue
+            for header_prefix in HEADER_PREFIXES:
+                if prefix == header_prefix or prefix.startswith(header_prefix + "."):
+                    builders.setdefault(header_prefix, ObjectBuilder()).event(event, value)
+                    break
+
+    header = {}
+    for header_prefix, builder in builders.items():
+        *parents, key = header_prefix.split(".")
+        target = header
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = builder.value
+
+    return header, build_node_lookups(compact_nodes)
+
+
+def iter_streamed_nodes(json_filepath):
+    """Second streaming pass: yield the (node_id, node_info) pairs of
+    status.nodes one at a time."""
+    import ijson
+
+    with open(json_filepath, 'rb') as f:
+        yield from ijson.kvitems(f, "status.nodes", use_float=True)
+
+
+def read_workflow(json_filepath, reader="json"):
+    """Read an Argo workflow JSON as the (data, nodes, node_lookups) arguments
+    of extract_argo_triples.
+
+    The "json" reader loads the whole document. The "ijson" reader returns the
+    header and lookups of scan_workflow_header, with the nodes streamed by a
+    second pass over the file.
+    """
+    if reader == "ijson":
+        header, node_lookups = scan_workflow_header(json_filepath)
+        return header, iter_streamed_nodes(json_filepath), node_lookups
+
+    with open(json_filepath, 'r') as f:
+        return json.load(f), None, None
+
+
+# =============================================================================
+# Output
+# =============================================================================
+PREFIXES = {
+    "bioschemas": BIOSCHEMAS,
+    "edam": EDAM,
+    "p-plan": PPLAN,
+    "prov": PROV,
+    "schema": SCHEMA,
+    "sf": SF,
+    "wfrun": WFRUN,
+    "ex": EX,
+}
+
+# file extension -> output format, the extension being checked before an optional .gz
+OUTPUT_FORMATS = {".ttl": "turtle", ".nt": "nt", ".nq": "nquads", ".trig": "trig"}
+
+NT_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+
+
+def get_output_format(output_filepath):
+    """Infer the output format from the file extension, Turtle by default."""
+    path = output_filepath[:-3] if output_filepath.endswith(".gz") else output_filepath
+    for extension, output_format in OUTPUT_FORMATS.items():
+        if path.endswith(extension):
+            return output_format
+    return "turtle"
+
+
+def open_output(output_filepath):
+    """Open the output file for text writing, gzip-compressed when it ends with .gz."""
+    if output_filepath.endswith(".gz"):
+        return gzip.open(output_filepath, 'wt', encoding='utf-8')
+    return open(output_filepath, 'w', encoding='utf-8')
+
+
+def format_nt_term(term):
+    """Serialize an rdflib term in N-Triples syntax."""
+    if isinstance(term, Literal):
+        value = f'"{str(term).translate(NT_ESCAPES)}"'
+        if term.language:
+            return f"{value}@{term.language}"
+        if term.datatype:
+            return f"{value}^^<{term.datatype}>"
+        return value
+    if isinstance(term, BNode):
+        return f"_:{term}"
+    return f"<{term}>"
+
+
+def write_rdf_stream(workflow, output_file, graph_uri=None, template_lines=None):
+    """Write the triples of the workflow as N-Triples lines, or as N-Quads lines
+    in the named graph graph_uri, as soon as they are produced.
+
+    Template-level triples are written once, in the default graph; only their
+    distinct lines are kept in memory, so memory does not grow with the number
+    of nodes. If template_lines is a set, they are added to it instead of
+    being written, for the caller to merge them across workflows.
+    """
+    execution_suffix = f" {format_nt_term(graph_uri)} .\n" if graph_uri is not None else " .\n"
+    seen_template_lines = set() if template_lines is None else template_lines
+
+    def emit(triple):
+        output_file.write(" ".join(format_nt_term(term) for term in triple) + execution_suffix)
+
+    def emit_template(triple):
+        line = " ".join(format_nt_term(term) for term in triple) + " .\n"
+        if line not in seen_template_lines:
+            seen_template_lines.add(line)
+            if template_lines is None:
+                output_file.write(line)
 
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else "argo_execution_kg.ttl"
+    data, nodes, node_lookups = workflow
+    extract_argo_triples(data, emit, emit_template, nodes, node_lookups)
 
-    extract_argo_to_kg(input_file, output_file)
+
+def extract_run_part(json_filepath, part_filepath, output_format, reader="json"):
+    """Write the execution-level triples of one workflow to part_filepath, in
+    the named graph of its execution, and return its template-level lines.
+
+    In TriG the named graph is a GRAPH block, in N-Quads the fourth term of
+    each line. A part whose path ends with .gz is a gzip member, so that the
+    parts can be concatenated into a valid gzip file.
+    """
+    workflow = read_workflow(json_filepath, reader)
+    graph_uri = EX[workflow[0].get("metadata", {}).get("uid", "unknown-uid")]
+    template_lines = set()
+    with open_output(part_filepath) as part_file:
+        if output_format == "trig":
+            part_file.write(f"{format_nt_term(graph_uri)} {{\n")
+            write_rdf_stream(workflow, part_file, template_lines=template_lines)
+            part_file.write("}\n")
+        else:
+            write_rdf_stream(workflow, part_file, graph_uri, template_lines)
+
+    print(f"Extracted {json_filepath}")
+    return template_lines
+
+
+def extract_argo_batch(json_filepaths, output_filepath, output_format="nquads", workers=None, reader="json"):
+    """Convert several Argo workflow JSON files to a single N-Quads or TriG file.
+
+    The workflows are extracted in a process pool, each to a part file holding
+    the named graph of its execution. The parts are appended in input order,
+    each preceded by the template-level triples not yet written, so that the
+    default graph holds every template-level triple once across all runs.
+    """
+    if output_format not in ("nquads", "trig"):
+        raise ValueError(f"Batch extraction writes N-Quads or TriG, not {output_format}")
+
+    suffix = ".gz" if output_filepath.endswith(".gz") else ""
+    tmp_dir = tempfile.mkdtemp(prefix=".create-wf-", dir=os.path.dirname(os.path.abspath(output_filepath)))
+    part_filepaths = [os.path.join(tmp_dir, f"part-{i}{suffix}") for i in range(len(json_filepaths))]
+    # written in tmp_dir, so that a failing extraction leaves nothing behind next to the output
+    tmp_output_filepath = os.path.join(tmp_dir, "output")
+    seen_template_lines = set()
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        run_map = executor.map if executor else map
+        results = run_map(extract_run_part, json_filepaths, part_filepaths,
+                          [output_format] * len(json_filepaths), [reader] * len(json_filepaths))
+        with open(tmp_output_filepath, 'wb') as output_file:
+            for part_filepath, template_lines in zip(part_filepaths, results):
+                new_lines = sorted(template_lines - seen_template_lines)
+                seen_template_lines.update(new_lines)
+                if new_lines:
+                    chunk = "".join(new_lines).encode('utf-8')
+                    output_file.write(gzip.compress(chunk) if suffix else chunk)
+                with open(part_filepath, 'rb') as part_file:
+                    shutil.copyfileobj(part_file, output_file)
+                os.remove(part_filepath)
+        os.replace(tmp_output_filepath, output_filepath)
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"Knowledge graph of {len(json_filepaths)} workflows generated successfully in {output_filepath}")
+
+
+# =============================================================================
+# Upload to a SPARQL Graph Store
+# =============================================================================
+DEFAULT_UPLOAD_BATCH_SIZE = 50000
+
+# batches waiting for the upload thread; bounds the memory when the store is slower than the extraction
+UPLOAD_QUEUE_SIZE = 4
+
+
+class GraphStoreUploader:
+    """File-like sink POSTing N-Triples lines to a SPARQL 1.1 Graph Store
+    endpoint (e.g. http://localhost:3030/ds/data for Fuseki), in the named
+    graph graph_uri or in the default graph when it is None.
+
+    The lines are sent in batches of batch_size triples by a background thread
+    over a keep-alive session, so that the extraction continues while a batch
+    is uploaded. A batch failing with a connection error or a 5xx status is
+    retried with exponential backoff.
+    """
+
+    def __init__(self, graph_store_url, graph_uri=None, batch_size=DEFAULT_UPLOAD_BATCH_SIZE, retries=5, backoff=0.5):
+        import queue
+        import threading
+        import requests
+
+        if graph_uri is None:
+            self.url = f"{graph_store_url}?default"
+        else:
+            self.url = f"{graph_store_url}?graph={quote(str(graph_uri), safe='')}"
+        self.graph_name = f"<{graph_uri}>" if graph_uri is not None else "the default graph"
+        self.batch_size = batch_size
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        self.batch = []
+        self.uploaded = 0
+        self.error = None
+        self.started_at = time.monotonic()
+        self.queue = queue.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+        self.thread = threading.Thread(target=self._upload_batches, daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, line):
+        if self.error:
+            raise self.error
+        self.batch.append(line)
+        if len(self.batch) >= self.batch_size:
+            self.queue.put(self.batch)
+            self.batch = []
+
+    def close(self):
+        """Send the last batch, wait for the upload thread and raise its error, if any."""
+        if self.batch:
+            self.queue.put(self.batch)
+            self.batch = []
+        self.queue.put(None)
+        self.thread.join()
+        self.session.close()
+        if self.error:
+            raise self.error
+        print(f"{self.uploaded} triples uploaded to {self.graph_name} in {time.monotonic() - self.started_at:.1f}s")
+
+    def _upload_batches(self):
+        while (batch := self.queue.get()) is not None:
+            # after an error the batches are drained so that write() never blocks
+            if self.error:
+                continue
+            try:
+                self._post(batch)
+            except Exception as e:
+                self.error = e
+                continue
+            self.uploaded += len(batch)
+            elapsed = time.monotonic() - self.started_at
+            print(f"{self.uploaded} triples uploaded to {self.graph_name} ({self.uploaded / elapsed:.0f} triples/s)")
+
+    def _post(self, batch):
+        import requests
+
+        body = "".join(batch).encode('utf-8')
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.post(self.url, data=body, headers={"Content-Type": "application/n-triples"},
+                                             timeout=300)
+                if response.status_code < 500:
+                    response.raise_for_status()
+                    return
+                error = requests.HTTPError(f"{response.status_code} {response.reason}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt == self.retries:
+                raise error
+            delay = self.backoff * 2 ** attempt
+            print(f"Upload of {len(batch)} triples failed ({error}), retrying in {delay:.1f}s", file=sys.stderr)
+            time.sleep(delay)
+
+
+def upload_run(json_filepath, graph_store_url, reader="json", batch_size=DEFAULT_UPLOAD_BATCH_SIZE, retries=5):
+    """Upload the execution-level triples of one workflow to the named graph
+    of its execution, and return its template-level lines."""
+    workflow = read_workflow(json_filepath, reader)
+    graph_uri = EX[workflow[0].get("metadata", {}).get("uid", "unknown-uid")]
+    template_lines = set()
+    with GraphStoreUploader(graph_store_url, graph_uri, batch_size, retries) as uploader:
+        write_rdf_stream(workflow, uploader, template_lines=template_lines)
+    return template_lines
+
+
+def upload_argo_runs(json_filepaths, graph_store_url, workers=None, reader="json",
+                     batch_size=DEFAULT_UPLOAD_BATCH_SIZE, retries=5):
+    """Upload the knowledge graph of several workflows to a Graph Store, with
+    the same layout as extract_argo_batch: a named graph per execution, and
+    the template-level triples once in the default graph.
+    """
+    from functools import partial
+
+    upload = partial(upload_run, graph_store_url=graph_store_url, reader=reader, batch_size=batch_size, retries=retries)
+    template_lines = set()
+    if workers == 1:
+        for run_template_lines in map(upload, json_filepaths):
+            template_lines |= run_template_lines
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for run_template_lines in executor.map(upload, json_filepaths):
+                template_lines |= run_template_lines
+
+    with GraphStoreUploader(graph_store_url, None, batch_size, retries) as uploader:
+        for line in sorted(template_lines):
+            uploader.write(line)
+
+    print(f"Knowledge graph of {len(json_filepaths)} workflows uploaded successfully to {graph_store_url}")
+
+
+def expand_inputs(input_path):
+    """List the workflow JSON files of a directory or a glob pattern."""
+    if os.path.isdir(input_path):
+        return sorted(glob.glob(os.path.join(input_path, "*.json")))
+    return sorted(glob.glob(input_path))
+
+
+def extract_argo_to_kg(json_filepath, output_filepath="execution_kg.ttl", output_format=None, reader="json"):
+    """Convert an Argo workflow JSON to a knowledge graph file.
+
+    output_format is "turtle" (the whole graph is built with rdflib before
+    being serialized), "nt", "nquads" or "trig" (streamed line by line, the
+    execution being the named graph of the quads). By default it is inferred
+    from the extension of output_filepath; a .gz suffix compresses the output.
+    reader is "json" or "ijson", see read_workflow.
+    """
+    output_format = output_format or get_output_format(output_filepath)
+
+    if output_format in ("nquads", "trig"):
+        extract_argo_batch([json_filepath], output_filepath, output_format, workers=1, reader=reader)
+        return
+
+    workflow = read_workflow(json_filepath, reader)
+
+    if output_format == "turtle":
+        g = Graph()
+        for prefix, namespace in PREFIXES.items():
+            g.bind(prefix, namespace)
+        data, nodes, node_lookups = workflow
+        extract_argo_triples(data, g.add, g.add, nodes, node_lookups)
+        with open_output(output_filepath) as output_file:
+            output_file.write(g.serialize(format="turtle"))
+    else:
+        with open_output(output_filepath) as output_file:
+            write_rdf_stream(workflow, output_file)
+
+    print(f"Knowledge graph generated successfully in {output_filepath}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert Argo workflow execution JSON files to a knowledge graph.")
+    parser.add_argument("input_file",
+                        help="Argo workflow JSON file, or a directory or glob pattern of them for a batch extraction")
+    parser.add_argument("output_file", nargs="?", default="argo_execution_kg.ttl",
+                        help="Output file; .ttl, .nt, .nq or .trig, optionally followed by .gz (default: argo_execution_kg.ttl)")
+    parser.add_argument("--format", choices=["turtle", "nt", "nquads", "trig"], dest="output_format",
+                        help="Output format, inferred from the output file extension by default")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Number of processes of a batch extraction (default: number of CPUs)")
+    parser.add_argument("--reader", choices=["json", "ijson"], default="json",
+                        help="json loads each document at once; ijson streams it in two passes, for huge status.nodes")
+    parser.add_argument("--graph-store",
+                        help="Upload to this SPARQL Graph Store endpoint (e.g. http://localhost:3030/ds/data) "
+                             "instead of writing output_file")
+    parser.add_argument("--upload-batch-size", type=int, default=DEFAULT_UPLOAD_BATCH_SIZE,
+                        help=f"Triples per upload request (default: {DEFAULT_UPLOAD_BATCH_SIZE})")
+    parser.add_argument("--upload-retries", type=int, default=5, help="Retries of a failed upload request (default: 5)")
+    args = parser.parse_args()
+
+    if os.path.isfile(args.input_file):
+        json_filepaths = None
+    else:
+        json_filepaths = expand_inputs(args.input_file)
+        if not json_filepaths:
+            parser.error(f"No workflow JSON file matches {args.input_file}")
+
+    if args.graph_store:
+        upload_argo_runs(json_filepaths or [args.input_file], args.graph_store, args.workers if json_filepaths else 1,
+                         args.reader, args.upload_batch_size, args.upload_retries)
+    elif json_filepaths is None:
+        extract_argo_to_kg(args.input_file, args.output_file, args.output_format, args.reader)
+    else:
+        output_format = args.output_format or get_output_format(args.output_file)
+        if output_format not in ("nquads", "trig"):
+            parser.error("A batch extraction writes N-Quads (.nq) or TriG (.trig)")
+        extract_argo_batch(json_filepaths, args.output_file, output_format, args.workers, args.reader)
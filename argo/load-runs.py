@@ -0,0 +1,213 @@
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from argo_nodes import get_template_name
+
+# =============================================================================
+# Tables of schema.sql filled by the loader, in foreign key order: the rows of a
+# table only reference rows of the tables listed before it.
+# =============================================================================
+TABLE_COLUMNS = {
+    "experience": ["id_experience", "exp_description"],
+    "workflow_run": ["id_wf_run", "id_experience"],
+    "task_model": ["id_task_model", "id_experience"],
+    "pod": ["id_pod", "id_task_model", "id_wf_run"],
+    "job": ["id_job", "id_pod"],
+    "pr_metric": ["id_metric_pr", "bd_name", "mesure_name", "id_pod"],
+    "pr_measure": ["id_pr_measure", "measure", "measure_time", "id_metric_pr"],
+}
+
+# bd_name of the metrics taken from the workflow JSON, as opposed to the ones scraped from Prometheus
+ARGO_METRICS_SOURCE = "argo"
+
+DEFAULT_BATCH_SIZE = 50000
+
+
+def get_stable_id(*parts):
+    """Generate a signed 64-bit surrogate key from the natural key parts.
+
+    The key only depends on the parts, so that loading the same workflow twice,
+    or from two processes, yields the same ids.
+    """
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+def get_timestamp(argo_time):
+    """Convert an Argo RFC 3339 UTC time (2024-05-01T10:00:00Z) to a naive UTC datetime."""
+    from datetime import datetime
+
+    if not argo_time:
+        return None
+    return datetime.fromisoformat(argo_time.replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+def extract_run_rows(json_filepath):
+    """Map an Argo workflow JSON to the rows of the tables of TABLE_COLUMNS.
+
+    - Experience: the workflow template
+    - Workflow_Run: the workflow execution (metadata.uid)
+    - Task_Model: the template of each Pod node
+    - Pod / Job: each Pod node of status.nodes
+    - Pr_Metric / Pr_Measure: the duration (finishedAt - startedAt) and the
+      resourcesDuration of each Pod node
+    """
+    with open(json_filepath, 'r') as f:
+        data = json.load(f)
+
+    metadata = data.get("metadata", {})
+    uid = metadata.get("uid", "unknown-uid")
+    template_name = metadata.get("labels", {}).get(
+        "workflows.argoproj.io/workflow-template", "unknown-template"
+    )
+
+    rows = {table: [] for table in TABLE_COLUMNS}
+
+    id_experience = get_stable_id("experience", template_name)
+    id_wf_run = get_stable_id("workflow_run", uid)
+    rows["experience"].append((id_experience, template_name))
+    rows["workflow_run"].append((id_wf_run, id_experience))
+
+    for node_id, node_info in data.get("status", {}).get("nodes", {}).items():
+        if node_info.get("type") != "Pod":
+            continue
+
+        id_task_model = get_stable_id("task_model", template_name, get_template_name(node_info))
+        id_pod = get_stable_id("pod", uid, node_id)
+        rows["task_model"].append((id_task_model, id_experience))
+        rows["pod"].append((id_pod, id_task_model, id_wf_run))
+        rows["job"].append((get_stable_id("job", uid, node_id), id_pod))
+
+        started_at = get_timestamp(node_info.get("startedAt"))
+        finished_at = get_timestamp(node_info.get("finishedAt"))
+        measures = []
+        if started_at and finished_at:
+            measures.append(("duration", (finished_at - started_at).total_seconds(), started_at))
+        for res_type, duration in node_info.get("resourcesDuration", {}).items():
+            measures.append((f"resourcesDuration.{res_type}", duration, finished_at))
+
+        for mesure_name, measure, measure_time in measures:
+            id_metric_pr = get_stable_id("pr_metric", uid, node_id, mesure_name)
+            rows["pr_metric"].append((id_metric_pr, ARGO_METRICS_SOURCE, mesure_name, id_pod))
+            rows["pr_measure"].append((get_stable_id("pr_measure", id_metric_pr, measure_time), str(measure),
+                                       measure_time, id_metric_pr))
+
+    return rows
+
+
+def encode_csv_rows(rows):
+    """Encode rows in the CSV format of COPY, None being NULL."""
+    import csv
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
+def copy_rows(cursor, pending_rows):
+    """COPY the pending rows of each table into its staging table and merge them.
+
+    The rows whose key is already present (template shared by several runs,
+    workflow loaded again) are skipped with ON CONFLICT DO NOTHING.
+    """
+    for table, columns in TABLE_COLUMNS.items():
+        rows = pending_rows[table]
+        if not rows:
+            continue
+        column_list = ", ".join(columns)
+        cursor.execute(f"TRUNCATE {table}_staging")
+        cursor.copy_expert(f"COPY {table}_staging ({column_list}) FROM STDIN WITH (FORMAT csv)", encode_csv_rows(rows))
+        cursor.execute(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {table}_staging ON CONFLICT DO NOTHING")
+        print(f"{cursor.rowcount} of {len(rows)} rows inserted into {table}")
+        rows.clear()
+
+
+def load_runs(json_filepaths, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, workers=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Parse the workflow JSON files in a process pool and bulk load their rows, in a single transaction.
+
+    The rows are sent with COPY once batch_size of them are pending; the rows
+    of a workflow are always sent together so that its foreign keys resolve.
+    """
+    import psycopg2
+
+    conn = None
+
+    try:
+        conn = psycopg2.connect(
+            dbname=DB_NAME,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            host=DB_HOST,
+            port=DB_PORT
+        )
+        print("Database connection established successfully.")
+
+        with conn.cursor() as cursor, ProcessPoolExecutor(max_workers=workers) as executor:
+            for table in TABLE_COLUMNS:
+                cursor.execute(f"CREATE TEMP TABLE {table}_staging (LIKE {table}) ON COMMIT DROP")
+
+            pending_rows = {table: [] for table in TABLE_COLUMNS}
+            pending_count = 0
+            # the experiences and task models are shared by the runs of a template
+            seen_shared_ids = {"experience": set(), "task_model": set()}
+
+            for json_filepath, rows in zip(json_filepaths, executor.map(extract_run_rows, json_filepaths, chunksize=4)):
+                for table, table_rows in rows.items():
+                    if table in seen_shared_ids:
+                        seen = seen_shared_ids[table]
+                        table_rows = [row for row in dict.fromkeys(table_rows) if row[0] not in seen]
+                        seen.update(row[0] for row in table_rows)
+                    pending_rows[table].extend(table_rows)
+                    pending_count += len(table_rows)
+                print(f"Parsed {json_filepath}")
+
+                if pending_count >= batch_size:
+                    copy_rows(cursor, pending_rows)
+                    pending_count = 0
+            copy_rows(cursor, pending_rows)
+
+        conn.commit()
+        print(f"Transaction committed. {len(json_filepaths)} workflows loaded.")
+
+    except psycopg2.Error as e:
+        print(f"Error connecting to or interacting with the database: {e}", file=sys.stderr)
+        if conn:
+            conn.rollback()
+            print("Transaction rolled back due to error.")
+    finally:
+        if conn:
+            conn.close()
+            print("Database connection closed.")
+
+
+def expand_inputs(inputs):
+    """Expand the directories (their *.json files) and glob patterns of the command line."""
+    json_filepaths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            json_filepaths += sorted(glob.glob(os.path.join(path, "*.json")))
+        else:
+            json_filepaths += sorted(glob.glob(path)) or [path]
+    return json_filepaths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load Argo workflow JSON files into the run tables of schema.sql. "
+                    "The database is given by the DB_NAME, DB_USER, DB_PASSWORD, DB_HOST and DB_PORT environment variables."
+    )
+    parser.add_argument("inputs", nargs="+", help="Workflow JSON files, directories or glob patterns")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of parsing processes")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Number of rows sent per COPY")
+    args = parser.parse_args()
+
+    load_runs(expand_inputs(args.inputs), os.getenv("DB_NAME"), os.getenv("DB_USER"), os.getenv("DB_PASSWORD"),
+              os.getenv("DB_HOST"), os.getenv("DB_PORT"), args.workers, args.batch_size)
@@ -46,6 +46,7 @@ if __name__ == "__main__":
                 SecretEnv(name="AWS_SECRET_ACCESS_KEY", secret_name="ceph-s3-pagoda", secret_key="secretkey"),
                 SecretEnv(name="AWS_ACCESS_KEY_ID", secret_name="ceph-s3-pagoda", secret_key="accesskey"),
                 Env(name="WORKFLOW_ID", value="{{inputs.parameters.workflow_id}}"),
+                Env(name="MERGE_COMPRESSION", value=constants.merge_compression),
             ],
             outputs=[Artifact(name="time_merged_logs", path="/app/{{inputs.parameters.workflow_id}}/querier/merged_logs.log"),
                      Artifact(name="space_merged_logs", path="/app/{{inputs.parameters.workflow_id}}/space/merged_logs.log")],
@@ -66,6 +67,9 @@ if __name__ == "__main__":
                 Env(name="COUNT_VERSION", value="{{inputs.parameters.count_version}}"),
                 Env(name="COUNT_COMPONENT", value="{{inputs.parameters.count_component}}"),
                 Env(name="COUNT_REPEAT", value="{{inputs.parameters.count_repeat}}"),
+                Env(name="PLOT_WORKERS", value=constants.plot_workers),
+                Env(name="STATS_WORKERS", value=constants.plot_workers),
+                Env(name="CACHE_DIR", value=""),
             ],
             outputs=[
                 Artifact(name="time-plots", path="/app/"),
@@ -83,6 +87,7 @@ if __name__ == "__main__":
             env=[
                 Env(name="LOG_FILE_PATH", value="merged_logs.log"),
                 Env(name="COUNT_VERSION", value="{{inputs.parameters.count_version}}"),
+                Env(name="CACHE_DIR", value=""),
             ],
             outputs=[
                 Artifact(name="space-plots", path="/app/"),
@@ -14,7 +14,7 @@ from hera.workflows import (
 from hera.shared import global_config
 from hera.workflows.models import Toleration, Arguments, Parameter, ValueFrom, ImagePullPolicy, IntOrString
 from experiment_constants import constants
-from experiment_utils import create_service_manifest, create_cleanup_config
+from experiment_utils import create_service_manifest, create_cleanup_config, create_dataset_importer
 import os
 
 @script(inputs=[Parameter(name="version"), Parameter(name="product"), Parameter(name="step"), Parameter(name="workflow_id")],
@@ -26,84 +26,6 @@ def compute_blazegraph_configurations(version: str, product: str, step: str, wor
     with open("/tmp/blazegraph-name", "w") as f_out:
         f_out.write(f"{workflow_id}-blazegraph-{version}-{product}-{step}")
 
-@script(
-    image=constants.python_requests,
-    inputs=[
-        Parameter(name="existing_volume_name",
-                  description="The name of the existing volume containing the data to import"),
-        Parameter(name="number_of_versions",
-                  description="The number of versions to import"),
-        Parameter(name="hostname",
-                  description="The hostname of the server to import the data into"),
-    ],
-    volumes=[
-        ExistingVolume(
-            name="{{inputs.parameters.existing_volume_name}}",
-            claim_name="{{inputs.parameters.existing_volume_name}}",
-            mount_path="/app/data",
-        )
-    ],
-    resources=Resources(memory_limit=f"{constants.memory_limit}Gi"),
-    env=[
-        Env(name="PYTHONUNBUFFERED", value="1"),
-    ]
-)
-def create_theoretical_dataset_importer(
-    number_of_versions: int,
-    hostname: str
-) -> None:
-    from datetime import datetime
-    import os
-    import time
-    import requests
-    import sys
-
-    directory = "/app/data/data/theoretical"
-
-    try:
-        print(
-            f"Directory: {directory}, Number of versions: {number_of_versions}, Hostname: {hostname}")
-
-        # Get the list of files and directories in the specified directory
-        files_and_directories = os.listdir(directory)
-
-        # Filter out directories, keeping only files
-        files = [f for f in files_and_directories if os.path.isfile(
-            os.path.join(directory, f))]
-
-        for file in files:
-            if file.endswith(".ttl.trig"):
-                # Extraire le numéro de version à partir du nom de fichier
-                version = int(file.split('-')[-1].split('.ttl')[0])
-
-                # Vérifier si la version est inférieure ou égale au nombre de versions spécifiées
-                if version <= number_of_versions:
-                    print(
-                        f"\n{datetime.now().isoformat()} - [Triple Store] Version {file}")
-                    start = int(time.time() * 1000)
-                    filepath = os.path.join(directory, file)
-
-                    # Effectuer la requête HTTP pour importer la version
-                    try:
-                        with open(filepath, 'r') as f:
-                            response = requests.post(
-                                f'http://{hostname}-service:9999/blazegraph/sparql',
-                                headers={'Content-Type': 'application/x-trig'},
-                                data=f.read(),
-                                timeout=18000  # 5 hours in seconds
-                            )
-                            response.raise_for_status()
-                    except requests.exceptions.RequestException as e:
-                        print(f"Failed to import {filepath}: {e}")
-                        sys.exit(1)
-
-                    end = int(time.time() * 1000)
-                    print(
-                        f"\n{datetime.now().isoformat()} - [Measure] (Import BG {file}): {end-start}ms;")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-
-
 if __name__ == "__main__":
 
     global_config.host = f'https://{os.environ.get("ARGO_SERVER")}'
@@ -207,6 +129,8 @@ if __name__ == "__main__":
                   "{{inputs.parameters.version}}", "{{inputs.parameters.product}}", "{{inputs.parameters.step}}"]
         )
 
+        dataset_importer_create = create_dataset_importer("blazegraph")
+
         with DAG(name="blazegraph-dag", inputs=[
                 Parameter(name="version"),
                 Parameter(name="product"),
@@ -241,12 +165,15 @@ if __name__ == "__main__":
                 },
             )
 
-            task_blazegraph_importer_create = create_theoretical_dataset_importer(
+            task_blazegraph_importer_create = Task(
                 name="blazegraph-importer",
+                template=dataset_importer_create,
                 arguments={
                     "existing_volume_name": dag.get_parameter("dataset-pvc-name"),
                     "number_of_versions": dag.get_parameter("version"),
-                    "hostname": task_compute_blazegraph_configurations.get_parameter("blazegraph-name")
+                    "hostname": task_compute_blazegraph_configurations.get_parameter("blazegraph-name"),
+                    "product": dag.get_parameter("product"),
+                    "step": dag.get_parameter("step")
                 }
             )
 
@@ -0,0 +1,81 @@
+"""Helpers shared by the images reading the benchmark logs, copied into each of them at build time."""
+import io
+import os
+
+
+# first bytes of the gzip and zstd formats
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def get_log_compression(log_file_path: str):
+    """
+    Returns the compression of the log file ("gzip", "zstd" or None), read from its first bytes:
+    the merged logs keep their name whatever the MERGE_COMPRESSION of get-workflow-logs.
+    """
+    with open(log_file_path, 'rb') as f:
+        head = f.read(len(ZSTD_MAGIC))
+    if head.startswith(GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+
+def open_log_file(log_file_path: str):
+    """
+    Opens the log file for binary reading, decompressing gzip and zstd logs on the fly.
+    The returned file can be iterated by lines whatever the compression.
+    """
+    compression = get_log_compression(log_file_path)
+    if compression == "gzip":
+        import gzip
+        return gzip.open(log_file_path, 'rb')
+    if compression == "zstd":
+        import zstandard
+        # the zstandard reader cannot be iterated by lines on its own
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(log_file_path, 'rb'), read_across_frames=True, closefd=True))
+    return open(log_file_path, 'rb')
+
+
+def filter_groups(df, rules: list):
+    """
+    Applies a chain of group filters to the DataFrame, in order.
+
+    Each rule computes an aggregate of `column` for every `group_by` group with a
+    groupby().transform, so that the mask is built in a single vectorized pass:
+    - min_threshold: keep the groups whose aggregate is >= min_threshold
+    - expected_value: keep the groups whose aggregate is == expected_value
+    - drop_by (optional): drop the whole drop_by group as soon as one of its
+      group_by groups is rejected
+    """
+    for rule in rules:
+        if df.empty:
+            break
+
+        aggregate = df.groupby(rule["group_by"], observed=True)[rule["column"]].transform(rule["aggregate"])
+        if "expected_value" in rule:
+            keep = aggregate == rule["expected_value"]
+        else:
+            keep = aggregate >= rule["min_threshold"]
+
+        if "drop_by" in rule:
+            keep = keep.groupby([df[col] for col in rule["drop_by"]], observed=True).transform('all')
+
+        df = df[keep]
+        print(f"After {rule['name']}: {len(df)}")
+
+    return df
+
+
+def store_data_to_parquet(data, file_path):
+    """
+    Store the data to a compressed parquet file
+    Args:
+        data (pd.DataFrame): Extracted records
+        file_path (str): Path to the parquet file
+    """
+    # write to a temporary file first so that an interrupted run never leaves a truncated file behind
+    tmp_file_path = f"{file_path}.tmp"
+    data.to_parquet(tmp_file_path, compression='zstd', index=False)
+    os.replace(tmp_file_path, file_path)
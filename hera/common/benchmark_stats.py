@@ -0,0 +1,108 @@
+"""Statistics engine shared by log-to-plots and csv-to-plots, copied into their images at build time."""
+
+
+def build_samples(df, group_cols: list, value_col: str):
+    """
+    Splits the values of value_col into one array per group of group_cols in a single pass,
+    keeping the order of the rows within each group.
+    Returns the group keys as tuples and the arrays, sorted by group keys.
+    """
+    import numpy as np
+
+    grouped = df.groupby(group_cols, observed=True, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    order = np.argsort(codes, kind='stable')
+    boundaries = np.searchsorted(codes[order], np.arange(grouped.ngroups + 1))
+    values = df[value_col].to_numpy()[order]
+
+    keys = [key if isinstance(key, tuple) else (key,) for key in grouped.size().index]
+    samples = [values[start:end] for start, end in zip(boundaries[:-1], boundaries[1:])]
+    return keys, samples
+
+
+def build_component_samples(df, group_cols: list, component_col: str, value_col: str):
+    """
+    Returns one (key, [(component, sample), ...]) task per group of group_cols, sorted by group keys,
+    the components of a group being listed in order of first appearance.
+    """
+    import numpy as np
+
+    keys, samples = build_samples(df, group_cols + [component_col], value_col)
+    codes = df.groupby(group_cols + [component_col], observed=True, sort=True).ngroup().to_numpy()
+    unique_codes, first_rows = np.unique(codes, return_index=True)
+    first_rows = first_rows[unique_codes >= 0]
+
+    tasks = {}
+    for key, sample, first_row in zip(keys, samples, first_rows):
+        tasks.setdefault(key[:-1], []).append((first_row, key[-1], sample))
+    return [
+        (key, [(component, sample) for _, component, sample in sorted(components, key=lambda item: item[0])])
+        for key, components in tasks.items()
+    ]
+
+
+def run_shapiro_wilk_tests(tasks: list):
+    """
+    Runs the Shapiro-Wilk test on every (key, sample) task with at least 2 values.
+    Returns one (key, W, p-value, mean, median, 75th percentile, 95th percentile) tuple per tested sample.
+    """
+    import numpy as np
+    from scipy import stats
+
+    rows = []
+    for key, sample in tasks:
+        if len(sample) < 2:
+            continue
+        stat, p_value = stats.shapiro(sample)
+        percentile_75, percentile_95 = np.percentile(sample, [75, 95])
+        rows.append((key, float(stat), float(p_value), float(np.mean(sample)), float(np.median(sample)),
+                     float(percentile_75), float(percentile_95)))
+    return rows
+
+
+def run_mann_whitney_u_tests(tasks: list):
+    """
+    Runs the two-sided Mann-Whitney U test of scipy on every pair of components of every
+    (key, [(component, sample), ...]) task, the components with less than 2 values being skipped.
+    Returns one (key, component 1, component 2, U, p-value) tuple per tested pair.
+    """
+    from itertools import combinations
+    from scipy import stats
+
+    rows = []
+    for key, components in tasks:
+        components = [(component, sample) for component, sample in components if len(sample) >= 2]
+        for (comp1, sample1), (comp2, sample2) in combinations(components, 2):
+            result = stats.mannwhitneyu(sample1, sample2, alternative='two-sided')
+            rows.append((key, comp1, comp2, float(result.statistic), float(result.pvalue)))
+    return rows
+
+
+def run_statistical_tests(function, tasks: list, workers: int = 1):
+    """
+    Runs function on the tasks, split in contiguous chunks over a process pool when workers > 1.
+    The rows are returned in the order of the tasks.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if workers <= 1 or len(tasks) < 2:
+        return function(tasks)
+
+    chunk_size = -(-len(tasks) // (workers * 4))
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [row for rows in executor.map(function, chunks) for row in rows]
+
+
+def shapiro_wilk_results_table(rows: list, key_cols: list, columns: list):
+    """
+    Builds the tidy table of the Shapiro-Wilk test results, with the given column order.
+    """
+    import pandas as pd
+
+    alpha = 0.05
+    table = pd.DataFrame(
+        [key + tuple(values) for key, *values in rows],
+        columns=key_cols + ['W_STATISTIC', 'P_VALUE', 'MEAN', 'MEDIAN', '75TH_PERC', '95TH_PERC'])
+    table['NORMALLY_DISTRIBUTED'] = (table['P_VALUE'] > alpha).astype(str)
+    return table[columns]
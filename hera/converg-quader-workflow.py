@@ -13,7 +13,7 @@ from hera.workflows import (
 from hera.shared import global_config
 from hera.workflows.models import Toleration, Arguments, Parameter, ImagePullPolicy, ValueFrom, IntOrString
 from experiment_constants import constants
-from experiment_utils import create_service_manifest, create_cleanup_config
+from experiment_utils import create_service_manifest, create_cleanup_config, create_dataset_importer
 import os
 
 
@@ -23,83 +23,6 @@ def compute_quader_configurations(version: str, product: str, step: str, mode: s
     with open("/tmp/quader-name", "w") as f_out:
         f_out.write(f"{workflow_id}-quader-{version}-{product}-{step}-{mode}")
 
-@script(
-    image=constants.python_requests,
-    inputs=[
-        Parameter(name="existing_volume_name", description="The name of the existing volume containing the data to import"),
-        Parameter(name="number_of_versions", description="The number of versions to import"),
-        Parameter(name="hostname", description="The hostname of the server to import the data into"),
-        Parameter(name="mode", description="Configuration for mode")
-    ],
-    volumes=[
-        ExistingVolume(
-            name="{{inputs.parameters.existing_volume_name}}",
-            claim_name="{{inputs.parameters.existing_volume_name}}",
-            mount_path="/app/data",
-        )
-    ],
-    resources=Resources(memory_limit=f"{constants.memory_limit}Gi"),
-    env=[
-        Env(name="PYTHONUNBUFFERED", value="1"),
-    ]
-)
-def create_relational_dataset_importer(
-    number_of_versions: int,
-    hostname: str,
-    mode: str
-) -> None:
-    from datetime import datetime
-    import os
-    import time
-    import requests
-    import sys
-
-    directory = "/app/data/data/relational"
-
-    try:
-        print(f"Directory: {directory}, Number of versions: {number_of_versions}, Hostname: {hostname}")
-
-        # Get the list of files and directories in the specified directory
-        files_and_directories = os.listdir(directory)
-        
-        # Filter out directories, keeping only files
-        files = [f for f in files_and_directories if os.path.isfile(os.path.join(directory, f))]
-
-        # Print the files
-        for file in files:
-            if file.endswith(".ttl.trig"):
-                # Extraire le numéro de version à partir du nom de fichier
-                version = int(file.split('-')[-1].split('.ttl')[0])
-
-                # Vérifier si la version est inférieure ou égale au nombre de versions spécifiées
-                if version <= number_of_versions:
-                    print(f"\n{datetime.now().isoformat()} - [quads-loader] Version {file}")
-                    start = int(time.time() * 1000)
-                    filepath = os.path.join(directory, file)
-
-                    # Effectuer la requête HTTP pour importer la version
-                    try:
-                        with open(filepath, 'rb') as f:
-                            response = requests.post(
-                                f'http://{hostname}-service:8080/import/version',
-                                files=dict(file=f),
-                                timeout=18000  # 5 hours in seconds
-                            )
-                            response.raise_for_status()
-                    except requests.exceptions.RequestException as e:
-                        print(f"Failed to import {filepath}: {e}")
-                        sys.exit(1)
-
-                    end = int(time.time() * 1000)
-                    print(f"\n{datetime.now().isoformat()} - [Measure] (Import STS {file}): {end-start}ms;")
-
-        if mode == "flat":
-            print("[quads-loader] Flattening the dataset")
-            response = requests.get(f'http://{hostname}-service:8080/import/flatten')
-            response.raise_for_status()
-    except Exception as e:
-        print(f"An error occurred: {e}")
-
 if __name__ == "__main__":
     
     global_config.host = f'https://{os.environ.get("ARGO_SERVER")}'
@@ -172,6 +95,12 @@ if __name__ == "__main__":
             )
         )
 
+        dataset_importer_create = create_dataset_importer(
+            "quader",
+            extra_env=[Env(name="MODE", value="{{inputs.parameters.mode}}")],
+            extra_inputs=[Parameter(name="mode", description="Configuration for mode")],
+        )
+
         with DAG(name="quader-dag", inputs=[
                 Parameter(name="version"),
                 Parameter(name="product"),
@@ -211,12 +140,15 @@ if __name__ == "__main__":
                 },
             )
 
-            task_rel_importer = create_relational_dataset_importer(
+            task_rel_importer = Task(
                 name="import-relational-dataset",
+                template=dataset_importer_create,
                 arguments={
                     "existing_volume_name": dag.get_parameter("dataset-pvc-name"),
                     "number_of_versions": dag.get_parameter("version"),
                     "hostname": task_compute_quader_configurations.get_parameter("quader-name"),
+                    "product": dag.get_parameter("product"),
+                    "step": dag.get_parameter("step"),
                     "mode": dag.get_parameter("mode")
                 }
             )
@@ -0,0 +1,564 @@
+import gzip
+import json
+import os
+import re
+import sys
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import chain
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# size of the blocks read from the version files while their request body is sent
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+DEFAULT_TIMEOUT = 18000  # 5 hours in seconds
+
+# zlib wbits of the gzip format
+GZIP_WBITS = 31
+
+# the request bodies are compressed while they are sent: the fastest level already saves most of the transfer
+UPLOAD_GZIP_LEVEL = 1
+
+# statuses of a backend refusing a gzip request body: unsupported encoding, or a body it could not parse
+GZIP_REFUSED_STATUSES = (400, 415, 500)
+
+# an IRI, word, string, comment or blank of a TriG line: once they are removed, the punctuation
+# left tells where the statements and the graph blocks of the line start and end
+TRIG_TERM_PATTERN = re.compile(
+    rb'<[^<>"{}|^`\\\s]*>'
+    rb'|[^\s<>"\'{}\[\]();,#.]+(?:\.+[^\s<>"\'{}\[\]();,#.]+)*'
+    rb'|"""[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""'
+    rb"|'''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''"
+    rb'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+    rb"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'"
+    rb'|#[^\n]*'
+    rb'|\s+'
+)
+
+TRIG_DIRECTIVE_PATTERN = re.compile(rb"\s*(?:@prefix|@base|prefix|base)\s", re.IGNORECASE)
+
+# the end of a line ending a triple: the . ; or , that follows it
+TRIPLE_END_PATTERN = re.compile(rb"[.;,][ \t\r]*\n")
+# a @prefix or @base line, which also ends with a . but is not counted, like in iter_trig_chunks
+DIRECTIVE_END_PATTERN = re.compile(rb"^[ \t]*(?:@prefix|@base|prefix|base)[ \t][^\n]*[.;,][ \t\r]*\n",
+                                   re.IGNORECASE | re.MULTILINE)
+
+
+def get_version(filename):
+    """
+    Returns the version number of a dataset file: <name>-<version>.ttl.trig[.gz]
+    """
+    return int(filename.split('-')[-1].split('.ttl')[0])
+
+
+def list_version_files(directory, number_of_versions):
+    """
+    Returns the paths of the .ttl.trig files of the versions 1 to number_of_versions, sorted by version.
+    A version stored compressed (.ttl.trig.gz) is taken when it is not stored uncompressed too.
+    """
+    version_files = {}
+    for file in sorted(os.listdir(directory), key=is_gzip_file):
+        filepath = os.path.join(directory, file)
+        if file.endswith((".ttl.trig", ".ttl.trig.gz")) and os.path.isfile(filepath):
+            version = get_version(file)
+            if version <= number_of_versions:
+                version_files.setdefault(version, filepath)
+    return [filepath for _, filepath in sorted(version_files.items())]
+
+
+def is_gzip_file(filepath):
+    return filepath.endswith(".gz")
+
+
+class TripleCountingReader:
+    """
+    Version file used as a request body: it is read in blocks while the request is sent instead
+    of being loaded in memory, and its triples and (uncompressed) bytes are counted on the way.
+
+    A gzip version file is decompressed while it is read, unless passthrough is set: its
+    compressed bytes are then read as they are stored, to be sent with Content-Encoding: gzip,
+    and only decompressed to count the triples.
+    """
+
+    def __init__(self, filepath, passthrough=False):
+        compressed = is_gzip_file(filepath)
+        # whether read() returns gzip data, and whether it returns the file as it is stored
+        self.gzip = compressed and passthrough
+        self.stored = not compressed or passthrough
+        if self.stored:
+            self.f = open(filepath, 'rb', buffering=UPLOAD_CHUNK_SIZE)
+        else:
+            self.f = gzip.open(filepath, 'rb')
+        self.decompressor = zlib.decompressobj(GZIP_WBITS) if self.gzip else None
+        self.triples = 0
+        self.bytes = 0
+        self.partial_line = b""
+
+    def __len__(self):
+        # the stored bytes left to read, from which requests and MultipartEncoder set the Content-Length
+        return os.fstat(self.f.fileno()).st_size - self.f.tell()
+
+    def decompress(self, block):
+        data = []
+        while block:
+            if self.decompressor.eof:
+                # the next member of a multi-member gzip file
+                self.decompressor = zlib.decompressobj(GZIP_WBITS)
+            data.append(self.decompressor.decompress(block))
+            block = self.decompressor.unused_data
+        return b"".join(data)
+
+    def read(self, size=-1):
+        block = self.f.read(size)
+        data = self.decompress(block) if self.gzip else block
+        self.bytes += len(data)
+        lines = self.partial_line + data + (b"" if block else b"\n")
+        cut = lines.rfind(b"\n") + 1
+        self.triples += len(TRIPLE_END_PATTERN.findall(lines, 0, cut)) - len(DIRECTIVE_END_PATTERN.findall(lines, 0, cut))
+        self.partial_line = lines[cut:]
+        return block
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.f.close()
+
+
+def open_version_file(filepath, gzip_body=False):
+    return TripleCountingReader(filepath, passthrough=gzip_body)
+
+
+def open_trig_file(filepath):
+    if is_gzip_file(filepath):
+        return gzip.open(filepath, 'rb')
+    return open(filepath, 'rb', buffering=UPLOAD_CHUNK_SIZE)
+
+
+def iter_blocks(f):
+    while block := f.read(UPLOAD_CHUNK_SIZE):
+        yield block
+
+
+def has_blank_node_labels(filepath):
+    """
+    Whether the TriG file may hold a labelled blank node (_:label), whose statements cannot be
+    split across chunks: the labels are scoped to a request. A _: inside a literal or an IRI
+    is also reported, the version then being imported in a single request.
+    """
+    with open_trig_file(filepath) as f:
+        # last byte of the previous block, for a label cut by the end of a block
+        tail = b""
+        for block in iter_blocks(f):
+            if b"_:" in tail + block:
+                return True
+            tail = block[-1:]
+    return False
+
+
+def iter_gzip_blocks(blocks):
+    compressor = zlib.compressobj(UPLOAD_GZIP_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+    for block in blocks:
+        if compressed := compressor.compress(block):
+            yield compressed
+    yield compressor.flush()
+
+
+def get_upload_body(f, gzip_body):
+    """
+    Returns the request body of a version file opened with open_version_file(filepath, gzip_body):
+    the file itself when it is sent as it is stored, with a Content-Length, otherwise its blocks,
+    compressed with gzip_body, sent with a chunked transfer encoding.
+    """
+    if f.stored and f.gzip == gzip_body:
+        return f
+    return iter_gzip_blocks(iter_blocks(f)) if gzip_body else iter_blocks(f)
+
+
+def get_upload_headers(content_type, gzip_body):
+    headers = {'Content-Type': content_type}
+    if gzip_body:
+        headers['Content-Encoding'] = 'gzip'
+    return headers
+
+
+def iter_trig_chunks(f, chunk_triples, offset=0, prefixes=(), graph=None):
+    """
+    Splits a TriG file into chunks of about chunk_triples triples, cut at the end of a statement.
+
+    Each chunk starts with the prefixes declared before it. A graph block cut by the end of a
+    chunk is closed there, and opened again with the same graph name at the start of the next one.
+    Yields (chunk, number of triples of the chunk, offset of the end of the chunk in the file,
+    prefixes, graph name of the open block or None), the last three allowing to resume the split.
+
+    The blank node labels are scoped to a request: a file holding labelled blank nodes must not be
+    split, which import_version checks with has_blank_node_labels.
+    """
+    prefixes = list(prefixes)
+    f.seek(offset)
+
+    def start_chunk():
+        return prefixes + ([graph + b" {\n"] if graph is not None else [])
+
+    body = start_chunk()
+    triples = 0
+    has_statements = False
+    # depth of the [ ] and ( ) of the current statement
+    nesting = 0
+    open_statement = False
+    pending = b""
+    for line in f:
+        offset += len(line)
+        line = pending + line
+        pending = b""
+        if graph is None and not open_statement and TRIG_DIRECTIVE_PATTERN.match(line):
+            body.append(line)
+            prefixes.append(line)
+            continue
+        punctuation = TRIG_TERM_PATTERN.sub(b"", line)
+        if punctuation == b".":
+            # most lines hold one whole statement
+            body.append(line)
+            triples += 1
+            has_statements = True
+            open_statement = False
+        elif b'"' in punctuation or b"'" in punctuation:
+            # the line ends in a multi-line string
+            pending = line
+            continue
+        else:
+            body.append(line)
+            if b"}" in punctuation:
+                graph = None
+                block_start = line[line.rindex(b"}") + 1:]
+            else:
+                block_start = line
+            if b"{" in punctuation and b"{" in block_start:
+                graph = block_start[:block_start.index(b"{")].strip()
+
+            nesting += punctuation.count(b"[") + punctuation.count(b"(") - punctuation.count(b"]") - punctuation.count(b")")
+            triples += punctuation.count(b".") + punctuation.count(b";") + punctuation.count(b",")
+            if punctuation:
+                has_statements = True
+                open_statement = punctuation[-1:] not in b".{}"
+
+        if triples >= chunk_triples and nesting == 0 and not open_statement:
+            if graph is not None:
+                body.append(b"}\n")
+            yield b"".join(body), triples, offset, tuple(prefixes), graph
+            body = start_chunk()
+            triples = 0
+            has_statements = False
+
+    if has_statements or pending:
+        body.append(pending)
+        yield b"".join(body), triples, offset, tuple(prefixes), graph
+
+
+def create_session():
+    """
+    Returns a session keeping its connection to the backend alive between the versions.
+    """
+    session = requests.Session()
+    # the versions are imported one after the other, to a single host
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def post_blazegraph_trig(session, hostname, data, timeout, gzip_body=False):
+    response = session.post(
+        f'http://{hostname}-service:9999/blazegraph/sparql',
+        headers=get_upload_headers('application/x-trig', gzip_body),
+        data=data,
+        timeout=timeout
+    )
+    response.raise_for_status()
+
+
+def post_jena_trig(session, hostname, data, timeout, gzip_body=False):
+    response = session.post(
+        f'http://{hostname}-service:3030/mydataset/data',
+        headers=get_upload_headers('application/trig', gzip_body),
+        data=data,
+        auth=("admin", os.getenv("JENA_ADMIN_PASSWORD", "")),
+        timeout=timeout
+    )
+    response.raise_for_status()
+
+
+def import_blazegraph_version(session, hostname, filepath, timeout, gzip_body=False):
+    with open_version_file(filepath, gzip_body) as f:
+        post_blazegraph_trig(session, hostname, get_upload_body(f, gzip_body), timeout, gzip_body)
+    return f.bytes, f.triples
+
+
+def import_jena_version(session, hostname, filepath, timeout, gzip_body=False):
+    with open_version_file(filepath, gzip_body) as f:
+        post_jena_trig(session, hostname, get_upload_body(f, gzip_body), timeout, gzip_body)
+    return f.bytes, f.triples
+
+
+def iter_multipart_blocks(f, filename, boundary, gzip_body):
+    """
+    Multipart form body holding the version file read from f, in blocks, compressed with gzip_body.
+    A file read as gzip is sent as it is stored, between the compressed part delimiters:
+    concatenated gzip members are decompressed as one stream.
+    """
+    head = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n').encode()
+    tail = f'\r\n--{boundary}--\r\n'.encode()
+    if f.gzip:
+        yield gzip.compress(head, UPLOAD_GZIP_LEVEL)
+        yield from iter_blocks(f)
+        yield gzip.compress(tail, UPLOAD_GZIP_LEVEL)
+        return
+    blocks = chain([head], iter_blocks(f), [tail])
+    yield from iter_gzip_blocks(blocks) if gzip_body else blocks
+
+
+def import_quader_version(session, hostname, filepath, timeout, gzip_body=False):
+    from requests_toolbelt import MultipartEncoder
+
+    # quads-loader reads the format of the version from the file name
+    filename = os.path.basename(filepath).removesuffix(".gz")
+    with open_version_file(filepath, gzip_body) as f:
+        if f.stored and not gzip_body:
+            # unlike files=..., the encoder reads the file part while it is sent
+            body = MultipartEncoder(fields={"file": (filename, f)})
+            content_type = body.content_type
+        else:
+            boundary = uuid.uuid4().hex
+            body = iter_multipart_blocks(f, filename, boundary, gzip_body)
+            content_type = f'multipart/form-data; boundary={boundary}'
+        response = session.post(
+            f'http://{hostname}-service:8080/import/version',
+            headers=get_upload_headers(content_type, gzip_body),
+            data=body,
+            timeout=timeout
+        )
+    response.raise_for_status()
+    return f.bytes, f.triples
+
+
+def finish_quader_import(session, hostname, mode, timeout):
+    if mode == "flat":
+        print("[quads-loader] Flattening the dataset")
+        response = session.get(f'http://{hostname}-service:8080/import/flatten', timeout=timeout)
+        response.raise_for_status()
+
+
+# per backend: dataset directory, log labels, import of one version (returning its number of
+# uncompressed bytes and triples), post of a TriG chunk
+# (None when a request is a whole version, like for quads-loader) and optional last step
+BACKENDS = {
+    "blazegraph": {
+        "directory": "theoretical",
+        "log_label": "Triple Store",
+        "measure_label": "BG",
+        "import_version": import_blazegraph_version,
+        "post_trig": post_blazegraph_trig,
+        "finish_import": None,
+    },
+    "jena": {
+        "directory": "theoretical",
+        "log_label": "Triple Store",
+        "measure_label": "Jena",
+        "import_version": import_jena_version,
+        "post_trig": post_jena_trig,
+        "finish_import": None,
+    },
+    "quader": {
+        "directory": "relational",
+        "log_label": "quads-loader",
+        "measure_label": "STS",
+        "import_version": import_quader_version,
+        "post_trig": None,
+        "finish_import": finish_quader_import,
+    },
+}
+
+
+def read_checkpoint(checkpoint_path):
+    if not os.path.exists(checkpoint_path):
+        return {}
+    with open(checkpoint_path) as f:
+        return json.load(f)
+
+
+def write_checkpoint(checkpoint_path, checkpoint):
+    """
+    Writes the checkpoint to a temporary file renamed over the previous one, so that a pod
+    killed while writing it leaves the previous checkpoint.
+    """
+    os.makedirs(os.path.dirname(checkpoint_path), exist_ok=True)
+    tmp_path = checkpoint_path + ".part"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, checkpoint_path)
+
+
+def import_version_in_chunks(session, hostname, filepath, post_trig, chunk_triples, checkpoint, checkpoint_path,
+                            timeout, gzip_body=False):
+    """
+    Imports a TriG version in chunks of about chunk_triples triples, in file order, and returns
+    the number of (uncompressed) bytes and triples imported. With gzip_body, each chunk is sent compressed.
+
+    The end of each imported chunk is saved in the checkpoint, so that a retry of the step
+    resumes the version after the last imported chunk.
+    """
+    file = os.path.basename(filepath)
+    file_size = os.path.getsize(filepath)
+    progress = checkpoint.get("chunk", {})
+    if (progress.get("file"), progress.get("file_size"), progress.get("chunk_triples")) != (file, file_size, chunk_triples):
+        progress = {"file": file, "file_size": file_size, "chunk_triples": chunk_triples,
+                    "chunks": 0, "offset": 0, "prefixes": [], "graph": None}
+    else:
+        print(f"Resuming {file} after chunk {progress['chunks']} (uncompressed byte {progress['offset']})")
+    start_offset = progress["offset"]
+    imported_triples = 0
+
+    def split_next_chunk():
+        split = next(chunks, None)
+        if split is not None and gzip_body:
+            return (gzip.compress(split[0], UPLOAD_GZIP_LEVEL),) + split[1:]
+        return split
+
+    with open_trig_file(filepath) as f, ThreadPoolExecutor(max_workers=1) as executor:
+        chunks = iter_trig_chunks(f, chunk_triples, progress["offset"],
+                                  [prefix.encode() for prefix in progress["prefixes"]],
+                                  progress["graph"].encode() if progress["graph"] is not None else None)
+        # the next chunk is split (and compressed) while the current one is sent
+        next_chunk = executor.submit(split_next_chunk)
+        while (split := next_chunk.result()) is not None:
+            next_chunk = executor.submit(split_next_chunk)
+            chunk, triples, offset, prefixes, graph = split
+            start = int(time.time() * 1000)
+            post_trig(session, hostname, chunk, timeout, gzip_body)
+            end = int(time.time() * 1000)
+            imported_triples += triples
+            progress.update(chunks=progress["chunks"] + 1, offset=offset,
+                            prefixes=[prefix.decode() for prefix in prefixes],
+                            graph=graph.decode() if graph is not None else None)
+            checkpoint["chunk"] = progress
+            write_checkpoint(checkpoint_path, checkpoint)
+            print(f"{datetime.now().isoformat()} - Chunk {progress['chunks']} of {file}: {len(chunk)} bytes sent, "
+                  f"{offset} uncompressed bytes imported, {end-start}ms")
+
+    return progress["offset"] - start_offset, imported_triples
+
+
+def print_import_record(hostname, file, size, triples, duration, version, product, step):
+    """
+    Prints the import measure of a version as a benchmark record, like the querier and space ones.
+    The size is the one of the uncompressed TriG, whether the version is stored or sent compressed.
+    """
+    now = round(time.time())
+    print(f'{{"component":"{hostname}","file":"{file}","bytes":"{size}","triples":"{triples}","duration":"{duration}",'
+          f'"version":"{version}","product":"{product}","step":"{step}","time":"{now}"}}')
+
+
+def import_version(adapter, session, hostname, filepath, timeout, chunk_triples, checkpoint, checkpoint_path, gzip_body):
+    if chunk_triples and has_blank_node_labels(filepath):
+        print(f"{os.path.basename(filepath)} holds labelled blank nodes, imported in a single request")
+        chunk_triples = 0
+    if chunk_triples:
+        return import_version_in_chunks(session, hostname, filepath, adapter["post_trig"], chunk_triples,
+                                        checkpoint, checkpoint_path, timeout, gzip_body)
+    return adapter["import_version"](session, hostname, filepath, timeout, gzip_body)
+
+
+def import_dataset(backend, data_dir, number_of_versions, hostname, mode, timeout=DEFAULT_TIMEOUT,
+                   chunk_triples=0, checkpoint_path=None, product="", step="", gzip_body=False):
+    """
+    Imports the versions of the dataset into the backend, in version order.
+
+    The import of each version is printed as a benchmark record, with the product and step
+    of the configuration.
+
+    The versions imported, with their size, are saved in checkpoint_path: a retry of the step
+    skips them, instead of importing them again (which duplicates them in quads-loader).
+    With chunk_triples, the TriG versions are sent in chunks of about chunk_triples triples,
+    the progress within a version being saved in the checkpoint too.
+
+    With gzip_body, the request bodies are sent compressed (Content-Encoding: gzip). A backend
+    refusing the first compressed request is sent uncompressed bodies from then on.
+    """
+    adapter = BACKENDS[backend]
+    directory = os.path.join(data_dir, adapter["directory"])
+    print(f"Directory: {directory}, Number of versions: {number_of_versions}, Hostname: {hostname}")
+    if chunk_triples and not adapter["post_trig"]:
+        print(f"Chunked import is not available for {backend}, each request being imported as a new version")
+        chunk_triples = 0
+    if gzip_body:
+        print("Request bodies compressed with gzip")
+    # whether the backend accepted a compressed request body, after which an error is not a refusal of the encoding
+    gzip_accepted = False
+
+    checkpoint = read_checkpoint(checkpoint_path)
+    imported_versions = checkpoint.setdefault("versions", {})
+    with create_session() as session:
+        for filepath in list_version_files(directory, number_of_versions):
+            file = os.path.basename(filepath)
+            file_size = os.path.getsize(filepath)
+            if imported_versions.get(file) == file_size:
+                print(f"\n{datetime.now().isoformat()} - [{adapter['log_label']}] Version {file} already imported, skipped")
+                continue
+            print(f"\n{datetime.now().isoformat()} - [{adapter['log_label']}] Version {file}")
+            start = int(time.time() * 1000)
+            try:
+                try:
+                    size, triples = import_version(adapter, session, hostname, filepath, timeout,
+                                                   chunk_triples, checkpoint, checkpoint_path, gzip_body)
+                except requests.exceptions.HTTPError as e:
+                    if not gzip_body or gzip_accepted or e.response.status_code not in GZIP_REFUSED_STATUSES:
+                        raise
+                    print(f"{backend} refused the gzip request body ({e}), sending uncompressed request bodies")
+                    gzip_body = False
+                    size, triples = import_version(adapter, session, hostname, filepath, timeout,
+                                                   chunk_triples, checkpoint, checkpoint_path, gzip_body)
+                gzip_accepted = gzip_body
+            except requests.exceptions.RequestException as e:
+                print(f"Failed to import {filepath}: {e}")
+                sys.exit(1)
+            end = int(time.time() * 1000)
+            print(f"\n{datetime.now().isoformat()} - [Measure] (Import {adapter['measure_label']} {file}): {end-start}ms;")
+            print_import_record(hostname, file, size, triples, end - start, get_version(file), product, step)
+            checkpoint.pop("chunk", None)
+            imported_versions[file] = file_size
+            write_checkpoint(checkpoint_path, checkpoint)
+
+        if adapter["finish_import"] and not checkpoint.get("finished"):
+            adapter["finish_import"](session, hostname, mode, timeout)
+            checkpoint["finished"] = True
+            write_checkpoint(checkpoint_path, checkpoint)
+
+
+if __name__ == "__main__":
+    backend = os.getenv("BACKEND")
+    hostname = os.getenv("BACKEND_NAME")
+    number_of_versions = int(os.getenv("NUMBER_OF_VERSIONS", 0))
+    mode = os.getenv("MODE", "")
+    product = os.getenv("PRODUCT", "")
+    step = os.getenv("STEP", "")
+    data_dir = os.getenv("DATA_DIR", "/app/data/data")
+    timeout = int(os.getenv("REQUEST_TIMEOUT", DEFAULT_TIMEOUT))
+    chunk_triples = int(os.getenv("IMPORT_CHUNK_TRIPLES", 0))
+    checkpoint_dir = os.getenv("CHECKPOINT_DIR", "/app/data/import-checkpoints")
+    upload_compression = os.getenv("UPLOAD_COMPRESSION", "none")
+
+    if backend not in BACKENDS or not hostname:
+        print(f"Please set the environment variables BACKEND ({', '.join(BACKENDS)}) and BACKEND_NAME")
+        exit(1)
+
+    import_dataset(backend, data_dir, number_of_versions, hostname, mode, timeout,
+                   chunk_triples, os.path.join(checkpoint_dir, f"{hostname}.json"), product, step,
+                   upload_compression == "gzip")
@@ -25,6 +25,38 @@ def prepare_dataset_config(ds_config: dict):
         f_out.write(str(ds_config.get('step')))
 
 
+@script(inputs=[Parameter(name="dataset-pvc-name")],
+        volumes=[ExistingVolume(
+            name='{{inputs.parameters.dataset-pvc-name}}',
+            claim_name='{{inputs.parameters.dataset-pvc-name}}',
+            mount_path="/app/data",
+        )])
+def compress_dataset():
+    """
+    Replaces the transformed versions (.ttl.trig) by their gzip compression (.ttl.trig.gz),
+    which the dataset importer reads as they are.
+    """
+    import glob
+    import gzip
+    import os
+    import shutil
+    from concurrent.futures import ThreadPoolExecutor
+
+    def compress_version(filepath):
+        tmp_path = filepath + ".gz.part"
+        with open(filepath, 'rb') as f_in, gzip.open(tmp_path, 'wb', compresslevel=6) as f_out:
+            shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+        os.replace(tmp_path, filepath + ".gz")
+        os.remove(filepath)
+        return filepath
+
+    filepaths = glob.glob("/app/data/data/relational/*.ttl.trig") + glob.glob("/app/data/data/theoretical/*.ttl.trig")
+    # zlib releases the GIL while it compresses
+    with ThreadPoolExecutor(max_workers=len(os.sched_getaffinity(0))) as executor:
+        for filepath in executor.map(compress_version, filepaths):
+            print(f"Compressed {filepath}")
+
+
 if __name__ == "__main__":
 
     global_config.host = f'https://{os.environ.get("ARGO_SERVER")}'
@@ -133,4 +165,11 @@ if __name__ == "__main__":
 
             task_prepare_dataset_config >> task_dataset_generator >> [task_relational_transformer, task_theoretical_transformer]
 
+            if constants.dataset_compression == "gzip":
+                task_compress_dataset = compress_dataset(
+                    arguments={
+                        "dataset-pvc-name": dag.get_parameter("dataset-pvc-name")
+                    })
+                [task_relational_transformer, task_theoretical_transformer] >> task_compress_dataset
+
         wt.create()
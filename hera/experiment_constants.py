@@ -14,12 +14,19 @@ constants = types.SimpleNamespace(
     python_requests = "xr09/python-requests@sha256:61a5289993bbbfbe4ab3299428855b83c490aeb277895c2bb6f16ab5f0f74abd",
     quads_querier = "harbor.pagoda.liris.cnrs.fr/ud-evolution/quads-querier:v1.2.0",
     new_quads_querier = "harbor.pagoda.liris.cnrs.fr/ud-evolution/quads-querier:v1.4.0",
-    get_workflow_logs = "harbor.pagoda.liris.cnrs.fr/ud-evolution/get-workflow-logs:v1.1.0",
+    get_workflow_logs = "harbor.pagoda.liris.cnrs.fr/ud-evolution/get-workflow-logs:v1.3.0",
+    merge_compression = os.environ.get('MERGE_COMPRESSION', "none"),
     converg_space = "harbor.pagoda.liris.cnrs.fr/ud-evolution/converg-space:v1.0.0",
-    log_to_plots = "harbor.pagoda.liris.cnrs.fr/ud-evolution/log-to-plots:v1.3.0",
-    space_logs_to_plots = "harbor.pagoda.liris.cnrs.fr/ud-evolution/space-logs-to-plots:v1.3.0",
+    log_to_plots = "harbor.pagoda.liris.cnrs.fr/ud-evolution/log-to-plots:v1.6.0",
+    space_logs_to_plots = "harbor.pagoda.liris.cnrs.fr/ud-evolution/space-logs-to-plots:v1.6.0",
+    import_logs_to_plots = "harbor.pagoda.liris.cnrs.fr/ud-evolution/import-logs-to-plots:v1.3.0",
+    dataset_importer = "harbor.pagoda.liris.cnrs.fr/ud-evolution/dataset-importer:v1.3.0",
     repeat = 200,
+    import_chunk_triples = os.environ.get('IMPORT_CHUNK_TRIPLES', "0"),
+    upload_compression = os.environ.get('UPLOAD_COMPRESSION', "none"),
+    dataset_compression = os.environ.get('DATASET_COMPRESSION', "none"),
     cpu_limit = 2,
+    plot_workers = os.environ.get('PLOT_WORKERS', "4"),
     memory_request = "4",
     memory_limit = "8",
     timeout = "0",
@@ -26,6 +26,58 @@ def create_service_manifest(metadata_name: str, cleanup: str, selector_name:str,
             f"   - port: {port}\n"
             f"     targetPort: {target_port}\n")
 
+def create_dataset_importer(backend: str, extra_env: list = (), extra_inputs: list = ()):
+    """
+    Creates the dataset-importer container template of a backend, in the current workflow context.
+
+    The template imports the versions of the existing volume into the server of the hostname input parameter.
+
+    Args:
+        backend (str): The BACKEND of the dataset importer (blazegraph, jena or quader).
+        extra_env (list): The environment variables specific to the backend.
+        extra_inputs (list): The input parameters specific to the backend.
+    """
+    from hera.workflows import Container, Env, ExistingVolume, Resources
+    from hera.workflows.models import ImagePullPolicy, Parameter
+    from experiment_constants import constants
+
+    return Container(
+        name="dataset-importer",
+        image=constants.dataset_importer,
+        image_pull_policy=ImagePullPolicy.if_not_present,
+        inputs=[
+            Parameter(name="existing_volume_name",
+                      description="The name of the existing volume containing the data to import"),
+            Parameter(name="number_of_versions",
+                      description="The number of versions to import"),
+            Parameter(name="hostname",
+                      description="The hostname of the server to import the data into"),
+            Parameter(name="product",
+                      description="The number of products of the configuration"),
+            Parameter(name="step",
+                      description="The step of the configuration"),
+            *extra_inputs,
+        ],
+        volumes=[
+            ExistingVolume(
+                name="{{inputs.parameters.existing_volume_name}}",
+                claim_name="{{inputs.parameters.existing_volume_name}}",
+                mount_path="/app/data",
+            )
+        ],
+        resources=Resources(memory_limit=f"{constants.memory_limit}Gi"),
+        env=[
+            Env(name="BACKEND", value=backend),
+            Env(name="BACKEND_NAME", value="{{inputs.parameters.hostname}}"),
+            Env(name="NUMBER_OF_VERSIONS", value="{{inputs.parameters.number_of_versions}}"),
+            Env(name="PRODUCT", value="{{inputs.parameters.product}}"),
+            Env(name="STEP", value="{{inputs.parameters.step}}"),
+            Env(name="IMPORT_CHUNK_TRIPLES", value=constants.import_chunk_triples),
+            Env(name="UPLOAD_COMPRESSION", value=constants.upload_compression),
+            *extra_env,
+        ]
+    )
+
 def create_cleanup_config(version: str, product: str, step: str) -> str:
     return f"v-{version}-p-{product}-s-{step}"
 
@@ -1,28 +1,96 @@
 import boto3
 import os
+import re
 
-def downloadDirectoryFromS3(bucketName, remoteDirectoryName, localDirName, endpoint, aws_access_key_id, aws_secret_access_key):
-    s3_resource = boto3.resource("s3", endpoint_url=endpoint, aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key)
-    bucket = s3_resource.Bucket(bucketName)
+# size of the blocks copied from the downloaded logs to the merged log
+MERGE_BUFFER_SIZE = 1024 * 1024
+
+# a benchmark record: {"component":"...", ...}
+RECORD_PATTERN = re.compile(rb'\{"component":"[^"]+",.*\}')
+
+MERGED_LOGS_FILE = "merged_logs.log"
+
+def get_local_log_path(localDirName, complete_remote_dir, key):
+    """
+    Returns the local path of a querier, space or import log object, None for the other objects.
+    """
+    # remove the first part of the key (the prefix)
+    step = key[len(complete_remote_dir):]
+    formated_step = step.split("/")[0]
+    # if step contains "querier", then keep it
+    if "querier" in formated_step:
+        return os.path.join(localDirName, complete_remote_dir, "querier", formated_step + ".log")
+    if "space" in formated_step:
+        return os.path.join(localDirName, complete_remote_dir, "space", formated_step + ".log")
+    if "import" in formated_step:
+        return os.path.join(localDirName, complete_remote_dir, "import", formated_step + ".log")
+    return None
+
+
+def is_already_downloaded(local_path, etag, size):
+    """
+    Checks whether the local file matches the S3 object: same size and, when the ETag is the MD5
+    of the content (single part upload), same MD5.
+    """
+    import hashlib
+
+    if not os.path.exists(local_path) or os.path.getsize(local_path) != size:
+        return False
+    etag = etag.strip('"')
+    if "-" in etag:
+        # multipart ETags are not the MD5 of the content, rely on the size only
+        return True
+    with open(local_path, "rb") as f:
+        return hashlib.file_digest(f, "md5").hexdigest() == etag
+
+
+def download_object(s3_client, bucketName, key, local_path):
+    """
+    Downloads one object to a temporary file renamed once complete.
+    The failed requests are retried by the client (see downloadDirectoryFromS3).
+    """
+    tmp_path = local_path + ".part"
+    s3_client.download_file(bucketName, key, tmp_path)
+    os.replace(tmp_path, local_path)
+
+
+def downloadDirectoryFromS3(bucketName, remoteDirectoryName, localDirName, endpoint, aws_access_key_id, aws_secret_access_key, workers=16, retries=5):
+    """
+    Downloads the querier, space and import logs of a workflow with a pool of `workers` threads.
+    The logs already present locally with the same size and ETag are skipped, so an interrupted download can be resumed.
+    Each request is retried up to `retries` times by botocore, with its exponential backoff.
+    """
+    from botocore.config import Config
+    from concurrent.futures import ThreadPoolExecutor
+
+    s3_client = boto3.client("s3", endpoint_url=endpoint, aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key,
+                             config=Config(max_pool_connections=workers, retries={"total_max_attempts": retries + 1, "mode": "standard"}))
 
     complete_remote_dir = remoteDirectoryName + "/"
 
-    for obj in bucket.objects.filter(Prefix=complete_remote_dir):
-        # remove the first part of the key (the prefix)
-        step = obj.key[len(complete_remote_dir):]
-        formated_step = step.split("/")[0]
-        # if step contains "querier", then keep it
-        if "querier" in formated_step:
-            querier_dir = os.path.join(localDirName, complete_remote_dir, "querier")
-            if not os.path.exists(querier_dir):
-                os.makedirs(querier_dir)
-            bucket.download_file(obj.key, os.path.join(querier_dir, formated_step + ".log"))
-
-        if "space" in formated_step:
-            space_dir = os.path.join(localDirName, complete_remote_dir, "space")
-            if not os.path.exists(space_dir):
-                os.makedirs(space_dir)
-            bucket.download_file(obj.key, os.path.join(space_dir, formated_step + ".log"))
+    # the objects mapped to the same local file overwrite each other, the last listed one is kept
+    objects = {}
+    for page in s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucketName, Prefix=complete_remote_dir):
+        for obj in page.get("Contents", []):
+            local_path = get_local_log_path(localDirName, complete_remote_dir, obj["Key"])
+            if local_path is not None:
+                objects[local_path] = obj
+
+    to_download = []
+    for local_path, obj in objects.items():
+        if is_already_downloaded(local_path, obj["ETag"], obj["Size"]):
+            continue
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        to_download.append((obj["Key"], local_path))
+
+    print(f"Found {len(objects)} logs files, {len(objects) - len(to_download)} already downloaded")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(download_object, s3_client, bucketName, key, local_path) for key, local_path in to_download]
+        for future in futures:
+            future.result()
+
+    print(f"Downloaded {len(to_download)} logs files with {workers} workers")
         
 
 def uploadFileToS3(bucketName, workflow_id, localFileName):
@@ -30,28 +98,88 @@ def uploadFileToS3(bucketName, workflow_id, localFileName):
     bucket = s3_resource.Bucket(bucketName) 
     bucket.upload_file(localFileName, workflow_id + localFileName)
 
-def merge_all_logs_files(workflow_id, datadir):
-    merge_all_thematic_logs_files(workflow_id, datadir, "querier")
-    merge_all_thematic_logs_files(workflow_id, datadir, "space")
+def merge_all_logs_files(workflow_id, datadir, compression="none", records_only=False):
+    merge_all_thematic_logs_files(workflow_id, datadir, "querier", compression, records_only)
+    merge_all_thematic_logs_files(workflow_id, datadir, "space", compression, records_only)
+    merge_all_thematic_logs_files(workflow_id, datadir, "import", compression, records_only)
 
-def merge_all_thematic_logs_files(workflow_id, datadir, thematic):
-    # merge all logs files
+def open_merged_output(file_path, compression):
+    """
+    Opens the merged log for binary writing, compressed with gzip or zstd if requested (the name is unchanged).
+    """
+    if compression == "gzip":
+        import gzip
+        return gzip.open(file_path, "wb", compresslevel=6)
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=10).stream_writer(open(file_path, "wb"), closefd=True)
+    if compression == "none":
+        return open(file_path, "wb")
+    raise ValueError(f"Unknown compression: {compression}")
+
+def write_log_lines(outfile, block, records_only, counters):
+    """
+    Writes a block of complete lines to the merged log.
+    Only the lines that are not valid UTF-8 are dropped and, with records_only, the lines without a benchmark record.
+    """
+    if not records_only:
+        try:
+            block.decode("utf-8")
+            outfile.write(block)
+            return
+        except UnicodeDecodeError:
+            pass
+
+    for line in block.splitlines(keepends=True):
+        if records_only and not RECORD_PATTERN.search(line):
+            counters["filtered"] += 1
+            continue
+        try:
+            line.decode("utf-8")
+        except UnicodeDecodeError:
+            counters["invalid"] += 1
+            continue
+        outfile.write(line)
+
+def merge_all_thematic_logs_files(workflow_id, datadir, thematic, compression="none", records_only=False):
+    """
+    Merges the downloaded logs of a thematic into a single log, copying them in blocks of MERGE_BUFFER_SIZE bytes
+    so that the memory used does not depend on the size of the logs.
+    """
+    thematic_dir = datadir + workflow_id + "/" + thematic
+    # the name does not depend on the compression, which the readers detect from the content,
+    # so that the workflow artifacts keep the same path
+    merged_file_path = thematic_dir + "/" + MERGED_LOGS_FILE
+
+    # merge all logs files, except the merged logs of a previous run
     log_files = []
-    for root, dirs, files in os.walk(datadir + workflow_id + "/" + thematic):
+    for root, dirs, files in os.walk(thematic_dir):
         for file in files:
-            if file.endswith(".log"):
+            if file.endswith(".log") and not file.startswith(MERGED_LOGS_FILE):
                 log_files.append(os.path.join(root, file))
+    # a stable order makes the merged log (and the caches keyed by its content) reproducible
+    log_files.sort()
 
-    with open(datadir + workflow_id + "/" + thematic + "/merged_logs.log", "w") as outfile:
+    counters = {"invalid": 0, "filtered": 0}
+    # a thematic without logs still gets an (empty) merged log
+    os.makedirs(thematic_dir, exist_ok=True)
+    tmp_file_path = merged_file_path + ".tmp"
+    with open_merged_output(tmp_file_path, compression) as outfile:
         for log_file in log_files:
             with open(log_file, "rb") as infile:
-                content = infile.read()
-                try:
-                    outfile.write(content.decode("utf-8"))
-                    outfile.write("\n")
-                except UnicodeDecodeError:
-                    print("Error decoding log file:", log_file)
-    print(f"Merged {len(log_files)} logs files into {datadir + workflow_id + "/" + thematic}/merged_logs.log")
+                remainder = b""
+                while block := infile.read(MERGE_BUFFER_SIZE):
+                    block = remainder + block
+                    # only complete lines are written, the last partial line is kept for the next block
+                    cut = block.rfind(b"\n") + 1
+                    block, remainder = block[:cut], block[cut:]
+                    write_log_lines(outfile, block, records_only, counters)
+                if remainder:
+                    write_log_lines(outfile, remainder + b"\n", records_only, counters)
+    os.replace(tmp_file_path, merged_file_path)
+
+    print(f"Merged {len(log_files)} logs files into {merged_file_path} "
+          f"({counters['invalid']} invalid UTF-8 lines dropped, {counters['filtered']} lines without records filtered)")
 
 if __name__ == "__main__":
     endpoint   = "https://s3.pagoda.liris.cnrs.fr"
@@ -62,6 +190,10 @@ if __name__ == "__main__":
     aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
     aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
     workflow_id = os.getenv("WORKFLOW_ID")
+    download_workers = int(os.getenv("DOWNLOAD_WORKERS", 16))
+    download_retries = int(os.getenv("DOWNLOAD_RETRIES", 5))
+    merge_compression = os.getenv("MERGE_COMPRESSION", "none")
+    merge_records_only = os.getenv("MERGE_RECORDS_ONLY", "false").lower() == "true"
 
     # check if the environment variables are set
     if not all([aws_access_key_id, aws_secret_access_key, workflow_id]):
@@ -71,6 +203,6 @@ if __name__ == "__main__":
     print("Downloading logs from S3...")
     print(f"Workflow ID: {workflow_id}")
 
-    downloadDirectoryFromS3(bucketname_path, workflow_id, datadir, endpoint_path, aws_access_key_id, aws_secret_access_key)
+    downloadDirectoryFromS3(bucketname_path, workflow_id, datadir, endpoint_path, aws_access_key_id, aws_secret_access_key, download_workers, download_retries)
 
-    merge_all_logs_files(workflow_id, datadir)
\ No newline at end of file
+    merge_all_logs_files(workflow_id, datadir, merge_compression, merge_records_only)
\ No newline at end of file
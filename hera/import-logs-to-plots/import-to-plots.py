@@ -0,0 +1,127 @@
+import io
+import os
+import re
+
+from benchmark_logs import open_log_file
+
+
+LOG_PATTERN = re.compile(r'\{"component":"(?P<component>[^"]+)","file":"(?P<file>[^"]+)","bytes":"(?P<bytes>[^"]+)","triples":"(?P<triples>[^"]+)","duration":"(?P<duration>[^"]+)","version":"(?P<version>[^"]+)","product":"(?P<product>[^"]*)","step":"(?P<step>[^"]*)","time":"(?P<time>[^"]+)"\}')
+
+COLUMNS = ["VERSION", "PRODUCT", "STEP", "COMPONENT", "FILE", "BYTES", "TRIPLES", "DURATION", "TIME", "COMPONENT_NAME"]
+
+
+def get_component_name(component: str):
+    """
+    Extracts the backend name from the name of the server the dataset was imported into
+    (<workflow id>-<backend>-<version>-<product>-<step>[-<mode>]): the non numeric parts after
+    the workflow id, so that the quads-loader modes are kept apart.
+    The names without configuration (shell imports) are kept as is.
+    """
+    parts = component.split('-')
+    if not any(part.isdigit() for part in parts):
+        return component
+    return '-'.join(part for part in parts[3:] if not part.isdigit())
+
+
+def read_log_frame(log_file_path: str):
+    """
+    Parses the import records of the log. A version imported several times (retried step) keeps its last record.
+    """
+    import pandas as pd
+
+    extracted_data = []
+    with io.TextIOWrapper(open_log_file(log_file_path), encoding='utf-8') as file:
+        for line in file:
+            match = LOG_PATTERN.search(line)
+            if match:
+                component = match.group('component')
+                extracted_data.append({
+                    "VERSION": int(match.group('version')),
+                    "PRODUCT": int(match.group('product') or 0),
+                    "STEP": int(match.group('step') or 0),
+                    "COMPONENT": component,
+                    "FILE": match.group('file'),
+                    "BYTES": int(match.group('bytes')),
+                    "TRIPLES": int(match.group('triples')),
+                    "DURATION": int(match.group('duration')),
+                    "TIME": int(match.group('time')),
+                    "COMPONENT_NAME": get_component_name(component),
+                })
+
+    df = pd.DataFrame(extracted_data, columns=COLUMNS)
+    return df.sort_values(by="TIME").drop_duplicates(subset=["COMPONENT", "VERSION"], keep="last")
+
+
+def compute_throughput(df):
+    """
+    Averages the import throughput of each version over the configurations of a backend and step.
+    The "triples" of the records are approximate: the lines ending a statement with . ; or , without
+    the @prefix and @base lines, so a line holding several statements is counted once.
+    """
+    # a version imported in less than a millisecond is counted as 1 ms
+    seconds = df["DURATION"].clip(lower=1) / 1000
+    df = df.assign(MB_PER_S=df["BYTES"] / (1024 * 1024) / seconds, TRIPLES_PER_S=df["TRIPLES"] / seconds)
+    return df.groupby(["STEP", "COMPONENT_NAME", "VERSION"], as_index=False)[["MB_PER_S", "TRIPLES_PER_S", "DURATION"]].mean()
+
+
+def get_component_color(component: str):
+    if component.startswith('blazegraph'):
+        return 'blue'
+    if component.startswith('jena'):
+        return 'purple'
+    if component.endswith('flat'):
+        return 'orange'
+    return 'green'
+
+
+def create_import_plots(throughput, metric: str, label: str):
+    import matplotlib.pyplot as plt
+
+    output_dir = 'plots/import'
+    os.makedirs(output_dir, exist_ok=True)
+
+    for step, step_data in throughput.groupby("STEP"):
+        fig, ax = plt.subplots(figsize=(12, 6))
+        for component, plot_data in step_data.groupby("COMPONENT_NAME"):
+            plot_data = plot_data.sort_values(by='VERSION')
+            ax.plot(plot_data['VERSION'], plot_data[metric],
+                    marker='o', linestyle='-', label=component, color=get_component_color(component))
+
+        ax.set_title(f"Import {label} per Version - Step: {step}", fontsize=9)
+        ax.set_xlabel("Version")
+        ax.set_ylabel(label)
+        ax.grid(True)
+        ax.legend(title='Component', loc='upper left')
+        ax.xaxis.get_major_locator().set_params(integer=True)
+
+        filepath = f"{output_dir}/{metric.lower().replace('_', '-')}-{step}.png"
+        plt.savefig(filepath, dpi=300)
+        plt.close(fig)
+        print(f"Plot saved to {filepath}")
+
+
+def create_import_csv(throughput):
+    output_dir = 'plots/import/csv'
+    os.makedirs(output_dir, exist_ok=True)
+
+    # for each STEP, VERSION, display the throughput of each component in a separate column
+    df_pivot = throughput.pivot_table(index=['STEP', 'VERSION'], columns='COMPONENT_NAME', values='MB_PER_S').reset_index()
+    df_pivot = df_pivot.sort_values(by=['STEP', 'VERSION']).round(2)
+    df_pivot.to_csv(f"{output_dir}/import.csv", index=False)
+
+
+if __name__ == "__main__":
+    log_file_path = os.getenv("LOG_FILE_PATH", "merged_logs.log")
+
+    print(f"Log file path: {log_file_path}")
+
+    log_data = read_log_frame(log_file_path)
+    print(f"Found {len(log_data)} import records")
+
+    if log_data.empty:
+        print("No import records found to plot.")
+    else:
+        throughput = compute_throughput(log_data)
+        create_import_plots(throughput, "MB_PER_S", "Throughput (MB/s)")
+        create_import_plots(throughput, "TRIPLES_PER_S", "Throughput (statements/s, approximate)")
+        create_import_csv(throughput)
@@ -13,7 +13,7 @@ from hera.workflows import (
 from hera.shared import global_config
 from hera.workflows.models import Toleration, Arguments, Parameter, ValueFrom, ImagePullPolicy, SecurityContext, PodSecurityContext, RetryStrategy, IntOrString
 from experiment_constants import constants
-from experiment_utils import create_service_manifest, create_cleanup_config
+from experiment_utils import create_service_manifest, create_cleanup_config, create_dataset_importer
 import os
 
 @script(inputs=[Parameter(name="version"), Parameter(name="product"), Parameter(name="step"), Parameter(name="workflow_id")],
@@ -25,87 +25,6 @@ def compute_jena_configurations(version: str, product: str, step: str, workflow_
     with open("/tmp/jena-name", "w") as f_out:
         f_out.write(f"{workflow_id}-jena-{version}-{product}-{step}")
 
-@script(
-    image=constants.python_requests,
-    inputs=[
-        Parameter(name="existing_volume_name",
-                  description="The name of the existing volume containing the data to import"),
-        Parameter(name="number_of_versions",
-                  description="The number of versions to import"),
-        Parameter(name="hostname",
-                  description="The hostname of the server to import the data into"),
-    ],
-    volumes=[
-        ExistingVolume(
-            name="{{inputs.parameters.existing_volume_name}}",
-            claim_name="{{inputs.parameters.existing_volume_name}}",
-            mount_path="/app/data",
-        )
-    ],
-    resources=Resources(memory_limit=f"{constants.memory_limit}Gi"),
-    env=[
-        Env(name="PYTHONUNBUFFERED", value="1"),
-        Env(name="JENA_ADMIN_PASSWORD", value=constants.postgres_password)
-    ]
-)
-def create_theoretical_dataset_importer(
-    number_of_versions: int,
-    hostname: str
-) -> None:
-    from datetime import datetime
-    import os
-    import time
-    import requests
-    import sys
-
-    directory = "/app/data/data/theoretical"
-
-    try:
-        print(
-            f"Directory: {directory}, Number of versions: {number_of_versions}, Hostname: {hostname}")
-
-        # Get the list of files and directories in the specified directory
-        files_and_directories = os.listdir(directory)
-
-        # Filter out directories, keeping only files
-        files = [f for f in files_and_directories if os.path.isfile(
-            os.path.join(directory, f))]
-
-        for file in files:
-            if file.endswith(".ttl.trig"):
-                # Extraire le numéro de version à partir du nom de fichier
-                version = int(file.split('-')[-1].split('.ttl')[0])
-
-                # Vérifier si la version est inférieure ou égale au nombre de versions spécifiées
-                if version <= number_of_versions:
-                    print(
-                        f"\n{datetime.now().isoformat()} - [Triple Store] Version {file}")
-                    start = int(time.time() * 1000)
-                    filepath = os.path.join(directory, file)
-
-                    # Effectuer la requête HTTP pour importer la version
-                    try:
-                        with open(filepath, 'r') as f:
-                            jena_admin_password = os.environ.get('JENA_ADMIN_PASSWORD', '')
-                            url = f"http://admin:{jena_admin_password}@{hostname}-service:3030/mydataset/data"
-                            response = requests.post(
-                                url,
-                                headers={'Content-Type': 'application/trig'},
-                                data=f.read(),
-                                timeout=18000  # 5 hours in seconds
-                            )
-                            response.raise_for_status()
-                    except requests.exceptions.RequestException as e:
-                        print(f"Failed to import {filepath}: {e}")
-                        sys.exit(1)
-
-                    end = int(time.time() * 1000)
-                    print(
-                        f"\n{datetime.now().isoformat()} - [Measure] (Import Jena {file}): {end-start}ms;")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-
-
 if __name__ == "__main__":
 
     global_config.host = f'https://{os.environ.get("ARGO_SERVER")}'
@@ -218,6 +137,10 @@ if __name__ == "__main__":
                   "{{inputs.parameters.version}}", "{{inputs.parameters.product}}", "{{inputs.parameters.step}}"]
         )
 
+        dataset_importer_create = create_dataset_importer("jena", extra_env=[
+            Env(name="JENA_ADMIN_PASSWORD", value=constants.postgres_password),
+        ])
+
         with DAG(name="jena-dag", inputs=[
                 Parameter(name="version"),
                 Parameter(name="product"),
@@ -252,12 +175,15 @@ if __name__ == "__main__":
                 },
             )
 
-            task_jena_importer_create = create_theoretical_dataset_importer(
+            task_jena_importer_create = Task(
                 name="jena-importer",
+                template=dataset_importer_create,
                 arguments={
                     "existing_volume_name": dag.get_parameter("dataset-pvc-name"),
                     "number_of_versions": dag.get_parameter("version"),
-                    "hostname": task_compute_jena_configurations.get_parameter("jena-name")
+                    "hostname": task_compute_jena_configurations.get_parameter("jena-name"),
+                    "product": dag.get_parameter("product"),
+                    "step": dag.get_parameter("step")
                 }
             )
 
@@ -3,43 +3,504 @@ import os
 import psycopg2
 import sys
 
-def extract_log_info(log_file_path: str):
-    # Définir une expression régulière pour correspondre au format du log
-    # {"component":"quaque-10-1-5-condensed-service","query":"./converg/converg-9.rq","try":"1","duration":"178ms","version":"1","product":"10","step":"15"}
-    log_pattern = r'\{"component":"(?P<component>[^"]+)","query":"(?P<query>[^"]+)","try":"(?P<try>[^"]+)","duration":"(?P<duration>[^"]+)","version":"(?P<version>[^"]+)","product":"(?P<product>[^"]+)","step":"(?P<step>[^"]+)","time":"(?P<time>[^"]+)"\}'
-    extracted_data = []
+# the log readers shared with the plot images
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+from benchmark_logs import get_log_compression, open_log_file
+
+# {"component":"quaque-10-1-5-condensed-service","query":"./converg/converg-9.rq","try":"1","duration":"178ms","version":"1","product":"10","step":"15"}
+LOG_PATTERN = re.compile(r'\{"component":"(?P<component>[^"]+)","query":"(?P<query>[^"]+)","try":"(?P<try>[^"]+)","duration":"(?P<duration>[^"]+)","version":"(?P<version>[^"]+)","product":"(?P<product>[^"]+)","step":"(?P<step>[^"]+)","time":"(?P<time>[^"]+)"\}')
+
+# {"component":"blazegraph","space":"228098151","version":"1","product":"1","step":"0","time":"1700000000"}
+SPACE_LOG_PATTERN = re.compile(r'\{"component":"(?P<component>[^"]+)","space":"(?P<space>[^"]+)","version":"(?P<version>[^"]+)","product":"(?P<product>[^"]+)","step":"(?P<step>[^"]+)","time":"(?P<time>[^"]+)"\}')
+
+# columns of execution_logs filled by the loaders, in the order of the records yielded by iter_log_records
+EXECUTION_LOGS_COLUMNS = ["version", "product", "step", "component", "duration_ms", "time", "query", "nb_try"]
+
+# columns of space_logs filled by the loaders, in the order of the records yielded by iter_space_records
+SPACE_LOGS_COLUMNS = ["version", "product", "step", "component", "space_bytes", "time"]
 
+DEFAULT_BATCH_SIZE = 100000
+
+
+def iter_log_matches(log_file_path: str, pattern, start: int = 0, position: dict = None):
+    """
+    Streams the matches of pattern in the lines of the log file.
+
+    Args:
+        log_file_path (str): Path to the log file.
+        pattern (re.Pattern): Pattern of the records.
+        start (int): Byte offset of the first line to read.
+        position (dict): If given, position["offset"] follows the byte offset after the last complete line read,
+                         and a last line without newline (still being written) is not read.
+    A gzip or zstd log is decompressed on the fly; start and position are only used with uncompressed logs.
+    """
     # Lire le fichier de logs
-    with open(log_file_path, 'r') as file:
+    with open_log_file(log_file_path) as file:
+        if start:
+            file.seek(start)
+        offset = start
         for line in file:
+            if position is not None:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                position["offset"] = offset
             # Chercher les correspondances avec le pattern
-            match = re.search(log_pattern, line)
+            match = pattern.search(line.decode("utf-8", errors="replace"))
             if match:
-                # Extraire COMPONENT, DURATION, et FILE
-                component = match.group('component')
-                # keep only the number of the query
-                query = f"query-{match.group('query').split('-')[-1].split('.')[0]}"
-                nb_try = int(match.group('try'))
-                version_conf = int(match.group('version'))
-                product_conf = int(match.group('product'))
-                step_conf = int(match.group('step'))
-                # Convertir le temps en millisecondes
-                duration_ms = int(match.group('duration').replace("ms", ""))
-                time_unix = int(match.group('time'))
-
-                extracted_data.append({
-                    "VERSION": version_conf,
-                    "PRODUCT": product_conf,
-                    "STEP": step_conf,
-                    "COMPONENT": component,
-                    "DURATION (ms)": duration_ms,
-                    "QUERY": query,
-                    "TRY": nb_try,
-                    "TIME": time_unix
-                })
+                yield match
+
+
+def iter_log_records(log_file_path: str, start: int = 0, position: dict = None):
+    """
+    Streams the querier records of the log file as (version, product, step, component, duration_ms, time, query, nb_try)
+    tuples, time being a unix timestamp. See iter_log_matches for start and position.
+    """
+    for match in iter_log_matches(log_file_path, LOG_PATTERN, start, position):
+        yield (
+            int(match.group('version')),
+            int(match.group('product')),
+            int(match.group('step')),
+            match.group('component'),
+            # Convertir le temps en millisecondes
+            int(match.group('duration').replace("ms", "")),
+            int(match.group('time')),
+            # keep only the number of the query
+            f"query-{match.group('query').split('-')[-1].split('.')[0]}",
+            int(match.group('try')),
+        )
+
+
+def iter_space_records(log_file_path: str, start: int = 0, position: dict = None):
+    """
+    Streams the space records of the log file as (version, product, step, component, space_bytes, time) tuples,
+    time being a unix timestamp. See iter_log_matches for start and position.
+    """
+    for match in iter_log_matches(log_file_path, SPACE_LOG_PATTERN, start, position):
+        yield (
+            int(match.group('version')),
+            int(match.group('product')),
+            int(match.group('step')),
+            match.group('component'),
+            int(match.group('space')),
+            int(match.group('time')),
+        )
+
+
+def extract_log_info(log_file_path: str):
+    extracted_data = []
+
+    for version_conf, product_conf, step_conf, component, duration_ms, time_unix, query, nb_try in iter_log_records(log_file_path):
+        extracted_data.append({
+            "VERSION": version_conf,
+            "PRODUCT": product_conf,
+            "STEP": step_conf,
+            "COMPONENT": component,
+            "DURATION (ms)": duration_ms,
+            "QUERY": query,
+            "TRY": nb_try,
+            "TIME": time_unix
+        })
 
     return extracted_data
 
+
+def iter_batches(records, batch_size: int):
+    """
+    Groups an iterable of records into lists of at most batch_size records.
+    """
+    from itertools import islice
+
+    iterator = iter(records)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def encode_csv_batch(batch: list):
+    """
+    Encodes a batch of execution_logs or space_logs records in the CSV format of COPY.
+    """
+    import csv
+    import datetime
+    import io
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    # the unix timestamp is the sixth field of both records
+    for record in batch:
+        writer.writerow(record[:5] + (datetime.datetime.fromtimestamp(record[5]).isoformat(sep=" "),) + record[6:])
+    buffer.seek(0)
+    return buffer
+
+
+# binary COPY: signature, flags and header extension length, then one tuple per record and the -1 trailer
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + (0).to_bytes(4, "big") + (0).to_bytes(4, "big")
+PGCOPY_TRAILER = (-1).to_bytes(2, "big", signed=True)
+
+
+def encode_binary_batch(batch: list):
+    """
+    Encodes a batch of execution_logs records in the binary format of COPY: integers as int4, texts as UTF-8
+    and times as timestamps (microseconds since 2000-01-01).
+    """
+    import datetime
+    import io
+    import struct
+
+    epoch = datetime.datetime(2000, 1, 1)
+    row = struct.Struct("!hiiiiiii")
+    buffer = io.BytesIO()
+    buffer.write(PGCOPY_HEADER)
+    for version, product, step, component, duration_ms, time_unix, query, nb_try in batch:
+        component = component.encode("utf-8")
+        query = query.encode("utf-8")
+        time_us = (datetime.datetime.fromtimestamp(time_unix) - epoch) // datetime.timedelta(microseconds=1)
+        buffer.write(row.pack(len(EXECUTION_LOGS_COLUMNS), 4, version, 4, product, 4, step, len(component)))
+        buffer.write(component)
+        buffer.write(struct.pack("!iiiq", 4, duration_ms, 8, time_us))
+        buffer.write(len(query).to_bytes(4, "big"))
+        buffer.write(query)
+        buffer.write(struct.pack("!ii", 4, nb_try))
+    buffer.write(PGCOPY_TRAILER)
+    buffer.seek(0)
+    return buffer
+
+
+def encode_space_binary_batch(batch: list):
+    """
+    Encodes a batch of space_logs records in the binary format of COPY, like encode_binary_batch with space_bytes as int8.
+    """
+    import datetime
+    import io
+    import struct
+
+    epoch = datetime.datetime(2000, 1, 1)
+    row = struct.Struct("!hiiiiiii")
+    buffer = io.BytesIO()
+    buffer.write(PGCOPY_HEADER)
+    for version, product, step, component, space_bytes, time_unix in batch:
+        component = component.encode("utf-8")
+        time_us = (datetime.datetime.fromtimestamp(time_unix) - epoch) // datetime.timedelta(microseconds=1)
+        buffer.write(row.pack(len(SPACE_LOGS_COLUMNS), 4, version, 4, product, 4, step, len(component)))
+        buffer.write(component)
+        buffer.write(struct.pack("!iqiq", 8, space_bytes, 8, time_us))
+    buffer.write(PGCOPY_TRAILER)
+    buffer.seek(0)
+    return buffer
+
+
+EXECUTION_LOGS_ENCODERS = {"csv": encode_csv_batch, "binary": encode_binary_batch}
+SPACE_LOGS_ENCODERS = {"csv": encode_csv_batch, "binary": encode_space_binary_batch}
+
+
+def copy_batches(cursor, table: str, columns: list, records, batch_size: int = DEFAULT_BATCH_SIZE, copy_format: str = "csv", before_batch=None, encoders: dict = EXECUTION_LOGS_ENCODERS):
+    """
+    Streams the records into table with COPY FROM STDIN, batch_size records at a time, and returns the number of records.
+    before_batch, if given, is called with each batch before it is copied.
+    encoders maps each COPY format to the function encoding a batch of the records.
+    """
+    encode_batch = encoders[copy_format]
+    copy_query = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT {copy_format})"
+
+    count = 0
+    for batch in iter_batches(records, batch_size):
+        if before_batch is not None:
+            before_batch(batch)
+        cursor.copy_expert(copy_query, encode_batch(batch))
+        count += len(batch)
+        print(f"{count} records copied into {table}")
+    return count
+
+
+def ensure_step_partitions(cursor, table: str, steps, known_steps: set):
+    """
+    Creates the <table>_step_<step> list partitions missing for the given steps.
+    known_steps holds the steps already handled during this load.
+    """
+    from psycopg2 import sql
+
+    for step in sorted(set(steps) - known_steps):
+        cursor.execute(sql.SQL("CREATE TABLE IF NOT EXISTS {} PARTITION OF {} FOR VALUES IN ({})").format(
+            sql.Identifier(f"{table}_step_{step}"), sql.Identifier(table), sql.Literal(step)))
+        known_steps.add(step)
+
+
+# the statistics of the (version, step, query) configurations listed in touched_groups are recomputed
+REFRESH_ROLLUP_QUERY = """
+INSERT INTO execution_logs_rollup (version, step, component_name, query, count, median_ms, p75_ms, p95_ms, mean_ms, refreshed_at)
+SELECT l.version, l.step, l.component_name, l.query, count(*),
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY l.duration_ms),
+    percentile_cont(0.75) WITHIN GROUP (ORDER BY l.duration_ms),
+    percentile_cont(0.95) WITHIN GROUP (ORDER BY l.duration_ms),
+    avg(l.duration_ms),
+    now()
+FROM execution_logs l
+JOIN touched_groups t ON l.step = t.step AND l.version = t.version AND l.query = t.query
+GROUP BY l.version, l.step, l.component_name, l.query
+ON CONFLICT (version, step, component_name, query) DO UPDATE SET count = EXCLUDED.count, median_ms = EXCLUDED.median_ms,
+    p75_ms = EXCLUDED.p75_ms, p95_ms = EXCLUDED.p95_ms, mean_ms = EXCLUDED.mean_ms, refreshed_at = EXCLUDED.refreshed_at
+"""
+
+
+def refresh_rollups(cursor, touched_groups):
+    """
+    Recomputes the rows of execution_logs_rollup of the (version, step, query) configurations touched by a load.
+    """
+    from psycopg2.extras import execute_values
+
+    cursor.execute("CREATE TEMP TABLE touched_groups (version integer, step integer, query text) ON COMMIT DROP")
+    execute_values(cursor, "INSERT INTO touched_groups (version, step, query) VALUES %s", list(touched_groups))
+    cursor.execute(REFRESH_ROLLUP_QUERY)
+    print(f"{cursor.rowcount} rows of execution_logs_rollup refreshed for {len(touched_groups)} configurations.")
+
+
+def copy_logs_data(log_records, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, batch_size=DEFAULT_BATCH_SIZE, copy_format="csv"):
+    """
+    Connects to the PostgreSQL database and bulk loads the log records with COPY, in a single transaction.
+
+    Args:
+        log_records (iterable[tuple]): The records yielded by iter_log_records.
+        DB_NAME (str): Database name.
+        DB_USER (str): Database user.
+        DB_PASSWORD (str): Database password.
+        DB_HOST (str): Database host.
+        DB_PORT (str): Database port.
+        batch_size (int): Number of records sent per COPY, bounding the memory used.
+        copy_format (str): "csv" or "binary".
+    """
+    conn = None
+
+    try:
+        conn = psycopg2.connect(
+            dbname=DB_NAME,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            host=DB_HOST,
+            port=DB_PORT
+        )
+        print("Database connection established successfully.")
+
+        with conn.cursor() as cursor:
+            known_steps = set()
+            touched_groups = set()
+
+            def before_batch(batch):
+                ensure_step_partitions(cursor, "execution_logs", {record[2] for record in batch}, known_steps)
+                touched_groups.update((record[0], record[2], record[6]) for record in batch)
+
+            count = copy_batches(cursor, "execution_logs", EXECUTION_LOGS_COLUMNS, log_records, batch_size, copy_format, before_batch)
+            refresh_rollups(cursor, touched_groups)
+
+        conn.commit()
+        print(f"Transaction committed. {count} records copied successfully.")
+
+    except psycopg2.Error as e:
+        print(f"Error connecting to or interacting with the database: {e}", file=sys.stderr)
+        if conn:
+            conn.rollback()
+            print("Transaction rolled back due to error.")
+    finally:
+        if conn:
+            conn.close()
+            print("Database connection closed.")
+
+
+def copy_space_data(space_records, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, batch_size=DEFAULT_BATCH_SIZE, copy_format="csv"):
+    """
+    Connects to the PostgreSQL database and bulk loads the space records into space_logs with COPY, in a single transaction.
+
+    Args:
+        space_records (iterable[tuple]): The records yielded by iter_space_records.
+        See copy_logs_data for the other arguments.
+    """
+    conn = None
+
+    try:
+        conn = psycopg2.connect(
+            dbname=DB_NAME,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            host=DB_HOST,
+            port=DB_PORT
+        )
+        print("Database connection established successfully.")
+
+        with conn.cursor() as cursor:
+            known_steps = set()
+
+            def before_batch(batch):
+                ensure_step_partitions(cursor, "space_logs", {record[2] for record in batch}, known_steps)
+
+            count = copy_batches(cursor, "space_logs", SPACE_LOGS_COLUMNS, space_records, batch_size, copy_format, before_batch, SPACE_LOGS_ENCODERS)
+
+        conn.commit()
+        print(f"Transaction committed. {count} records copied successfully.")
+
+    except psycopg2.Error as e:
+        print(f"Error connecting to or interacting with the database: {e}", file=sys.stderr)
+        if conn:
+            conn.rollback()
+            print("Transaction rolled back due to error.")
+    finally:
+        if conn:
+            conn.close()
+            print("Database connection closed.")
+
+
+# number of bytes at the head of a log file used to detect that it was replaced since its last ingestion
+WATERMARK_HEAD_SIZE = 4096
+
+# the records of the staging table are merged into execution_logs, keeping the latest record of each primary key
+MERGE_STAGING_QUERY = """
+INSERT INTO execution_logs (version, product, step, component, duration_ms, time, query, nb_try)
+SELECT DISTINCT ON (version, product, step, component_name, query, nb_try)
+    version, product, step, component, duration_ms, time, query, nb_try
+FROM execution_logs_staging
+ORDER BY version, product, step, component_name, query, nb_try, time DESC
+ON CONFLICT (version, product, step, component_name, query, nb_try) {action}
+"""
+
+ON_CONFLICT_ACTIONS = {
+    "nothing": "DO NOTHING",
+    "update": "DO UPDATE SET component = EXCLUDED.component, duration_ms = EXCLUDED.duration_ms, time = EXCLUDED.time",
+}
+
+SPACE_MERGE_STAGING_QUERY = """
+INSERT INTO space_logs (version, product, step, component, space_bytes, time)
+SELECT DISTINCT ON (version, product, step, component_name)
+    version, product, step, component, space_bytes, time
+FROM space_logs_staging
+ORDER BY version, product, step, component_name, time DESC
+ON CONFLICT (version, product, step, component_name) {action}
+"""
+
+SPACE_ON_CONFLICT_ACTIONS = {
+    "nothing": "DO NOTHING",
+    "update": "DO UPDATE SET component = EXCLUDED.component, space_bytes = EXCLUDED.space_bytes, time = EXCLUDED.time",
+}
+
+# tables and records of each LOG_TYPE, used by the incremental mode
+LOG_TYPES = {
+    "querier": {
+        "table": "execution_logs",
+        "columns": EXECUTION_LOGS_COLUMNS,
+        "encoders": EXECUTION_LOGS_ENCODERS,
+        "iter_records": iter_log_records,
+        "merge_query": MERGE_STAGING_QUERY,
+        "on_conflict_actions": ON_CONFLICT_ACTIONS,
+    },
+    "space": {
+        "table": "space_logs",
+        "columns": SPACE_LOGS_COLUMNS,
+        "encoders": SPACE_LOGS_ENCODERS,
+        "iter_records": iter_space_records,
+        "merge_query": SPACE_MERGE_STAGING_QUERY,
+        "on_conflict_actions": SPACE_ON_CONFLICT_ACTIONS,
+    },
+}
+
+
+def get_head_fingerprint(log_file_path: str, size: int):
+    """
+    Computes a SHA-256 digest of the first size bytes of the file.
+    """
+    import hashlib
+
+    with open(log_file_path, 'rb') as f:
+        return hashlib.sha256(f.read(size)).hexdigest()
+
+
+def get_resume_offset(cursor, source_file: str, log_file_path: str):
+    """
+    Returns the byte offset after the last line ingested from source_file, or 0 when the file is new,
+    was truncated or has a different head (the file was replaced).
+    """
+    cursor.execute("SELECT byte_offset, head_fingerprint FROM ingestion_watermarks WHERE source_file = %s", (source_file,))
+    watermark = cursor.fetchone()
+    if watermark is None:
+        return 0
+
+    byte_offset, head_fingerprint = watermark
+    if os.path.getsize(log_file_path) < byte_offset:
+        print(f"{log_file_path} is smaller than at its last ingestion, ingesting it from the start.")
+        return 0
+    if get_head_fingerprint(log_file_path, min(byte_offset, WATERMARK_HEAD_SIZE)) != head_fingerprint:
+        print(f"{log_file_path} changed since its last ingestion, ingesting it from the start.")
+        return 0
+    return byte_offset
+
+
+def ingest_logs_incrementally(log_file_path, source_file, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, batch_size=DEFAULT_BATCH_SIZE, copy_format="csv", on_conflict="nothing", log_type="querier"):
+    """
+    Loads the lines appended to the log file since its last ingestion.
+    The records are copied into a staging table and merged into execution_logs (log_type "querier") or space_logs
+    (log_type "space") with ON CONFLICT, so that the records already present are skipped ("nothing") or replaced
+    ("update") instead of failing the load.
+    The watermark of source_file (byte offset, size and head fingerprint) is updated in the same transaction.
+    The watermarks are offsets in the file itself, so a compressed log is refused.
+    """
+    compression = get_log_compression(log_file_path)
+    if compression is not None:
+        raise ValueError(f"LOAD_MODE=incremental needs an uncompressed log file, {log_file_path} is compressed with "
+                         f"{compression}: decompress it first or use LOAD_MODE=copy")
+
+    log_type = LOG_TYPES[log_type]
+    table = log_type["table"]
+    conn = None
+
+    try:
+        conn = psycopg2.connect(
+            dbname=DB_NAME,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            host=DB_HOST,
+            port=DB_PORT
+        )
+        print("Database connection established successfully.")
+
+        with conn.cursor() as cursor:
+            start = get_resume_offset(cursor, source_file, log_file_path)
+            print(f"Ingesting {log_file_path} from byte {start}.")
+
+            cursor.execute(f"CREATE TEMP TABLE {table}_staging (LIKE {table} INCLUDING GENERATED) ON COMMIT DROP")
+            position = {"offset": start}
+            records = log_type["iter_records"](log_file_path, start, position)
+            count = copy_batches(cursor, f"{table}_staging", log_type["columns"], records, batch_size, copy_format,
+                                 encoders=log_type["encoders"])
+
+            cursor.execute(f"SELECT DISTINCT step FROM {table}_staging")
+            ensure_step_partitions(cursor, table, [step for step, in cursor.fetchall()], set())
+            cursor.execute(log_type["merge_query"].format(action=log_type["on_conflict_actions"][on_conflict]))
+            print(f"{cursor.rowcount} of {count} new records merged into {table}.")
+
+            if table == "execution_logs":
+                cursor.execute("SELECT DISTINCT version, step, query FROM execution_logs_staging")
+                refresh_rollups(cursor, cursor.fetchall())
+
+            cursor.execute(
+                """
+                INSERT INTO ingestion_watermarks (source_file, byte_offset, file_size, head_fingerprint, updated_at)
+                VALUES (%s, %s, %s, %s, now())
+                ON CONFLICT (source_file) DO UPDATE SET byte_offset = EXCLUDED.byte_offset, file_size = EXCLUDED.file_size,
+                    head_fingerprint = EXCLUDED.head_fingerprint, updated_at = EXCLUDED.updated_at
+                """,
+                (source_file, position["offset"], os.path.getsize(log_file_path),
+                 get_head_fingerprint(log_file_path, min(position["offset"], WATERMARK_HEAD_SIZE))))
+
+        conn.commit()
+        print(f"Transaction committed. {source_file} ingested up to byte {position['offset']}.")
+
+    except psycopg2.Error as e:
+        print(f"Error connecting to or interacting with the database: {e}", file=sys.stderr)
+        if conn:
+            conn.rollback()
+            print("Transaction rolled back due to error.")
+    finally:
+        if conn:
+            conn.close()
+            print("Database connection closed.")
+
+
 def insert_logs_data(log_data_list, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT):
     """
     Connects to the PostgreSQL database and inserts a set of log records efficiently.
@@ -105,11 +566,15 @@ def insert_logs_data(log_data_list, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_P
 
         print(f"Preparing to insert {len(data_to_insert)} log records.")
 
+        ensure_step_partitions(cursor, "execution_logs", {entry['step'] for entry in data_to_insert}, set())
+
         # Execute the INSERT statement for all records using executemany
         # executemany is generally efficient for inserting multiple rows with the same statement structure
         cursor.executemany(insert_query, data_to_insert)
         print(f"{cursor.rowcount} records prepared for insertion (Note: rowcount might be -1 depending on driver/db).") # rowcount behavior can vary
 
+        refresh_rollups(cursor, {(entry['version'], entry['step'], entry['query']) for entry in data_to_insert})
+
         # Commit the transaction to make the changes permanent
         conn.commit()
         print("Transaction committed. Data inserted successfully.")
@@ -165,8 +630,26 @@ if __name__ == "__main__":
     DB_HOST = os.getenv("DB_HOST")
     DB_PORT = os.getenv("DB_PORT")
 
-    print(f"Extracting log data from {log_file_path}")
-    log_data = extract_log_info(log_file_path)
-
-    insert_logs_data(log_data, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT)
+    load_mode = os.getenv("LOAD_MODE", "copy")
+    batch_size = int(os.getenv("BATCH_SIZE", DEFAULT_BATCH_SIZE))
+    copy_format = os.getenv("COPY_FORMAT", "csv")
+    # identifies the log file in the watermarks of the incremental mode, e.g. the workflow id
+    source_file = os.getenv("SOURCE_FILE", log_file_path)
+    on_conflict = os.getenv("ON_CONFLICT", "nothing")
+    # "querier" for the duration records, "space" for the space records
+    log_type = os.getenv("LOG_TYPE", "querier")
+    if log_type not in LOG_TYPES:
+        raise ValueError(f"Unknown LOG_TYPE: {log_type}")
 
+    print(f"Extracting {log_type} log data from {log_file_path}")
+    if load_mode == "incremental":
+        ingest_logs_incrementally(log_file_path, source_file, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, batch_size, copy_format, on_conflict, log_type)
+    elif load_mode == "copy" and log_type == "space":
+        copy_space_data(iter_space_records(log_file_path), DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, batch_size, copy_format)
+    elif load_mode == "copy":
+        copy_logs_data(iter_log_records(log_file_path), DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, batch_size, copy_format)
+    elif load_mode == "insert" and log_type == "querier":
+        log_data = extract_log_info(log_file_path)
+        insert_logs_data(log_data, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT)
+    else:
+        raise ValueError(f"Unknown LOAD_MODE for LOG_TYPE {log_type}: {load_mode}")
@@ -1,3 +1,4 @@
+-- Partitioned by step: logs-parser.py creates the execution_logs_step_<step> partitions on demand
 CREATE TABLE execution_logs (
     version integer,
     product integer,
@@ -9,10 +10,59 @@ CREATE TABLE execution_logs (
     nb_try integer,
     component_name text GENERATED ALWAYS AS (
         REGEXP_REPLACE(
-               component, 
+               component,
                '-[0-9]+(-[0-9]+)*-service$',
                ''
        )
-    ),
+    ) STORED,
     PRIMARY KEY (version, product, step, component_name, query, nb_try)
-)
\ No newline at end of file
+) PARTITION BY LIST (step);
+
+-- The records are appended in time order, a BRIN index is enough for time range filters
+CREATE INDEX execution_logs_time_brin ON execution_logs USING BRIN (time);
+
+-- Duration statistics per configuration, refreshed by logs-parser.py for the configurations it loads
+CREATE TABLE execution_logs_rollup (
+    version integer,
+    step integer,
+    component_name text,
+    query text,
+    count bigint NOT NULL,
+    median_ms double precision NOT NULL,
+    p75_ms double precision NOT NULL,
+    p95_ms double precision NOT NULL,
+    mean_ms double precision NOT NULL,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT now(),
+    PRIMARY KEY (version, step, component_name, query)
+);
+
+-- Position of the last line ingested from each log file by the incremental mode of logs-parser.py
+CREATE TABLE IF NOT EXISTS ingestion_watermarks (
+    source_file text PRIMARY KEY,
+    byte_offset bigint NOT NULL,
+    file_size bigint NOT NULL,
+    -- SHA-256 of the first min(byte_offset, 4096) bytes, to detect a replaced file
+    head_fingerprint text NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+-- Storage footprint of each component, loaded by logs-parser.py with LOG_TYPE=space.
+-- component_name is derived like in execution_logs, so that both tables can be joined per configuration.
+CREATE TABLE IF NOT EXISTS space_logs (
+    version integer,
+    product integer,
+    step integer,
+    component text,
+    space_bytes bigint,
+    time TIMESTAMP,
+    component_name text GENERATED ALWAYS AS (
+        REGEXP_REPLACE(
+               component,
+               '-[0-9]+(-[0-9]+)*-service$',
+               ''
+       )
+    ) STORED,
+    PRIMARY KEY (version, product, step, component_name)
+) PARTITION BY LIST (step);
+
+CREATE INDEX IF NOT EXISTS space_logs_time_brin ON space_logs USING BRIN (time);
@@ -0,0 +1,95 @@
+-- Upgrades a database created with the flat execution_logs table to the partitioned schema of schema.sql.
+-- Run it once, in a single transaction: psql --single-transaction -f upgrade-schema.sql
+
+ALTER TABLE execution_logs RENAME TO execution_logs_flat;
+ALTER TABLE execution_logs_flat RENAME CONSTRAINT execution_logs_pkey TO execution_logs_flat_pkey;
+
+CREATE TABLE execution_logs (
+    version integer,
+    product integer,
+    step integer,
+    component text,
+    duration_ms integer,
+    time TIMESTAMP,
+    query text,
+    nb_try integer,
+    component_name text GENERATED ALWAYS AS (
+        REGEXP_REPLACE(
+               component,
+               '-[0-9]+(-[0-9]+)*-service$',
+               ''
+       )
+    ) STORED,
+    PRIMARY KEY (version, product, step, component_name, query, nb_try)
+) PARTITION BY LIST (step);
+
+CREATE INDEX execution_logs_time_brin ON execution_logs USING BRIN (time);
+
+DO $$
+DECLARE
+    partition_step integer;
+BEGIN
+    FOR partition_step IN SELECT DISTINCT step FROM execution_logs_flat WHERE step IS NOT NULL LOOP
+        EXECUTE format('CREATE TABLE %I PARTITION OF execution_logs FOR VALUES IN (%s)',
+                       'execution_logs_step_' || partition_step, partition_step);
+    END LOOP;
+END $$;
+
+INSERT INTO execution_logs (version, product, step, component, duration_ms, time, query, nb_try)
+SELECT version, product, step, component, duration_ms, time, query, nb_try
+FROM execution_logs_flat
+ORDER BY time;
+
+CREATE TABLE execution_logs_rollup (
+    version integer,
+    step integer,
+    component_name text,
+    query text,
+    count bigint NOT NULL,
+    median_ms double precision NOT NULL,
+    p75_ms double precision NOT NULL,
+    p95_ms double precision NOT NULL,
+    mean_ms double precision NOT NULL,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT now(),
+    PRIMARY KEY (version, step, component_name, query)
+);
+
+INSERT INTO execution_logs_rollup (version, step, component_name, query, count, median_ms, p75_ms, p95_ms, mean_ms)
+SELECT version, step, component_name, query, count(*),
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms),
+    percentile_cont(0.75) WITHIN GROUP (ORDER BY duration_ms),
+    percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms),
+    avg(duration_ms)
+FROM execution_logs
+GROUP BY version, step, component_name, query;
+
+DROP TABLE execution_logs_flat;
+
+-- Position of the last line ingested from each log file by the incremental mode of logs-parser.py
+CREATE TABLE IF NOT EXISTS ingestion_watermarks (
+    source_file text PRIMARY KEY,
+    byte_offset bigint NOT NULL,
+    file_size bigint NOT NULL,
+    -- SHA-256 of the first min(byte_offset, 4096) bytes, to detect a replaced file
+    head_fingerprint text NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS space_logs (
+    version integer,
+    product integer,
+    step integer,
+    component text,
+    space_bytes bigint,
+    time TIMESTAMP,
+    component_name text GENERATED ALWAYS AS (
+        REGEXP_REPLACE(
+               component,
+               '-[0-9]+(-[0-9]+)*-service$',
+               ''
+       )
+    ) STORED,
+    PRIMARY KEY (version, product, step, component_name)
+) PARTITION BY LIST (step);
+
+CREATE INDEX IF NOT EXISTS space_logs_time_brin ON space_logs USING BRIN (time);
@@ -95,9 +95,11 @@ if __name__ == "__main__":
                 SecretEnv(name="AWS_SECRET_ACCESS_KEY", secret_name="ceph-s3-pagoda", secret_key="secretkey"),
                 SecretEnv(name="AWS_ACCESS_KEY_ID", secret_name="ceph-s3-pagoda", secret_key="accesskey"),
                 Env(name="WORKFLOW_ID", value="{{inputs.parameters.workflow_id}}"),
+                Env(name="MERGE_COMPRESSION", value=constants.merge_compression),
             ],
             outputs=[Artifact(name="time_merged_logs", path="/app/{{inputs.parameters.workflow_id}}/querier/merged_logs.log"),
-                     Artifact(name="space_merged_logs", path="/app/{{inputs.parameters.workflow_id}}/space/merged_logs.log")],
+                     Artifact(name="space_merged_logs", path="/app/{{inputs.parameters.workflow_id}}/space/merged_logs.log"),
+                     Artifact(name="import_merged_logs", path="/app/{{inputs.parameters.workflow_id}}/import/merged_logs.log")],
         )
 
         create_time_plots = Container(
@@ -115,6 +117,9 @@ if __name__ == "__main__":
                 Env(name="COUNT_VERSION", value="{{inputs.parameters.count_version}}"),
                 Env(name="COUNT_COMPONENT", value="{{inputs.parameters.count_component}}"),
                 Env(name="COUNT_REPEAT", value="{{inputs.parameters.count_repeat}}"),
+                Env(name="PLOT_WORKERS", value=constants.plot_workers),
+                Env(name="STATS_WORKERS", value=constants.plot_workers),
+                Env(name="CACHE_DIR", value=""),
             ],
             outputs=[
                 Artifact(name="time-plots", path="/app/"),
@@ -132,12 +137,28 @@ if __name__ == "__main__":
             env=[
                 Env(name="LOG_FILE_PATH", value="merged_logs.log"),
                 Env(name="COUNT_VERSION", value="{{inputs.parameters.count_version}}"),
+                Env(name="CACHE_DIR", value=""),
             ],
             outputs=[
                 Artifact(name="space-plots", path="/app/"),
             ]
         )
 
+        create_import_plots = Container(
+            name="import-plots",
+            image=constants.import_logs_to_plots,
+            inputs=[
+                Artifact(name="import_merged_logs", path="/app/merged_logs.log"),
+            ],
+            image_pull_policy=ImagePullPolicy.if_not_present,
+            env=[
+                Env(name="LOG_FILE_PATH", value="merged_logs.log"),
+            ],
+            outputs=[
+                Artifact(name="import-plots", path="/app/"),
+            ]
+        )
+
         with DAG(name="benchmark-dag"):
             task_compute_dbs_dss_configurations = compute_dbs_dss_configurations(
                 arguments={"versions": "{{workflow.parameters.versions}}",
@@ -185,6 +206,14 @@ if __name__ == "__main__":
                 },
             )
 
-            task_compute_dbs_dss_configurations >> task_ds_dbs >> get_workflow_logs_task >> [create_time_plots_task, create_space_plots_task]
+            create_import_plots_task = Task(
+                name="import-plots",
+                template=create_import_plots,
+                arguments={
+                    "import_merged_logs": get_workflow_logs_task.get_artifact("import_merged_logs"),
+                },
+            )
+
+            task_compute_dbs_dss_configurations >> task_ds_dbs >> get_workflow_logs_task >> [create_time_plots_task, create_space_plots_task, create_import_plots_task]
 
         wt.create()
@@ -1,7 +1,9 @@
-import json
+import io
 import re
 import os
 
+from benchmark_logs import filter_groups, open_log_file, store_data_to_parquet
+
 
 def get_component_name(component: str):
     """
@@ -28,13 +30,17 @@ def get_component_name(component: str):
     return '-'.join(component_parts)
 
 
-def extract_log_info(log_file_path: str, min_count_version: int):
+# Must be bumped whenever the parsed columns change, so that cached Parquet files are invalidated
+PARSER_VERSION = 1
+
+
+def read_log_frame(log_file_path: str):
     # Définir une expression régulière pour correspondre au format du log
     log_pattern = r'\{"component":"(?P<component>[^"]+)","space":"(?P<space>[^"]+)","version":"(?P<version>[^"]+)","product":"(?P<product>[^"]+)","step":"(?P<step>[^"]+)","time":"(?P<time>[^"]+)"\}'
     extracted_data = []
 
     # Lire le fichier de logs
-    with open(log_file_path, 'r') as file:
+    with io.TextIOWrapper(open_log_file(log_file_path), encoding='utf-8') as file:
         for line in file:
             # Chercher les correspondances avec le pattern
             match = re.search(log_pattern, line)
@@ -57,51 +63,70 @@ def extract_log_info(log_file_path: str, min_count_version: int):
                     "COMPONENT_NAME": get_component_name(component)
                 })
 
-    extracted_data = remove_all_with_no_component(data=extracted_data)
-    print(f"After remove_all_with_no_component: {len(extracted_data)}")
-    extracted_data = remove_all_with_less_than_count_version(data=extracted_data, count=min_count_version)
-    print(f"After remove_all_with_less_than_count_version: {len(extracted_data)}")
+    import pandas as pd
+    return pd.DataFrame(extracted_data, columns=["VERSION", "STEP", "COMPONENT", "SPACE", "TIME", "COMPONENT_NAME"])
 
-    return extracted_data
 
-def remove_all_with_no_component(data):
+def get_file_hash(file_path: str):
     """
-    Remove all entries from data when the metric exists for all components for a given STEP and VERSION
-    4 components are expected: blazegraph, jena, quaque-flat, quaque-condensed
+    Computes a SHA-256 digest of the content of the file.
     """
-    import pandas as pd
-    df = pd.DataFrame(data)
-    
-    component_counts = df.groupby(['STEP', 'VERSION'])['COMPONENT_NAME'].nunique()
-    components_to_remove = component_counts[component_counts != 4].index.tolist()
-    
-    for step, version in components_to_remove:
-        df = df[~((df['STEP'] == step) & (df['VERSION'] == version))]
-        
-    return df.to_dict(orient='records')    
-    
+    import hashlib
+
+    with open(file_path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
 
-def remove_all_with_less_than_count_version(data, count=4):
+def read_cached_log_frame(log_file_path: str, cache_dir: str):
     """
-    Group by STEP, COMPONENT and
-    remove all entries from data when the count of version is less than count
+    Returns the parsed space records, using a Parquet cache keyed by the content of the log file
+    and the parser version.
+    On a cache hit the Parquet file is memory-mapped instead of re-parsing the log file.
+    The cache only helps local runs, which keep cache_dir between runs: a workflow pod starts
+    without it and parses the log file again, so the workflows disable it (CACHE_DIR="").
     """
     import pandas as pd
-    df = pd.DataFrame(data)
-    
-    # Count the number of unique versions for each group
-    version_counts = df.groupby(['STEP', 'COMPONENT_NAME'])['VERSION'].nunique().reset_index()
-    version_counts.rename(columns={'VERSION': 'COUNT_VERSION'}, inplace=True)
 
-    # Filter groups with less than count unique versions
-    groups_to_remove = version_counts[version_counts['COUNT_VERSION'] < count]
+    if not cache_dir:
+        return read_log_frame(log_file_path)
+
+    cache_path = os.path.join(cache_dir, f"log_data-{get_file_hash(log_file_path)[:16]}-v{PARSER_VERSION}.parquet")
+
+    if os.path.exists(cache_path):
+        print(f"Loading parsed log records from cache {cache_path}")
+        return pd.read_parquet(cache_path, memory_map=True)
+
+    df = read_log_frame(log_file_path)
 
-    # Remove all entries from data have the same STEP in groups_to_remove
-    for _, row in groups_to_remove.iterrows():
-        step, _, _ = row
-        df = df[~((df['STEP'] == step))]
+    os.makedirs(cache_dir, exist_ok=True)
+    store_data_to_parquet(data=df, file_path=cache_path)
+    print(f"Parsed log records cached in {cache_path}")
+    return df
 
-    return df.to_dict(orient='records')
+
+def extract_log_info(log_file_path: str, min_count_version: int, cache_dir: str = "cache"):
+    df = read_cached_log_frame(log_file_path, cache_dir)
+
+    return filter_groups(df, [
+        {
+            # Remove all entries when the metric does not exist for all components for a given STEP and VERSION
+            # 4 components are expected: blazegraph, jena, quaque-flat, quaque-condensed
+            "name": "remove_all_with_no_component",
+            "group_by": ['STEP', 'VERSION'],
+            "column": 'COMPONENT_NAME',
+            "aggregate": 'nunique',
+            "expected_value": 4,
+        },
+        {
+            # Remove all entries of a STEP when the count of unique versions of one of its components is less than count
+            "name": "remove_all_with_less_than_count_version",
+            "group_by": ['STEP', 'COMPONENT_NAME'],
+            "column": 'VERSION',
+            "aggregate": 'nunique',
+            "min_threshold": min_count_version,
+            "drop_by": ['STEP'],
+        },
+    ])
 
 
 def create_space_plot(data, scale="linear"):
@@ -214,21 +239,12 @@ def create_space_csv(data):
     df_pivot.to_csv(f"{output_dir}/space.csv", index=False)
 
 
-def store_data_to_json(data, file_path):
-    """
-    Store the data to a json file
-    Args:
-        data (list): List of dictionaries
-        file_path (str): Path to the json file
-    """
-    with open(file_path, 'w') as f:
-        json.dump(data, f)
-
 if __name__ == "__main__":
     # Afficher les informations extraites
 
     log_file_path = os.getenv("LOG_FILE_PATH", "merged_logs.log")
     min_count_version = int(os.getenv("COUNT_VERSION", 3))
+    cache_dir = os.getenv("CACHE_DIR", "cache")
 
     if not log_file_path:
         raise EnvironmentError(
@@ -237,9 +253,9 @@ if __name__ == "__main__":
     print(f"Log file path: {log_file_path}")
     print(f"Minimum count version: {min_count_version}")
 
-    log_data = extract_log_info(log_file_path, min_count_version)
+    log_data = extract_log_info(log_file_path, min_count_version, cache_dir)
     
-    store_data_to_json(data=log_data, file_path="log_data.json")
+    store_data_to_parquet(data=log_data, file_path="log_data.parquet")
 
     for scale in ["linear", "log"]:
         create_space_plot(data=log_data, scale=scale)
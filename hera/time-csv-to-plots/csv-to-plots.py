@@ -2,6 +2,9 @@ import json
 import re
 import os
 
+from benchmark_stats import (build_samples, build_component_samples, run_shapiro_wilk_tests,
+                              run_mann_whitney_u_tests, run_statistical_tests, shapiro_wilk_results_table)
+
 
 def extract_csv_info(csv_file_path: str, queries_info: str, plot_config: dict):
     """
@@ -231,9 +234,9 @@ def store_data_to_json(data, file_path):
     with open(file_path, 'w') as f:
         json.dump(data, f)
 
-def check_shapiro_wilk_test(data: list, warmup: int, query_type: str, output_folder: str):
+
+def check_shapiro_wilk_test(data: list, warmup: int, query_type: str, output_folder: str, workers: int = 1):
     import pandas as pd
-    from scipy import stats
     
     if not data:
         print(f"No data available for query type: {query_type}. Skipping Shapiro-Wilk test.")
@@ -244,17 +247,12 @@ def check_shapiro_wilk_test(data: list, warmup: int, query_type: str, output_fol
 
     df = pd.DataFrame(data)
     
-    results = []
-    results_without_query = []
-    
     # Remove warmup tries
     df = df[df['RUN_ID'] > warmup]
     
     # Grouping for "with query"
     group_cols_with_query = ['POLICY', 'GRANULARITY', 'QUERY_TYPE', 'TOOL']
     available_cols_with_query = [col for col in group_cols_with_query if col in df.columns]
-    
-    grouped = df.groupby(available_cols_with_query)
 
     # Compute mean duration by RUN_ID and config (averaging over queries for "without query" case)
     mean_group_cols = ['RUN_ID', 'TOOL', 'POLICY', 'GRANULARITY']
@@ -265,76 +263,28 @@ def check_shapiro_wilk_test(data: list, warmup: int, query_type: str, output_fol
     group_cols_without_query = ['POLICY', 'GRANULARITY', 'TOOL']
     available_cols_without_query = [col for col in group_cols_without_query if col in mean_df.columns]
     
-    grouped_without_query = mean_df.groupby(available_cols_without_query)
-    
-    for name, group in grouped_without_query:
-        if len(group) < 2:
-            continue
-        # Perform Shapiro-Wilk test for normality
-        grouped_data = group['TIME_MS']
-        stat, p_value = stats.shapiro(grouped_data)
-        alpha = 0.05
-        if p_value > alpha:
-            pass # print(f"Data for {name} is normally distributed (p={p_value:.3f})")
-
-        res = {
-            'W_STATISTIC': stat,
-            'P_VALUE': p_value,
-            'NORMALLY_DISTRIBUTED': str(p_value > alpha),
-            'MEAN': grouped_data.mean(),
-            'MEDIAN': grouped_data.median(),
-            '75TH_PERC': grouped_data.quantile(0.75),
-            '95TH_PERC': grouped_data.quantile(0.95),
-        }
-        # Add config keys
-        if isinstance(name, tuple):
-            for i, col in enumerate(available_cols_without_query):
-                res[col] = name[i]
-        else:
-            res[available_cols_without_query[0]] = name
-            
-        results_without_query.append(res)
+    test_cols = ['W_STATISTIC', 'P_VALUE', 'NORMALLY_DISTRIBUTED', 'MEAN', 'MEDIAN', '75TH_PERC', '95TH_PERC']
+
+    tasks_without_query = list(zip(*build_samples(mean_df, available_cols_without_query, 'TIME_MS')))
+    rows_without_query = run_statistical_tests(run_shapiro_wilk_tests, tasks_without_query, workers)
+    results_without_query = shapiro_wilk_results_table(
+        rows_without_query, available_cols_without_query, test_cols + available_cols_without_query)
         
     with open(os.path.join(output_folder, f'shapiro_wilk_test_results_without_query_{query_type}.json'), 'w') as f:
-        json.dump(results_without_query, f, indent=4)
+        json.dump(results_without_query.to_dict(orient='records'), f, indent=4)
 
-    for name, group in grouped:
-        if len(group) < 2:
-            continue
-        # Perform Shapiro-Wilk test for normality
-        grouped_data = group['TIME_MS']
-        stat, p_value = stats.shapiro(grouped_data)
-        alpha = 0.05
-        if p_value > alpha:
-            pass # print(f"Data for {name} is normally distributed (p={p_value:.3f})")
-            
-        res = {
-            'W_STATISTIC': stat,
-            'P_VALUE': p_value,
-            'NORMALLY_DISTRIBUTED': str(p_value > alpha),
-            'MEAN': grouped_data.mean(),
-            'MEDIAN': grouped_data.median(),
-            '75TH_PERC': grouped_data.quantile(0.75),
-            '95TH_PERC': grouped_data.quantile(0.95),
-        }
-        if isinstance(name, tuple):
-            for i, col in enumerate(available_cols_with_query):
-                res[col] = name[i]
-        else:
-            res[available_cols_with_query[0]] = name
-            
-        results.append(res)
+    tasks = list(zip(*build_samples(df, available_cols_with_query, 'TIME_MS')))
+    rows = run_statistical_tests(run_shapiro_wilk_tests, tasks, workers)
+    results = shapiro_wilk_results_table(rows, available_cols_with_query, test_cols + available_cols_with_query)
         
     # save results to a json file
     with open(os.path.join(output_folder, f'shapiro_wilk_test_results_{query_type}.json'), 'w') as f:
-        json.dump(results, f, indent=4)
+        json.dump(results.to_dict(orient='records'), f, indent=4)
         
     return results, results_without_query
 
-def check_Mann_Whitney_U_test(data: list, warmup: int, query_type: str, output_folder: str):
+def check_Mann_Whitney_U_test(data: list, warmup: int, query_type: str, output_folder: str, workers: int = 1):
     import pandas as pd
-    from scipy import stats
-    from itertools import combinations
     
     if not data:
         print(f"No data available for query type: {query_type}. Skipping Mann-Whitney U test.")
@@ -345,9 +295,7 @@ def check_Mann_Whitney_U_test(data: list, warmup: int, query_type: str, output_f
     print("Significant difference between comp1 and comp2 for the given query, meaning the statistical test found strong evidence that the two are different.")
 
     df = pd.DataFrame(data)
-    
-    results = []
-    results_without_query = []
+    alpha = 0.05
     
     # Remove warmup tries
     df = df[df['RUN_ID'] > warmup]
@@ -357,86 +305,34 @@ def check_Mann_Whitney_U_test(data: list, warmup: int, query_type: str, output_f
     available_mean_cols = [col for col in mean_group_cols if col in df.columns]
     mean_df = df.groupby(available_mean_cols, as_index=False)['TIME_MS'].mean()
     
-    group_cols_without_query = ['POLICY', 'GRANULARITY', 'TOOL']
+    # the tools are compared within each configuration
+    group_cols_without_query = ['POLICY', 'GRANULARITY']
     available_cols_without_query = [col for col in group_cols_without_query if col in mean_df.columns]
-    
-    grouped_without_query = mean_df.groupby(available_cols_without_query)
-    
-    for name, group in grouped_without_query:
-        components = group['TOOL'].unique()
-        if len(components) < 2:
-            continue
-    
-        for comp1, comp2 in combinations(components, 2):
-            data1 = group[group['TOOL'] == comp1]['TIME_MS']
-            data2 = group[group['TOOL'] == comp2]['TIME_MS']
-            if len(data1) < 2 or len(data2) < 2:
-                continue
-            stat, p_value = stats.mannwhitneyu(data1, data2, alternative='two-sided')
-            
-            alpha = 0.05
-            if p_value <= alpha:
-                pass # print(f"Significant difference between {comp1} and {comp2} for {name} (p={p_value:.3f})")
-                
-            res = {
-                'COMPONENT_1': comp1,
-                'COMPONENT_2': comp2,
-                'U_STATISTIC': stat,
-                'P_VALUE': p_value,
-                'SIGNIFICANT': str(p_value <= alpha)
-            }
-            if isinstance(name, tuple):
-                for i, col in enumerate(available_cols_without_query):
-                    res[col] = name[i]
-            else:
-                res[available_cols_without_query[0]] = name
-                
-            results_without_query.append(res)
-            
-    with open(os.path.join(output_folder, f'mann_whitney_u_test_results_without_query_{query_type}.json'), 'w') as f:
-        json.dump(results_without_query, f, indent=4)
 
     # With query
     group_cols_with_query = ['POLICY', 'GRANULARITY', 'QUERY_TYPE']
     available_cols_with_query = [col for col in group_cols_with_query if col in df.columns]
-    
-    grouped = df.groupby(available_cols_with_query)
-
-    for name, group in grouped:
-        components = group['TOOL'].unique()
-        if len(components) < 2:
-            continue
-        
-        for comp1, comp2 in combinations(components, 2):
-            data1 = group[group['TOOL'] == comp1]['TIME_MS']
-            data2 = group[group['TOOL'] == comp2]['TIME_MS']
-            if len(data1) < 2 or len(data2) < 2:
-                continue
-            stat, p_value = stats.mannwhitneyu(data1, data2, alternative='two-sided')
-            
-            alpha = 0.05
-            if p_value <= alpha:
-                pass # print(f"Significant difference between {comp1} and {comp2} for {name} (p={p_value:.3f})")
-                
-            res = {
-                'COMPONENT_1': comp1,
-                'COMPONENT_2': comp2,
-                'U_STATISTIC': stat,
-                'P_VALUE': p_value,
-                'SIGNIFICANT': str(p_value <= alpha)
-            }
-            if isinstance(name, tuple):
-                for i, col in enumerate(available_cols_with_query):
-                    res[col] = name[i]
-            else:
-                res[available_cols_with_query[0]] = name
-                
-            results.append(res)
-
-    # save results to a json file
-    with open(os.path.join(output_folder, f'mann_whitney_u_test_results_{query_type}.json'), 'w') as f:
-        json.dump(results, f, indent=4)
 
+    all_results = []
+    for data_frame, key_cols, results_file in [
+        (mean_df, available_cols_without_query, f'mann_whitney_u_test_results_without_query_{query_type}.json'),
+        (df, available_cols_with_query, f'mann_whitney_u_test_results_{query_type}.json'),
+    ]:
+        tasks = build_component_samples(data_frame, key_cols, 'TOOL', 'TIME_MS')
+        rows = run_statistical_tests(run_mann_whitney_u_tests, tasks, workers)
+
+        results = pd.DataFrame(
+            [key + tuple(values) for key, *values in rows],
+            columns=key_cols + ['COMPONENT_1', 'COMPONENT_2', 'U_STATISTIC', 'P_VALUE'])
+        results['SIGNIFICANT'] = (results['P_VALUE'] <= alpha).astype(str)
+        results = results[['COMPONENT_1', 'COMPONENT_2', 'U_STATISTIC', 'P_VALUE', 'SIGNIFICANT'] + key_cols]
+
+        # save results to a json file
+        with open(os.path.join(output_folder, results_file), 'w') as f:
+            json.dump(results.to_dict(orient='records'), f, indent=4)
+        all_results.append(results)
+
+    results_without_query, results = all_results
     return results, results_without_query
 
 def create_shapiro_wilk_test_table(results: list, query_type: str, output_folder: str, with_query: bool):
@@ -536,15 +432,15 @@ def highlight_each_component_csv(filename: str, plot_config: dict):
     print(f"Highlighted table saved to {styled_filename}")
 
 
-def create_statistical_test_tables(filtered_data, query_type, output_folder, warmup, plot_config):
+def create_statistical_test_tables(filtered_data, query_type, output_folder, warmup, plot_config, workers=1):
     if not filtered_data:
         print(f"No data available for query type: {query_type}. Skipping statistical tests.")
         return
     
     print("------------------- P-Value Test (Shapiro-Wilk) -------------------")
-    shapiro_wilk_test_results, shapiro_wilk_test_results_without_query = check_shapiro_wilk_test(data=filtered_data, warmup=warmup, query_type=query_type, output_folder=output_folder)
+    shapiro_wilk_test_results, shapiro_wilk_test_results_without_query = check_shapiro_wilk_test(data=filtered_data, warmup=warmup, query_type=query_type, output_folder=output_folder, workers=workers)
     print("------------------- Mann-Whitney U Test -------------------")
-    check_Mann_Whitney_U_test(data=filtered_data, warmup=warmup, query_type=query_type, output_folder=output_folder)
+    check_Mann_Whitney_U_test(data=filtered_data, warmup=warmup, query_type=query_type, output_folder=output_folder, workers=workers)
 
     print("Creating statistical test tables in CSV format.")
     filename = create_shapiro_wilk_test_table(shapiro_wilk_test_results, query_type=query_type, output_folder=output_folder, with_query=True)
@@ -559,6 +455,7 @@ if __name__ == "__main__":
     min_repeat = int(os.getenv("COUNT_REPEAT", 200))
     warmup = int(os.getenv("WARMUP", 50))
     mode = os.getenv("MODE", "stats")
+    stats_workers = int(os.getenv("STATS_WORKERS", 1))
 
     csv_file_path = os.getenv("CSV_FILE_PATH")
     if not csv_file_path:
@@ -570,6 +467,7 @@ if __name__ == "__main__":
 
     print(f"CSV file path: {csv_file_path}")
     print(f"Minimum repeat: {min_repeat}")
+    print(f"Stats workers: {stats_workers}")
     with open(plot_config_path, 'r') as f:
         plot_config = json.load(f)
 
@@ -592,8 +490,8 @@ if __name__ == "__main__":
             if query_type == "non-aggregative":
                 print(f"Processing query type: {query_type}")
                 filtered_csv_data = [entry for entry in csv_data if not (entry['AGGREGATIVE'])]
-                create_statistical_test_tables(filtered_csv_data, query_type, main_output_folder, warmup, plot_config)
+                create_statistical_test_tables(filtered_csv_data, query_type, main_output_folder, warmup, plot_config, stats_workers)
             else:
                 print(f"Processing query type: {query_type}")
                 filtered_csv_data = [entry for entry in csv_data if (entry['AGGREGATIVE'])]
-                create_statistical_test_tables(filtered_csv_data, query_type, main_output_folder, warmup, plot_config)
+                create_statistical_test_tables(filtered_csv_data, query_type, main_output_folder, warmup, plot_config, stats_workers)
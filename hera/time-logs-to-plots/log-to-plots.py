@@ -2,6 +2,10 @@ import json
 import re
 import os
 
+from benchmark_logs import filter_groups, get_log_compression, open_log_file, store_data_to_parquet
+from benchmark_stats import (build_samples, build_component_samples, run_shapiro_wilk_tests,
+                              run_mann_whitney_u_tests, run_statistical_tests, shapiro_wilk_results_table)
+
 
 # --- Utility Functions ---
 
@@ -28,237 +32,451 @@ def get_component_name(component: str):
     return '-'.join(component_parts)
 
 
-def extract_log_info(log_file_path: str, queries_info: str, min_count_version: int, min_count_component: int, min_repeat: int):
+LOG_PATTERN = re.compile(r'\{"component":"(?P<component>[^"]+)","query":"(?P<query>[^"]+)","try":"(?P<try>[^"]+)","duration":"(?P<duration>[^"]+?)(?:ms)?","version":"(?P<version>[^"]+)","product":"(?P<product>[^"]+)","step":"(?P<step>[^"]+)","time":"(?P<time>[^"]+)"\}')
+
+# Size of the blocks read from the log file, this bounds the memory used by the raw text
+# and the matched tuples while parsing
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Must be bumped whenever the parsed columns change, so that cached Parquet files are invalidated
+PARSER_VERSION = 1
+
+# Must be bumped whenever render_plot changes, so that the plots recorded in the manifest are redrawn
+RENDERER_VERSION = 1
+
+
+def get_query_name(query: str):
     """
-    Extracts log information from a log file and filters it based on repeat, version, and component counts.
+    Extracts the query name from the query file path (./converg/converg-9.rq -> query-9).
     """
-    # Définir une expression régulière pour correspondre au format du log
-    log_pattern = r'\{"component":"(?P<component>[^"]+)","query":"(?P<query>[^"]+)","try":"(?P<try>[^"]+)","duration":"(?P<duration>[^"]+)","version":"(?P<version>[^"]+)","product":"(?P<product>[^"]+)","step":"(?P<step>[^"]+)","time":"(?P<time>[^"]+)"\}'
-    extracted_data = []
+    return f"query-{query.split('-')[-1].split('.')[0]}"
 
-    with open(queries_info, 'r') as f:
-        queries_configuration = json.load(f)
 
-    # Lire le fichier de logs
-    with open(log_file_path, 'r') as file:
-        for line in file:
-            # Chercher les correspondances avec le pattern
-            match = re.search(log_pattern, line)
-            if match:
-                query_name = f"query-{match.group('query').split('-')[-1].split('.')[0]}"
-                query_info = queries_configuration.get(query_name)
-
-                # Extraire COMPONENT, DURATION, et FILE
-                component = match.group('component')
-                # keep only the number of the query
-                query = query_name.replace("query-", "q-")
-                nb_try = int(match.group('try'))
-                version_conf = int(match.group('version'))
-                step_conf = int(match.group('step'))
-                # Convertir le temps en millisecondes
-                duration_ms = int(match.group('duration').replace("ms", ""))
-                time_unix = int(match.group('time'))
-
-                extracted_data.append({
-                    "VERSION": version_conf,
-                    "STEP": step_conf,
-                    "COMPONENT": component,
-                    "DURATION (ms)": duration_ms,
-                    "QUERY": query,
-                    "TRY": nb_try,
-                    "TIME": time_unix,
-                    "COMPONENT_NAME": get_component_name(component),
-                    "AGGREGATIVE": query_info["aggregative"] if query_info else None
-                })
+def parse_int_column(values: tuple, dtype, low_cardinality: bool = False):
+    """
+    Converts a column of numeric strings to a typed NumPy array.
+    Low cardinality columns (VERSION, STEP, TRY) are factorized first so that
+    only the distinct values are converted.
+    """
+    import numpy as np
+    import pandas as pd
 
-    extracted_data = remove_all_with_less_than_repeat(extracted_data, min_repeat)
-    print(f"After remove_all_with_less_than_repeat: {len(extracted_data)}")
-    extracted_data = remove_all_with_less_than_count_version(extracted_data, min_count_version)
-    print(f"After remove_all_with_less_than_count_version: {len(extracted_data)}")
-    extracted_data = remove_all_with_less_than_count_component(extracted_data, min_count_component)
-    print(f"After remove_all_with_less_than_count_component: {len(extracted_data)}")
-    return extracted_data
+    if low_cardinality:
+        codes, uniques = pd.factorize(np.array(values, dtype=object))
+        return np.fromiter(map(int, uniques), dtype=dtype, count=len(uniques))[codes]
+    return np.fromiter(map(int, values), dtype=dtype, count=len(values))
 
 
-def remove_all_with_less_than_repeat(data, repeat=200):
+def parse_log_chunk(text: str):
     """
-    Remove entries where the max TRY for (VERSION, STEP, QUERY) is less than repeat.
+    Parses a block of log lines into a columnar DataFrame.
+    Numeric fields are stored as typed NumPy arrays and textual fields as categoricals.
     """
+    import numpy as np
     import pandas as pd
-    df = pd.DataFrame(data)
-    max_lower_than_repeat = []
-    for name, group in df.groupby(['VERSION', 'STEP', 'QUERY']):
-        if group['TRY'].max() < repeat:
-            max_lower_than_repeat.append(name)
-    for version, step, query in max_lower_than_repeat:
-        df = df[~((df['VERSION'] == version) & (df['STEP'] == step) & (df['QUERY'] == query))]
-    return df.to_dict(orient='records')
 
+    rows = LOG_PATTERN.findall(text)
+    if not rows:
+        return None
+
+    component, query, nb_try, duration, version, _, step, time_unix = zip(*rows)
 
-def remove_all_with_less_than_count_version(data, count=4):
+    return pd.DataFrame({
+        "VERSION": parse_int_column(version, np.int32, low_cardinality=True),
+        "STEP": parse_int_column(step, np.int32, low_cardinality=True),
+        "COMPONENT": pd.Categorical(component),
+        "DURATION (ms)": parse_int_column(duration, np.int64),
+        "QUERY": pd.Categorical(query),
+        "TRY": parse_int_column(nb_try, np.int32, low_cardinality=True),
+        "TIME": parse_int_column(time_unix, np.int64),
+    })
+
+
+def concat_log_frames(frames: list):
     """
-    Remove entries where the count of unique versions for (STEP, QUERY, COMPONENT_NAME) is less than count.
+    Concatenates columnar chunks, merging the categories of the categorical columns
+    instead of falling back to object columns.
     """
+    import numpy as np
     import pandas as pd
-    df = pd.DataFrame(data)
-    version_counts = df.groupby(['STEP', 'QUERY', 'COMPONENT_NAME'])['VERSION'].nunique().reset_index()
-    version_counts.rename(columns={'VERSION': 'COUNT_VERSION'}, inplace=True)
-    groups_to_remove = version_counts[version_counts['COUNT_VERSION'] < count]
-    for _, row in groups_to_remove.iterrows():
-        step, query, _, _ = row
-        df = df[~((df['STEP'] == step) & (df['QUERY'] == query))]
-    return df.to_dict(orient='records')
+    from pandas.api.types import union_categoricals
+
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        return None
+    if len(frames) == 1:
+        return frames[0]
+
+    columns = {}
+    for column, dtype in frames[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            columns[column] = union_categoricals([frame[column] for frame in frames], sort_categories=True)
+        else:
+            columns[column] = np.concatenate([frame[column].to_numpy() for frame in frames])
+    return pd.DataFrame(columns)
 
 
-def remove_all_with_less_than_count_component(data, count=3):
+def is_compressed_log(log_file_path: str):
+    return get_log_compression(log_file_path) is not None
+
+
+def parse_log_range(log_file_path: str, start: int, end: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Parses the lines of the log file between the byte offsets start and end (the end of the file if None).
+    The range is read in blocks of chunk_size bytes cut on the last newline, so that
+    no line is split between two blocks.
+    """
+    chunks = []
+    remainder = b""
+
+    with open_log_file(log_file_path) as file:
+        if start:
+            file.seek(start)
+        position = start
+        while end is None or position < end:
+            block = file.read(chunk_size if end is None else min(chunk_size, end - position))
+            if not block:
+                break
+            position += len(block)
+            block = remainder + block
+            if end is None or position < end:
+                cut = block.rfind(b"\n") + 1
+                block, remainder = block[:cut], block[cut:]
+            else:
+                remainder = b""
+            chunks.append(parse_log_chunk(block.decode("utf-8", errors="replace")))
+
+        if remainder:
+            chunks.append(parse_log_chunk(remainder.decode("utf-8", errors="replace")))
+
+    return concat_log_frames(chunks)
+
+
+def map_categories(categorical, function):
     """
-    Remove entries where the count of unique components for (STEP, QUERY, VERSION) is less than count.
+    Applies function to the categories of a categorical (instead of every row)
+    and returns the resulting categorical.
     """
+    import numpy as np
     import pandas as pd
-    df = pd.DataFrame(data)
-    component_counts = df.groupby(['STEP', 'QUERY', 'VERSION'])['COMPONENT_NAME'].nunique().reset_index()
-    component_counts.rename(columns={'COMPONENT_NAME': 'COUNT_COMPONENT'}, inplace=True)
-    groups_to_remove = component_counts[component_counts['COUNT_COMPONENT'] < count]
-    for _, row in groups_to_remove.iterrows():
-        step, query, version, _ = row
-        df = df[~((df['STEP'] == step) & (df['QUERY'] == query) & (df['VERSION'] == version))]
-    return df.to_dict(orient='records')
 
+    values = [function(category) for category in categorical.categories]
+    categories, inverse = np.unique(np.array(values, dtype=object), return_inverse=True)
+    return pd.Categorical.from_codes(inverse[categorical.codes], categories=categories)
+
+
+def split_log_ranges(log_file_path: str, count: int):
+    """
+    Splits the log file into (at most) count byte ranges of similar size.
+    Every boundary is moved forward to the beginning of the next line.
+    """
+    size = os.path.getsize(log_file_path)
+    boundaries = [0]
+
+    with open(log_file_path, 'rb') as file:
+        for i in range(1, count):
+            offset = max(size * i // count, boundaries[-1])
+            file.seek(offset)
+            file.readline()
+            boundary = min(file.tell(), size)
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+
+    if boundaries[-1] < size or size == 0:
+        boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def parse_log_file(log_file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1):
+    """
+    Parses the whole log file.
+    With more than one worker, the file is split into byte ranges aligned on newlines that are
+    parsed in a process pool; the columnar results are concatenated in file order.
+    Compressed logs cannot be split and are streamed by a single process.
+    """
+    if is_compressed_log(log_file_path):
+        return parse_log_range(log_file_path, 0, None, chunk_size)
 
-def whisker_duration_per_component_query_config(data, scale="linear", limit=None):
+    ranges = split_log_ranges(log_file_path, workers)
+    if workers <= 1 or len(ranges) <= 1:
+        return parse_log_range(log_file_path, 0, os.path.getsize(log_file_path), chunk_size)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    print(f"Parsing {log_file_path} in {len(ranges)} ranges with {workers} workers")
+    starts, ends = zip(*ranges)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        frames = list(executor.map(parse_log_range, [log_file_path] * len(ranges), starts, ends, [chunk_size] * len(ranges)))
+
+    return concat_log_frames(frames)
+
+
+def read_log_frame(log_file_path: str, queries_info: str, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1):
+    """
+    Streams the log file into a columnar DataFrame.
+    COMPONENT, QUERY and COMPONENT_NAME are categoricals: derived columns are computed
+    once per category instead of once per line.
+    """
+    import numpy as np
     import pandas as pd
-    import matplotlib.pyplot as plt
-    import os
 
-    print("Starting to create boxplots for duration per component and query configuration.")
+    with open(queries_info, 'r') as f:
+        queries_configuration = json.load(f)
 
-    grouping_cols = ['VERSION', 'STEP', 'QUERY']
+    df = parse_log_file(log_file_path, chunk_size, workers)
+    if df is None:
+        return pd.DataFrame(columns=["VERSION", "STEP", "COMPONENT", "DURATION (ms)", "QUERY", "TRY", "TIME", "COMPONENT_NAME", "AGGREGATIVE"])
+
+    query_names = map_categories(df["QUERY"].array, get_query_name)
+    aggregative = [
+        queries_configuration[query_name]["aggregative"] if queries_configuration.get(query_name) else None
+        for query_name in query_names.categories
+    ]
+
+    # keep only the number of the query
+    df["QUERY"] = query_names.rename_categories(lambda query_name: query_name.replace("query-", "q-"))
+    df["COMPONENT_NAME"] = map_categories(df["COMPONENT"].array, get_component_name)
+    df["AGGREGATIVE"] = np.array(aggregative, dtype=object)[query_names.codes]
+
+    print(f"Parsed {len(df)} log records from {log_file_path}")
+    return df
+
+
+def get_files_hash(*file_paths: str):
+    """
+    Computes a SHA-256 digest of the content of the given files.
+    """
+    import hashlib
+
+    digest = hashlib.sha256()
+    for file_path in file_paths:
+        with open(file_path, 'rb') as f:
+            digest.update(hashlib.file_digest(f, 'sha256').digest())
+    return digest.hexdigest()
+
+
+def read_cached_log_frame(log_file_path: str, queries_info: str, cache_dir: str, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1):
+    """
+    Returns the parsed log records, using a Parquet cache keyed by the content of the log file,
+    the queries configuration and the parser version.
+    On a cache hit the Parquet file is memory-mapped instead of re-parsing the log file.
+    The cache only helps local runs, which keep cache_dir between runs: a workflow pod starts
+    without it and parses the log file again, so the workflows disable it (CACHE_DIR="").
+    """
+    import pandas as pd
+
+    if not cache_dir:
+        return read_log_frame(log_file_path, queries_info, chunk_size, workers)
+
+    files_hash = get_files_hash(log_file_path, queries_info)
+    cache_path = os.path.join(cache_dir, f"log_data-{files_hash[:16]}-v{PARSER_VERSION}.parquet")
+
+    if os.path.exists(cache_path):
+        print(f"Loading parsed log records from cache {cache_path}")
+        return pd.read_parquet(cache_path, memory_map=True)
+
+    df = read_log_frame(log_file_path, queries_info, chunk_size, workers)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    store_data_to_parquet(data=df, file_path=cache_path)
+    print(f"Parsed log records cached in {cache_path}")
+    return df
+
+
+def extract_log_info(log_file_path: str, queries_info: str, min_count_version: int, min_count_component: int, min_repeat: int, chunk_size: int = DEFAULT_CHUNK_SIZE, cache_dir: str = "cache", workers: int = 1):
+    """
+    Extracts log information from a log file and filters it based on repeat, version, and component counts.
+    """
+    extracted_data = read_cached_log_frame(log_file_path, queries_info, cache_dir, chunk_size, workers)
+
+    return filter_groups(extracted_data, [
+        {
+            # Remove entries where the max TRY for (VERSION, STEP, QUERY) is less than repeat.
+            "name": "remove_all_with_less_than_repeat",
+            "group_by": ['VERSION', 'STEP', 'QUERY'],
+            "column": 'TRY',
+            "aggregate": 'max',
+            "min_threshold": min_repeat,
+        },
+        {
+            # Remove entries of (STEP, QUERY) when the count of unique versions of one of its components is less than count.
+            "name": "remove_all_with_less_than_count_version",
+            "group_by": ['STEP', 'QUERY', 'COMPONENT_NAME'],
+            "column": 'VERSION',
+            "aggregate": 'nunique',
+            "min_threshold": min_count_version,
+            "drop_by": ['STEP', 'QUERY'],
+        },
+        {
+            # Remove entries where the count of unique components for (STEP, QUERY, VERSION) is less than count.
+            "name": "remove_all_with_less_than_count_component",
+            "group_by": ['STEP', 'QUERY', 'VERSION'],
+            "column": 'COMPONENT_NAME',
+            "aggregate": 'nunique',
+            "min_threshold": min_count_component,
+        },
+    ])
+
+
+def compute_box_statistics(data, limit=None, whis=1.5):
+    """
+    Computes the box-plot statistics of the durations of every (VERSION, STEP, QUERY, COMPONENT_NAME)
+    group in a single groupby pass: quartiles, median, whiskers at whis * IQR and outliers,
+    following the conventions of matplotlib.cbook.boxplot_stats.
+    Returns a DataFrame indexed by the group keys with the columns q1, med, q3, whislo, whishi, fliers.
+    """
+    import numpy as np
+    import pandas as pd
+
+    grouping_cols = ['VERSION', 'STEP', 'QUERY', 'COMPONENT_NAME']
     df = pd.DataFrame(data)
     if limit is not None:
         df = df[df['TRY'] >= limit]
+
+    durations = df['DURATION (ms)']
+    grouped = durations.groupby([df[col] for col in grouping_cols], observed=True)
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['q1', 'med', 'q3']
+
+    # group number of every row, in the order of the rows of stats
+    group_ids = grouped.ngroup().to_numpy()
+    values = durations.to_numpy()
+    q1 = stats['q1'].to_numpy()
+    q3 = stats['q3'].to_numpy()
+    iqr = q3 - q1
+
+    # the whiskers reach the most extreme values within whis * IQR of the box, never inside the box
+    values_by_group = pd.Series(values, dtype='float64')
+    whishi = values_by_group.where(values <= (q3 + whis * iqr)[group_ids]).groupby(group_ids).max()
+    whishi = whishi.reindex(range(len(stats))).to_numpy()
+    whishi = np.where(np.isnan(whishi) | (whishi < q3), q3, whishi)
+    whislo = values_by_group.where(values >= (q1 - whis * iqr)[group_ids]).groupby(group_ids).min()
+    whislo = whislo.reindex(range(len(stats))).to_numpy()
+    whislo = np.where(np.isnan(whislo) | (whislo > q1), q1, whislo)
+    stats['whislo'] = whislo
+    stats['whishi'] = whishi
+
+    # the outliers keep the order of the rows within their group
+    is_flier = (values < whislo[group_ids]) | (values > whishi[group_ids])
+    flier_ids = group_ids[is_flier]
+    order = np.argsort(flier_ids, kind='stable')
+    boundaries = np.searchsorted(flier_ids[order], np.arange(len(stats) + 1))
+    flier_values = values[is_flier][order]
+    stats['fliers'] = [flier_values[start:end] for start, end in zip(boundaries[:-1], boundaries[1:])]
+
+    return stats
+
+
+def whisker_duration_per_component_query_config(box_stats, scale="linear"):
+    """
+    Returns the specifications of the duration boxplots, one per (VERSION, STEP, QUERY),
+    drawn from the statistics computed by compute_box_statistics.
+    """
+    import os
+
+    print("Starting to create boxplots for duration per component and query configuration.")
+
+    grouping_cols = ['VERSION', 'STEP', 'QUERY']
     output_dir = 'plots/whiskers'
     os.makedirs(output_dir, exist_ok=True)
-    grouped_data = df.groupby(grouping_cols)
+    grouped_data = box_stats.groupby(level=grouping_cols, observed=True)
     print(f"Found {len(grouped_data)} groups based on {grouping_cols}.")
 
+    specs = []
     for name, group in grouped_data:
         # Extract group keys
         version, step, query = name
         grouped_output_dir = f"{output_dir}/{scale}/v-{version}-s{step}"
-        os.makedirs(grouped_output_dir, exist_ok=True)
-
-        fig, ax = plt.subplots(figsize=(12, 6))
 
-        # Get unique components and their corresponding durations for the boxplot
-        components = sorted(group['COMPONENT_NAME'].unique(), key=lambda x: (x.startswith(
+        # Get the statistics of each component for the boxplot
+        group = group.droplevel(grouping_cols)
+        components = sorted(group.index, key=lambda x: (x.startswith(
             'blazegraph'), x.startswith('jena'), x.startswith('quaque-flat'), x.startswith('quaque-condensed')), reverse=True)
-        data_to_plot = [group[group['COMPONENT_NAME'] == comp]
-                        ['DURATION (ms)'] for comp in components]
 
-        # Create the boxplot
-        bp = ax.boxplot(data_to_plot, patch_artist=True,
-                        tick_labels=components)  # Added labels
+        boxes = []
+        colors = []
+        for comp in components:
+            stats = group.loc[comp]
+            boxes.append({
+                "label": comp,
+                "med": float(stats['med']),
+                "q1": float(stats['q1']),
+                "q3": float(stats['q3']),
+                "whislo": float(stats['whislo']),
+                "whishi": float(stats['whishi']),
+                "fliers": stats['fliers'],
+            })
 
-        # Add colors to boxes for better distinction
-        for patch, comp in zip(bp['boxes'], components):
+            # Add colors to boxes for better distinction
             if comp.startswith('blazegraph'):
-                patch.set_facecolor('blue')
+                colors.append('blue')
             elif comp.startswith('jena'):
-                patch.set_facecolor('purple')
+                colors.append('purple')
             elif comp.startswith('quaque-flat'):
-                patch.set_facecolor('orange')
+                colors.append('orange')
             else:
-                patch.set_facecolor('green')
-
-        # Add median lines color
-        for median in bp['medians']:
-            median.set(color='red', linewidth=2)
-
-        # Improve layout and labels
-        ax.set_title(
-            f'Duration Distribution\nVersion={version}, Step={step}, Query={query}')
-        ax.set_ylabel('Duration (ms)')
-        ax.set_xlabel('Component')
-
-        # Set y-axis scale if requested
-        if scale == "log":
-            ax.set_yscale("log")
-            ax.set_ylabel('Duration Log(ms)')
-
-        # ax.tick_params(axis='x', rotation=45) # Rotate x-axis labels if they overlap
-        ax.grid(True, linestyle='--', alpha=0.6)  # Add grid lines
+                colors.append('green')
 
         # --- Create a safe filename for the plot ---
         safe_query = sanitize_filename(query)
-        filepath = os.path.join(
-            grouped_output_dir, f"whisker_duration_{safe_query}.png")
 
-        plt.savefig(filepath, dpi=300)
-        plt.close(fig)
+        specs.append({
+            "path": os.path.join(grouped_output_dir, f"whisker_duration_{safe_query}.png"),
+            "title": f'Duration Distribution\nVersion={version}, Step={step}, Query={query}',
+            "xlabel": 'Component',
+            "ylabel": 'Duration Log(ms)' if scale == "log" else 'Duration (ms)',
+            "scale": scale,
+            "grid": {"linestyle": '--', "alpha": 0.6},
+            "boxes": {"stats": boxes, "colors": colors},
+        })
 
+    return specs
 
-def create_duration_median_plot(data, scale="linear", limit=None):
-    import pandas as pd
-    import matplotlib.pyplot as plt
-    
+
+def create_duration_median_plot(box_stats, scale="linear"):
+    """
+    Returns the specifications of the median duration plots, one per (STEP, QUERY),
+    drawn from the medians computed by compute_box_statistics.
+    """
     print("Starting to create median duration plots.")
 
-    # Read the uploaded JSON file into a pandas DataFrame
-    # Use the file handle provided by the environment
-    df = pd.DataFrame(data)
-    if limit is not None:
-        df = df[df['TRY'] >= limit]
     output_dir = f'plots/median_duration/{scale}'
     os.makedirs(output_dir, exist_ok=True)
 
     # Define the columns that identify a unique configuration
     config_cols = ['STEP', 'QUERY', 'COMPONENT_NAME']
 
-    # --- Step 1: Calculate median duration for each version within each configuration ---
-    median_duration_per_version = df.groupby(
-        config_cols + ['VERSION'])['DURATION (ms)'].median().reset_index()
-    median_duration_per_version.rename(
-        columns={'DURATION (ms)': 'MEDIAN_DURATION_CONFIG'}, inplace=True)
+    # --- Step 1: Median duration for each version within each configuration ---
+    median_duration_per_version = box_stats['med'].rename('MEDIAN_DURATION_CONFIG').reset_index()
 
     # --- Step 2: Prepare for plotting ---
-    # Get unique configurations
-    unique_configs = median_duration_per_version[config_cols].drop_duplicates().values.tolist()
-    num_unique_configs = len(unique_configs)
+    grouped_data = median_duration_per_version.groupby(config_cols[:2], observed=True)
+    num_unique_configs = median_duration_per_version[config_cols].drop_duplicates().shape[0]
     print(
         f"Found {num_unique_configs} unique configurations based on {config_cols}.")
 
+    specs = []
     if num_unique_configs == 0:
         print("No data or configurations found to plot.")
     else:
-        # associate step, query to list of components
-        config_to_components = {}
-        for config in unique_configs:
-            step, query, component = config
-            if (step, query) not in config_to_components:
-                config_to_components[(step, query)] = []
-            config_to_components[(step, query)].append(component)
-
-        # --- Step 3: Generate plots ---
-        for (step, query), components in config_to_components.items():
-            fig, ax = plt.subplots(figsize=(12, 6))
+        # --- Step 3: Generate plot specifications ---
+        for (step, query), group in grouped_data:
+            series_per_component = {
+                component: plot_data.sort_values(by='VERSION')
+                for component, plot_data in group.groupby('COMPONENT_NAME', observed=True)
+            }
 
             components = sorted(
-                components,
+                series_per_component,
                 key=lambda x:
                     (x.startswith('blazegraph'), x.startswith('jena'), x.startswith(
                         'quaque-flat'), x.startswith('quaque-condensed')),
                     reverse=True
             )
 
-            # Filter data for the current configuration
+            lines = []
             for component in components:
-                # Filter the DataFrame for the current configuration
-                config_cols = ['STEP', 'QUERY', 'COMPONENT_NAME']
-                # Create a tuple for the current configuration
-                config = [step, query, component]
-                config_filter = (median_duration_per_version[config_cols] == pd.Series(
-                    config, index=config_cols)).all(axis=1)
-                plot_data = median_duration_per_version[config_filter].sort_values(by='VERSION')
+                plot_data = series_per_component[component]
 
                 # Assign color based on component name
                 if component.startswith('blazegraph'):
@@ -270,32 +488,26 @@ def create_duration_median_plot(data, scale="linear", limit=None):
                 else:
                     color = 'green'
 
-                ax.plot(plot_data['VERSION'], plot_data['MEDIAN_DURATION_CONFIG'],
-                        marker='o', linestyle='-', label=component, color=color)
-
-            # Set title and labels
-            # Create a multi-line title for better readability
-            title_str = f"Step: {step}, Query: {query}"
-            ax.set_title(title_str, fontsize=9)
-            ax.set_xlabel("Version")
-            ax.set_ylabel("Median Duration (ms)")
-            if scale == "log":
-                ax.set_yscale("log")
-                ax.set_ylabel("Median Duration Log(ms)")
-
-            ax.grid(True)
-            # Add legend to the plot
-            ax.legend(title='Component', loc='upper left')
+                lines.append({
+                    "x": plot_data['VERSION'].to_numpy(),
+                    "y": plot_data['MEDIAN_DURATION_CONFIG'].to_numpy(),
+                    "label": component,
+                    "color": color,
+                })
 
-            # Ensure x-axis ticks are integers if versions are integers
-            from matplotlib.ticker import MaxNLocator
-            ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+            specs.append({
+                "path": f"{output_dir}/{step}/duration_median_{query}.png",
+                # Create a multi-line title for better readability
+                "title": f"Step: {step}, Query: {query}",
+                "title_fontsize": 9,
+                "xlabel": "Version",
+                "ylabel": "Median Duration Log(ms)" if scale == "log" else "Median Duration (ms)",
+                "scale": scale,
+                "lines": lines,
+                "legend_loc": 'upper left',
+            })
 
-            # --- Create a safe filename for the plot ---
-            os.makedirs(f"{output_dir}/{step}", exist_ok=True)
-            filepath = f"{output_dir}/{step}/duration_median_{query}.png"
-            plt.savefig(filepath, dpi=300)
-            plt.close(fig)
+    return specs
 
 
 def create_version_normalized_duration_plot(data, limit=None):
@@ -313,9 +525,11 @@ def create_version_normalized_duration_plot(data, limit=None):
                                  'COMPONENT_NAME', 'VERSION', 'DURATION (ms)', 'TRY'.
         limit (int, optional): If provided, only include rows where 'TRY' >= limit.
                                Defaults to None.
+
+    Returns:
+        list: The plot specifications to render with render_plots.
     """
     import pandas as pd
-    import matplotlib.pyplot as plt
     import os  # Import os module
     
     print("Starting to create version normalized duration plots.")
@@ -331,26 +545,26 @@ def create_version_normalized_duration_plot(data, limit=None):
     if not all(col in df.columns for col in required_cols):
         missing = [col for col in required_cols if col not in df.columns]
         print(f"Error: Missing required columns: {missing}")
-        return  # Exit if essential columns are missing
+        return []  # Exit if essential columns are missing
 
     output_dir = 'plots/normalized_duration'  # Changed output directory name
     os.makedirs(output_dir, exist_ok=True)
 
     # --- Step 1: Calculate sum of durations for each version within each config ---
     duration_per_version = df.groupby(
-        config_cols + ['VERSION']
+        config_cols + ['VERSION'], observed=True
     )['DURATION (ms)'].sum().reset_index()
     duration_per_version.rename(
         columns={'DURATION (ms)': 'SUM_DURATION_MS'}, inplace=True)
 
     if duration_per_version.empty:
         print("No data remaining after grouping. Cannot generate plots.")
-        return
+        return []
 
     # --- Step 2: Find the duration of the lowest version for each config ---
     # Get the index of the row with the minimum version for each group
     min_version_indices = duration_per_version.loc[duration_per_version.groupby(
-        config_cols)['VERSION'].idxmin()]
+        config_cols, observed=True)['VERSION'].idxmin()]
     # Select relevant columns and rename the duration column to represent the normalization factor
     normalization_factors = min_version_indices[config_cols + [
         'SUM_DURATION_MS']].copy()
@@ -376,13 +590,13 @@ def create_version_normalized_duration_plot(data, limit=None):
     print(
         f"Found {num_plot_configs} unique (STEP, QUERY) combinations for plotting.")
 
+    specs = []
     if num_plot_configs == 0:
         print("No configurations found to plot.")
     else:
-        # --- Step 6: Generate plots ---
+        # --- Step 6: Generate plot specifications ---
         for plot_config in unique_configs_for_plotting:
             step, query = plot_config
-            fig, ax = plt.subplots(figsize=(12, 6))
 
             # Filter results_df for the current Step, Query
             plot_group_data = results_df[
@@ -398,6 +612,7 @@ def create_version_normalized_duration_plot(data, limit=None):
                     'quaque-flat'), not x.startswith('quaque-condensed'))
             )
 
+            lines = []
             # Plot data for each component in the current group
             for component in components:
                 # Filter the group data for the current component
@@ -421,44 +636,178 @@ def create_version_normalized_duration_plot(data, limit=None):
                     color = 'red'
 
                 # Plot NORMALIZED_DURATION vs VERSION
-                ax.plot(component_data['VERSION'], component_data['NORMALIZED_DURATION'],
-                        marker='o', linestyle='-', label=component, color=color)
-
-            # --- Plot Customization ---
-            title_str = f"Step: {step}: Query: {query}"
-            ax.set_title(title_str, fontsize=11)  # Adjusted font size slightly
-            ax.set_xlabel("Version")
-            ax.set_ylabel("Normalized Duration (ms)")
-            if scale == "log":
-                ax.set_yscale("log")
-                ax.set_ylabel("Normalized Duration Log(ms)")
-
-            ax.grid(True)
-
-            # Add legend only if there are labels to show
-            if ax.get_legend_handles_labels()[0]:
-                # Changed location to 'best'
-                ax.legend(title='Component', loc='best')
-
-            # Ensure x-axis ticks are integers
-            # Ensure x-axis ticks are integers
-            from matplotlib.ticker import MaxNLocator
-            ax.xaxis.set_major_locator(MaxNLocator(integer=True))
-
-            # Set y-axis minimum to 0 for better interpretation, maybe add some padding
-            ax.set_ylim(bottom=0)
-
-            # --- Saving the plot ---
-            # Define subdirectory
-            step_prod_dir = f"{output_dir}/{step}"
-            # Create subdirectory if needed
-            os.makedirs(step_prod_dir, exist_ok=True)
+                lines.append({
+                    "x": component_data['VERSION'].to_numpy(),
+                    "y": component_data['NORMALIZED_DURATION'].to_numpy(),
+                    "label": component,
+                    "color": color,
+                })
+
             # Sanitize query part of filename (replace non-alphanumeric with underscore)
             safe_query = "".join(c if c.isalnum() else "_" for c in str(query))
-            filepath = f"{step_prod_dir}/normalized_duration_{safe_query}.png"
 
-            plt.savefig(filepath, dpi=300)  # Use bbox_inches
-            plt.close(fig)  # Close figure to free memory
+            specs.append({
+                "path": f"{output_dir}/{step}/normalized_duration_{safe_query}.png",
+                "title": f"Step: {step}: Query: {query}",
+                "title_fontsize": 11,
+                "xlabel": "Version",
+                "ylabel": "Normalized Duration Log(ms)" if scale == "log" else "Normalized Duration (ms)",
+                "scale": scale,
+                "lines": lines,
+                "legend_loc": 'best',
+                # Set y-axis minimum to 0 for better interpretation
+                "ylim_bottom": 0,
+            })
+
+    return specs
+
+
+def render_plot(spec: dict):
+    """
+    Draws and saves one plot specification, returns the rendering time in seconds.
+    A specification holds either "lines" (one series per component) or "boxes" (one box per component).
+    """
+    import time
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import MaxNLocator
+
+    start = time.perf_counter()
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    if "boxes" in spec:
+        boxes = spec["boxes"]
+        bp = ax.bxp(boxes["stats"], patch_artist=True)
+        for patch, color in zip(bp['boxes'], boxes["colors"]):
+            patch.set_facecolor(color)
+        for median in bp['medians']:
+            median.set(color='red', linewidth=2)
+
+    for line in spec.get("lines", []):
+        ax.plot(line["x"], line["y"], marker='o', linestyle='-', label=line["label"], color=line["color"])
+
+    if "title_fontsize" in spec:
+        ax.set_title(spec["title"], fontsize=spec["title_fontsize"])
+    else:
+        ax.set_title(spec["title"])
+    ax.set_xlabel(spec["xlabel"])
+    ax.set_ylabel(spec["ylabel"])
+    if spec["scale"] == "log":
+        ax.set_yscale("log")
+
+    ax.grid(True, **spec.get("grid", {}))
+
+    if "lines" in spec:
+        # Add legend only if there are labels to show
+        if ax.get_legend_handles_labels()[0]:
+            ax.legend(title='Component', loc=spec["legend_loc"])
+        # Ensure x-axis ticks are integers
+        ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+
+    if "ylim_bottom" in spec:
+        ax.set_ylim(bottom=spec["ylim_bottom"])
+
+    os.makedirs(os.path.dirname(spec["path"]), exist_ok=True)
+    plt.savefig(spec["path"], dpi=300)
+    plt.close(fig)
+    return time.perf_counter() - start
+
+
+def get_spec_fingerprint(spec: dict):
+    """
+    Computes a SHA-256 digest of a plot specification, its series and the renderer version.
+    """
+    import hashlib
+    import numpy as np
+    import matplotlib
+
+    digest = hashlib.sha256(f"renderer-v{RENDERER_VERSION}-matplotlib-{matplotlib.__version__}".encode())
+
+    def update(value):
+        if isinstance(value, dict):
+            for key in sorted(value):
+                digest.update(f"{key}=".encode())
+                update(value[key])
+        elif isinstance(value, (list, tuple)):
+            digest.update(b"[")
+            for item in value:
+                update(item)
+            digest.update(b"]")
+        elif isinstance(value, np.ndarray):
+            digest.update(f"{value.dtype}{value.shape}".encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        else:
+            digest.update(repr(value).encode())
+        digest.update(b";")
+
+    update(spec)
+    return digest.hexdigest()
+
+
+def render_plots(specs: list, workers: int = 1, timings_path: str = "plots/render_timings.csv", manifest_path: str = "plots/manifest.json"):
+    """
+    Renders the plot specifications, in a process pool when workers > 1.
+    The fingerprint of every rendered plot is recorded in manifest_path: a plot that already
+    exists with the same fingerprint is not rendered again. This only helps local runs, which keep
+    the plots directory between runs: a workflow pod starts without it and renders every plot.
+    The rendering time of every rendered plot is merged into timings_path.
+    """
+    import csv
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    manifest = {}
+    if manifest_path and os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+
+    fingerprints = [get_spec_fingerprint(spec) for spec in specs]
+    outdated = [
+        (spec, fingerprint) for spec, fingerprint in zip(specs, fingerprints)
+        if manifest.get(spec["path"]) != fingerprint or not os.path.exists(spec["path"])
+    ]
+    print(f"{len(specs) - len(outdated)} plots are up to date")
+
+    specs = [spec for spec, _ in outdated]
+    print(f"Rendering {len(specs)} plots with {workers} workers")
+    start = time.perf_counter()
+
+    if workers > 1 and len(specs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            durations = list(executor.map(render_plot, specs, chunksize=max(1, len(specs) // (workers * 4))))
+    else:
+        durations = [render_plot(spec) for spec in specs]
+
+    if manifest_path:
+        for spec, fingerprint in outdated:
+            manifest[spec["path"]] = fingerprint
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        # write to a temporary file first so that an interrupted run never leaves a truncated manifest behind
+        with open(f"{manifest_path}.tmp", 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    # the plots that are up to date keep the rendering time of the run that drew them
+    timings = {}
+    if os.path.exists(timings_path):
+        with open(timings_path, 'r', newline='') as f:
+            timings = {row["PATH"]: row["SECONDS"] for row in csv.DictReader(f)}
+    for spec, duration in zip(specs, durations):
+        timings[spec["path"]] = f"{duration:.3f}"
+    os.makedirs(os.path.dirname(timings_path), exist_ok=True)
+    with open(f"{timings_path}.tmp", 'w', newline='') as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+        writer.writerow(["PATH", "SECONDS"])
+        writer.writerows((path, float(seconds)) for path, seconds in sorted(timings.items()))
+    os.replace(f"{timings_path}.tmp", timings_path)
+
+    if durations:
+        slowest = max(range(len(durations)), key=durations.__getitem__)
+        print(f"Rendered {len(specs)} plots in {time.perf_counter() - start:.1f}s "
+              f"(cpu {sum(durations):.1f}s, mean {sum(durations) / len(durations):.3f}s, "
+              f"slowest {durations[slowest]:.3f}s for {specs[slowest]['path']})")
+    print(f"Per-plot rendering times saved to {timings_path}")
 
 
 def sanitize_filename(name, max_len=100):
@@ -473,182 +822,80 @@ def sanitize_filename(name, max_len=100):
     return name
 
 
-def store_data_to_json(data, file_path):
-    """
-    Store the data to a json file
-    Args:
-        data (list): List of dictionaries
-        file_path (str): Path to the json file
-    """
-    with open(file_path, 'w') as f:
-        json.dump(data, f)
-
-def check_shapiro_wilk_test(data: list, warmup: int, query_type: str, output_folder: str):
+def check_shapiro_wilk_test(data: list, warmup: int, query_type: str, output_folder: str, workers: int = 1):
     import pandas as pd
-    from scipy import stats
     
     print("The Shapiro-Wilk test is a statistical test used to determine whether a sample comes from a normally distributed population.")   
     print("This means that the data does not significantly deviate from a normal distribution.") 
 
     df = pd.DataFrame(data)
     
-    results = []
-    results_without_query = []
-    
     # Remove warmup tries
     df = df[df['TRY'] > warmup]
     
-    grouped = df.groupby(['STEP', 'QUERY', 'COMPONENT_NAME', 'VERSION'])
-
     # Compute mean duration by TRY, COMPONENT, STEP, COMPONENT_NAME, VERSION
-    mean_df = df.groupby(['TRY', 'COMPONENT', 'STEP', 'COMPONENT_NAME', 'VERSION'], as_index=False)['DURATION (ms)'].mean()    
+    mean_df = df.groupby(['TRY', 'COMPONENT', 'STEP', 'COMPONENT_NAME', 'VERSION'], as_index=False, observed=True)['DURATION (ms)'].mean()    
     # Now group by STEP, COMPONENT_NAME, VERSION for the Shapiro-Wilk test
-    grouped_without_query = mean_df.groupby(['STEP', 'COMPONENT_NAME', 'VERSION'])
-    
-    for name, group in grouped_without_query:
-        step, component, version = name
-        if len(group) < 2:
-            print(f"Not enough data for statistical test for {step, component, version}")
-            continue
-        # Perform Shapiro-Wilk test for normality
-        grouped_data = group['DURATION (ms)']
-        stat, p_value = stats.shapiro(grouped_data)
-        alpha = 0.05
-        if p_value > alpha:
-            print(f"Data for {step, component, version} is normally distributed (p={p_value:.3f})")
-
-        results_without_query.append({
-            'STEP': int(step),
-            'COMPONENT_NAME': component,
-            'VERSION': int(version),
-            'W_STATISTIC': stat,
-            'P_VALUE': p_value,
-            'NORMALLY_DISTRIBUTED': str(p_value > alpha),
-            'MEAN': grouped_data.mean(),
-            'MEDIAN': grouped_data.median(),
-            '75TH_PERC': grouped_data.quantile(0.75),
-            '95TH_PERC': grouped_data.quantile(0.95),
-        })
+    key_cols_without_query = ['STEP', 'COMPONENT_NAME', 'VERSION']
+    tasks_without_query = list(zip(*build_samples(mean_df, key_cols_without_query, 'DURATION (ms)')))
+    rows_without_query = run_statistical_tests(run_shapiro_wilk_tests, tasks_without_query, workers)
+    results_without_query = shapiro_wilk_results_table(
+        rows_without_query, key_cols_without_query,
+        ['STEP', 'COMPONENT_NAME', 'VERSION', 'W_STATISTIC', 'P_VALUE', 'NORMALLY_DISTRIBUTED', 'MEAN', 'MEDIAN', '75TH_PERC', '95TH_PERC'])
+    print(f"Without query: {len(tasks_without_query) - len(results_without_query)} groups without enough data, "
+          f"{(results_without_query['NORMALLY_DISTRIBUTED'] == 'True').sum()} of {len(results_without_query)} normally distributed")
         
     with open(os.path.join(output_folder, f'shapiro_wilk_test_results_without_query_{query_type}.json'), 'w') as f:
-        json.dump(results_without_query, f, indent=4)
-
-    for name, group in grouped:
-        step, query, component, version = name
-        if len(group) < 2:
-            print(f"Not enough data for statistical test for {step, query, component, version}")
-            continue
-        # Perform Shapiro-Wilk test for normality
-        grouped_data = group['DURATION (ms)']
-        stat, p_value = stats.shapiro(grouped_data)
-        alpha = 0.05
-        if p_value > alpha:
-            print(f"Data for {step, query, component, version} is normally distributed (p={p_value:.3f})")
-            
-        results.append({
-            'STEP': int(step),
-            'QUERY': query,
-            'VERSION': int(version),
-            'COMPONENT_NAME': component,
-            'W_STATISTIC': stat,
-            'P_VALUE': p_value,
-            'NORMALLY_DISTRIBUTED': str(p_value > alpha),
-            'MEAN': grouped_data.mean(),
-            'MEDIAN': grouped_data.median(),
-            '75TH_PERC': grouped_data.quantile(0.75),
-            '95TH_PERC': grouped_data.quantile(0.95),
-        })
+        json.dump(results_without_query.to_dict(orient='records'), f, indent=4)
+
+    key_cols = ['STEP', 'QUERY', 'COMPONENT_NAME', 'VERSION']
+    tasks = list(zip(*build_samples(df, key_cols, 'DURATION (ms)')))
+    rows = run_statistical_tests(run_shapiro_wilk_tests, tasks, workers)
+    results = shapiro_wilk_results_table(
+        rows, key_cols,
+        ['STEP', 'QUERY', 'VERSION', 'COMPONENT_NAME', 'W_STATISTIC', 'P_VALUE', 'NORMALLY_DISTRIBUTED', 'MEAN', 'MEDIAN', '75TH_PERC', '95TH_PERC'])
+    print(f"With query: {len(tasks) - len(results)} groups without enough data, "
+          f"{(results['NORMALLY_DISTRIBUTED'] == 'True').sum()} of {len(results)} normally distributed")
         
     # save results to a json file
     with open(os.path.join(output_folder, f'shapiro_wilk_test_results_{query_type}.json'), 'w') as f:
-        json.dump(results, f, indent=4)
+        json.dump(results.to_dict(orient='records'), f, indent=4)
         
     return results, results_without_query
 
-def check_Mann_Whitney_U_test(data: list, warmup: int, query_type: str, output_folder: str):
+def check_Mann_Whitney_U_test(data: list, warmup: int, query_type: str, output_folder: str, workers: int = 1):
     import pandas as pd
-    from scipy import stats
-    from itertools import combinations
     
     print("Mann-Whitney U test is a non-parametric test used to determine whether there is a significant difference between the distributions of two independent samples.")
     print("No significant difference between comp1 and comp2 for the given step, query, and version, meaning the statistical test did not find strong evidence that the two are different.")
     print("Significant difference between comp1 and comp2 for the given step, query, and version, meaning the statistical test found strong evidence that the two are different.")
 
     df = pd.DataFrame(data)
-    
-    results = []
-    results_without_query = []
+    alpha = 0.05
     
     # Remove warmup tries
     df = df[df['TRY'] > warmup]
     
-    grouped = df.groupby(['STEP', 'QUERY', 'VERSION'])
-    grouped_without_query = df.groupby(['STEP', 'VERSION'])
-    
-    for name, group in grouped_without_query:
-        step, version = name
-        components = group['COMPONENT_NAME'].unique()
-        if len(components) < 2:
-            print(f"Not enough components for statistical test for {step, version}")
-            continue
-    
-        for comp1, comp2 in combinations(components, 2):
-            data1 = group[group['COMPONENT_NAME'] == comp1]['DURATION (ms)']
-            data2 = group[group['COMPONENT_NAME'] == comp2]['DURATION (ms)']
-            if len(data1) < 2 or len(data2) < 2:
-                print(f"Not enough data for Mann-Whitney U test between {comp1} and {comp2} for {step, version}")
-                continue
-            stat, p_value = stats.mannwhitneyu(data1, data2, alternative='two-sided')
-            
-            alpha = 0.05
-            if p_value <= alpha:
-                print(f"Significant difference between {comp1} and {comp2} for {step, version} (p={p_value:.3f})")
-                
-            results_without_query.append({
-                'STEP': int(step),
-                'VERSION': int(version),
-                'COMPONENT_1': comp1,
-                'COMPONENT_2': comp2,
-                'U_STATISTIC': stat,
-                'P_VALUE': p_value,
-                'SIGNIFICANT': str(p_value <= alpha)
-            })
-    with open(os.path.join(output_folder, f'mann_whitney_u_test_results_without_query_{query_type}.json'), 'w') as f:
-        json.dump(results_without_query, f, indent=4)
-
-    for name, group in grouped:
-        step, query, version = name
-        components = group['COMPONENT_NAME'].unique()
-        if len(components) < 2:
-            print(f"Not enough components for statistical test for {step, query, version}")
-            continue
-        
-        for comp1, comp2 in combinations(components, 2):
-            data1 = group[group['COMPONENT_NAME'] == comp1]['DURATION (ms)']
-            data2 = group[group['COMPONENT_NAME'] == comp2]['DURATION (ms)']
-            if len(data1) < 2 or len(data2) < 2:
-                print(f"Not enough data for Mann-Whitney U test between {comp1} and {comp2} for {step, query, version}")
-                continue
-            stat, p_value = stats.mannwhitneyu(data1, data2, alternative='two-sided')
-            
-            alpha = 0.05
-            if p_value <= alpha:
-                print(f"Significant difference between {comp1} and {comp2} for {step, query, version} (p={p_value:.3f})")
-                
-            results.append({
-                'STEP': int(step),
-                'QUERY': query,
-                'VERSION': int(version),
-                'COMPONENT_1': comp1,
-                'COMPONENT_2': comp2,
-                'U_STATISTIC': stat,
-                'P_VALUE': p_value,
-                'SIGNIFICANT': str(p_value <= alpha)
-            })
-
-    # save results to a json file
-    with open(os.path.join(output_folder, f'mann_whitney_u_test_results_{query_type}.json'), 'w') as f:
-        json.dump(results, f, indent=4)
+    for with_query in [False, True]:
+        key_cols = ['STEP', 'QUERY', 'VERSION'] if with_query else ['STEP', 'VERSION']
+        tasks = build_component_samples(df, key_cols, 'COMPONENT_NAME', 'DURATION (ms)')
+        rows = run_statistical_tests(run_mann_whitney_u_tests, tasks, workers)
+
+        results = pd.DataFrame(
+            [key + tuple(values) for key, *values in rows],
+            columns=key_cols + ['COMPONENT_1', 'COMPONENT_2', 'U_STATISTIC', 'P_VALUE'])
+        results['SIGNIFICANT'] = (results['P_VALUE'] <= alpha).astype(str)
+        print(f"{'With' if with_query else 'Without'} query: {(results['SIGNIFICANT'] == 'True').sum()} of {len(results)} "
+              f"component pairs with a significant difference")
+
+        if with_query:
+            # save results to a json file
+            results_file = f'mann_whitney_u_test_results_{query_type}.json'
+        else:
+            results_without_query = results
+            results_file = f'mann_whitney_u_test_results_without_query_{query_type}.json'
+        with open(os.path.join(output_folder, results_file), 'w') as f:
+            json.dump(results.to_dict(orient='records'), f, indent=4)
 
     return results, results_without_query
 
@@ -840,11 +1087,11 @@ def highlight_each_component_csv(filename: str):
     print(f"Highlighted table saved to {styled_filename}")
 
 
-def create_statistical_test_tables(filtered_data, query_type, output_folder, warmup):
+def create_statistical_test_tables(filtered_data, query_type, output_folder, warmup, workers=1):
     print("------------------- P-Value Test (Shapiro-Wilk) -------------------")
-    shapiro_wilk_test_results, shapiro_wilk_test_results_without_query = check_shapiro_wilk_test(data=filtered_data, warmup=warmup, query_type=query_type, output_folder=output_folder)
+    shapiro_wilk_test_results, shapiro_wilk_test_results_without_query = check_shapiro_wilk_test(data=filtered_data, warmup=warmup, query_type=query_type, output_folder=output_folder, workers=workers)
     print("------------------- Mann-Whitney U Test -------------------")
-    mann_whitney_u_test_results, mann_whitney_u_test_results_without_query = check_Mann_Whitney_U_test(data=filtered_data, warmup=warmup, query_type=query_type, output_folder=output_folder)
+    mann_whitney_u_test_results, mann_whitney_u_test_results_without_query = check_Mann_Whitney_U_test(data=filtered_data, warmup=warmup, query_type=query_type, output_folder=output_folder, workers=workers)
 
     print("Creating statistical test tables in CSV format.")
     filename = create_shapiro_wilk_test_table(shapiro_wilk_test_results, query_type=query_type, output_folder=output_folder, with_query=True)
@@ -860,6 +1107,11 @@ if __name__ == "__main__":
     min_repeat = int(os.getenv("COUNT_REPEAT", 200))
     min_count_version = int(os.getenv("COUNT_VERSION", 3))
     min_count_component = int(os.getenv("COUNT_COMPONENT", 3))
+    chunk_size = int(os.getenv("PARSE_CHUNK_SIZE", DEFAULT_CHUNK_SIZE))
+    cache_dir = os.getenv("CACHE_DIR", "cache")
+    parse_workers = int(os.getenv("PARSE_WORKERS", 1))
+    plot_workers = int(os.getenv("PLOT_WORKERS", 1))
+    stats_workers = int(os.getenv("STATS_WORKERS", 1))
     warmup = int(os.getenv("WARMUP", 50))
     mode = os.getenv("MODE", "stats")
 
@@ -874,8 +1126,11 @@ if __name__ == "__main__":
     print(f"Minimum repeat: {min_repeat}")
     print(f"Minimum count version: {min_count_version}")
     print(f"Minimum count component: {min_count_component}")
+    print(f"Parse workers: {parse_workers}")
+    print(f"Plot workers: {plot_workers}")
+    print(f"Stats workers: {stats_workers}")
 
-    log_data = extract_log_info(log_file_path, queries_info, min_count_version, min_count_component, min_repeat)
+    log_data = extract_log_info(log_file_path, queries_info, min_count_version, min_count_component, min_repeat, chunk_size, cache_dir, parse_workers)
     
     main_output_folder = "results"
     output_folders = [os.path.join(main_output_folder, "without_query"), os.path.join(main_output_folder, "with_query")]
@@ -883,22 +1138,27 @@ if __name__ == "__main__":
     for folder in output_folders:
         os.makedirs(folder, exist_ok=True)
 
-    store_data_to_json(data=log_data, file_path="log_data.json")
+    store_data_to_parquet(data=log_data, file_path="log_data.parquet")
 
     if mode == "plots" or mode == "all":
+        box_stats = compute_box_statistics(data=log_data, limit=50)
+        plot_specs = []
         for scale in ["linear", "log"]:
-            whisker_duration_per_component_query_config(data=log_data, scale=scale, limit=50)
-            create_duration_median_plot(data=log_data, scale=scale, limit=50)
+            plot_specs += whisker_duration_per_component_query_config(box_stats=box_stats, scale=scale)
+            plot_specs += create_duration_median_plot(box_stats=box_stats, scale=scale)
 
-        create_version_normalized_duration_plot(data=log_data, limit=50)
+        plot_specs += create_version_normalized_duration_plot(data=log_data, limit=50)
+        render_plots(plot_specs, plot_workers)
         
     if mode == "stats" or mode == "all":
+        # queries missing from the configuration are handled as non-aggregative
+        aggregative = log_data['AGGREGATIVE'].eq(True)
         for query_type in ["aggregative", "non-aggregative"]:
             if query_type == "non-aggregative":
                 print(f"Processing query type: {query_type}")
-                filtered_log_data = [entry for entry in log_data if not (entry['AGGREGATIVE'])]
-                create_statistical_test_tables(filtered_log_data, query_type, main_output_folder, warmup)
+                filtered_log_data = log_data[~aggregative]
+                create_statistical_test_tables(filtered_log_data, query_type, main_output_folder, warmup, stats_workers)
             else:
                 print(f"Processing query type: {query_type}")
-                filtered_log_data = [entry for entry in log_data if (entry['AGGREGATIVE'])]
-                create_statistical_test_tables(filtered_log_data, query_type, main_output_folder, warmup)
+                filtered_log_data = log_data[aggregative]
+                create_statistical_test_tables(filtered_log_data, query_type, main_output_folder, warmup, stats_workers)
@@ -1,26 +1,26 @@
 
 CREATE TABLE Experience (
   PRIMARY KEY (id_experience),
-  id_experience   integer NOT NULL,
+  id_experience   bigint NOT NULL,
   exp_description text
 );
 
 CREATE TABLE has_OSLabel (
   PRIMARY KEY (id_metric_os, key_label),
-  id_metric_os integer NOT NULL,
+  id_metric_os bigint NOT NULL,
   key_label    varchar(255) NOT NULL
 );
 
 CREATE TABLE has_Pr_Label (
   PRIMARY KEY (id_metric_pr, key_label),
-  id_metric_pr integer NOT NULL,
+  id_metric_pr bigint NOT NULL,
   key_label    varchar(255) NOT NULL
 );
 
 CREATE TABLE Job (
   PRIMARY KEY (id_job),
-  id_job integer NOT NULL,
-  id_pod integer NOT NULL,
+  id_job bigint NOT NULL,
+  id_pod bigint NOT NULL,
   UNIQUE (id_pod)
 );
 
@@ -32,25 +32,25 @@ CREATE TABLE OSLabel (
 
 CREATE TABLE OSLog (
   PRIMARY KEY (id_os_log),
-  id_os_log    integer NOT NULL,
+  id_os_log    bigint NOT NULL,
   log_line     varchar(255),
   log_time     timestamp,
-  id_metric_os integer NOT NULL
+  id_metric_os bigint NOT NULL
 );
 
 CREATE TABLE OSMetric (
   PRIMARY KEY (id_metric_os),
-  id_metric_os integer NOT NULL,
+  id_metric_os bigint NOT NULL,
   bd_name      varchar(255),
   index_name   varchar(255),
-  id_pod       integer NOT NULL
+  id_pod       bigint NOT NULL
 );
 
 CREATE TABLE Pod (
   PRIMARY KEY (id_pod),
-  id_pod        integer NOT NULL,
-  id_task_model integer NULL,
-  id_wf_run     integer NULL
+  id_pod        bigint NOT NULL,
+  id_task_model bigint NULL,
+  id_wf_run     bigint NULL
 );
 
 CREATE TABLE Pr_Label (
@@ -61,30 +61,30 @@ CREATE TABLE Pr_Label (
 
 CREATE TABLE Pr_Measure (
   PRIMARY KEY (id_pr_measure),
-  id_pr_measure integer NOT NULL,
+  id_pr_measure bigint NOT NULL,
   measure       varchar(255),
   measure_time  timestamp,
-  id_metric_pr  integer NOT NULL
+  id_metric_pr  bigint NOT NULL
 );
 
 CREATE TABLE Pr_Metric (
   PRIMARY KEY (id_metric_pr),
-  id_metric_pr integer NOT NULL,
+  id_metric_pr bigint NOT NULL,
   bd_name      varchar(255),
   mesure_name  varchar(255),
-  id_pod       integer NOT NULL
+  id_pod       bigint NOT NULL
 );
 
 CREATE TABLE Task_Model (
   PRIMARY KEY (id_task_model),
-  id_task_model integer NOT NULL,
-  id_experience integer NOT NULL
+  id_task_model bigint NOT NULL,
+  id_experience bigint NOT NULL
 );
 
 CREATE TABLE Workflow_Run (
   PRIMARY KEY (id_wf_run),
-  id_wf_run     integer NOT NULL,
-  id_experience integer NOT NULL
+  id_wf_run     bigint NOT NULL,
+  id_experience bigint NOT NULL
 );
 
 ALTER TABLE has_OSLabel ADD FOREIGN KEY (key_label) REFERENCES OSLabel (key_label);
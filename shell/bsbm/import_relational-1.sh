@@ -14,6 +14,15 @@ printf "\n%s$(date +%FT%T) - [quads-loader] Dataset import started."
 printf "\n%s$(date +%FT%T) - [quads-loader] Versions import started."
 
 number_of_versions=$1
+# product and step of the configuration, written in the import records
+product=${2:-0}
+step=${3:-0}
+
+# approximate number of statements of a TriG file, counted like dataset-importer: the lines
+# ending with . ; or , without the @prefix and @base lines. Counted after the measured import.
+count_statements() {
+    awk '!/^[ \t]*@?([Pp][Rr][Ee][Ff][Ii][Xx]|[Bb][Aa][Ss][Ee])[ \t]/ && /[.;,][ \t\r]*$/ { n++ } END { print n + 0 }' "$1"
+}
 
 find . -type f -name "*.trig" -print0 | while IFS= read -r -d '' file
 do
@@ -30,6 +39,9 @@ do
           --form file=@"$file"
         end=$(date +%s%3N)
         printf "\n%s$(date +%FT%T) - [Measure] (Import STS $file):$((end-start))ms;"
+        printf '\n{"component":"%s","file":"%s","bytes":"%s","triples":"%s","duration":"%s","version":"%s","product":"%s","step":"%s","time":"%s"}' \
+          "quads-loader" "$(basename "$file")" "$(stat -c %s "$file")" "$(count_statements "$file")" "$((end-start))" \
+          "$version" "$product" "$step" "$(date +%s)"
     fi
 done
 
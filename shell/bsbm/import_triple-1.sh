@@ -10,6 +10,15 @@ echo "-------------------------------------------------------------- [BEGIN IMPO
 printf "\n%s$(date +%FT%T) - [Triple Store] Dataset import started."
 
 number_of_versions=$1
+# product and step of the configuration, written in the import records
+product=${2:-0}
+step=${3:-0}
+
+# approximate number of statements of a TriG file, counted like dataset-importer: the lines
+# ending with . ; or , without the @prefix and @base lines. Counted after the measured import.
+count_statements() {
+    awk '!/^[ \t]*@?([Pp][Rr][Ee][Ff][Ii][Xx]|[Bb][Aa][Ss][Ee])[ \t]/ && /[.;,][ \t\r]*$/ { n++ } END { print n + 0 }' "$1"
+}
 
 ## BSBM tagged data
 find . -type f -name "*.trig" -print0 | while IFS= read -r -d '' file
@@ -27,6 +36,9 @@ do
               --data-binary @"$file"
         end=$(date +%s%3N)
         printf "\n%s$(date +%FT%T) - [Measure] (Import BG $file):$((end-start))ms;"
+        printf '\n{"component":"%s","file":"%s","bytes":"%s","triples":"%s","duration":"%s","version":"%s","product":"%s","step":"%s","time":"%s"}' \
+          "blazegraph" "$(basename "$file")" "$(stat -c %s "$file")" "$(count_statements "$file")" "$((end-start))" \
+          "$version" "$product" "$step" "$(date +%s)"
     fi
 done
 